@@ -0,0 +1,54 @@
+# alembic/env.py
+import sys
+from logging.config import fileConfig
+from pathlib import Path
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+# Make `src` importable when alembic is run from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config.database import DatabaseConfig
+from src.models.base import Base
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Revisions assume the original tables (work_orders, work_order_items,
+# work_order_vendors, supporting_documents, users) already exist, as created
+# by Base.metadata.create_all on earlier deployments.
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode (emit SQL without a connection)"""
+    context.configure(
+        url=DatabaseConfig.get_connection_string(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode against the configured database"""
+    connectable = create_engine(DatabaseConfig.get_connection_string(), poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
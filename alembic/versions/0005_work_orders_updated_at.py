@@ -0,0 +1,37 @@
+"""server-maintained work_orders timestamps and sync index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows inserted before updated_at had a default have no high-water mark yet
+    op.execute(
+        "UPDATE work_orders SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) "
+        "WHERE updated_at IS NULL"
+    )
+    with op.batch_alter_table('work_orders') as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), server_default=sa.func.now())
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), server_default=sa.func.now())
+    op.create_index('ix_work_orders_updated_at_id', 'work_orders', ['updated_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_work_orders_updated_at_id', table_name='work_orders')
+    with op.batch_alter_table('work_orders') as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), server_default=None)
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), server_default=None)
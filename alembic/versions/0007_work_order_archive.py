@@ -0,0 +1,93 @@
+"""work order archive tables
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_work_orders_end_date', 'work_orders', ['end_date'])
+
+    op.create_table(
+        'work_orders_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column('document_number', sa.String(length=100), nullable=False),
+        sa.Column('request_date', sa.Date(), nullable=False),
+        sa.Column('request_type', sa.String(), nullable=False),
+        sa.Column('submitted_by', sa.String(), nullable=False),
+        sa.Column('scope_of_works', sa.Text(), nullable=True),
+        sa.Column('start_date', sa.Date(), nullable=True),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('is_urgent', sa.SmallInteger(), nullable=True),
+        sa.Column('budget_status', sa.String(), nullable=True),
+        sa.Column('cost_type', sa.String(), nullable=True),
+        sa.Column('budget_index', sa.String(length=50), nullable=True),
+        sa.Column('budget_name', sa.String(length=200), nullable=True),
+        sa.Column('cost_estimation', sa.Numeric(15, 2), nullable=True),
+        sa.Column('remaining_budget', sa.Numeric(15, 2), nullable=True),
+        sa.Column('under_over', sa.String(length=50), nullable=True),
+        sa.Column('charge_to_tenant', sa.SmallInteger(), nullable=True),
+        sa.Column('recommended_contractor', sa.String(length=200), nullable=True),
+        sa.Column('reason', sa.Text(), nullable=True),
+        sa.Column('vendor_selection_method', sa.String(), nullable=True),
+        sa.Column('test_and_analysis', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('version_id', sa.Integer(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_work_orders_archive_document_number', 'work_orders_archive', ['document_number'])
+
+    op.create_table(
+        'work_order_items_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column('work_order_id', sa.Integer(), sa.ForeignKey('work_orders_archive.id'), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('quantity', sa.Numeric(10, 2), nullable=False),
+        sa.Column('unit_price', sa.Numeric(15, 2), nullable=False),
+        sa.Column('total_price', sa.Numeric(15, 2), nullable=False),
+        sa.Column('item_order', sa.Integer(), nullable=True),
+    )
+    op.create_index('ix_work_order_items_archive_work_order_id', 'work_order_items_archive', ['work_order_id'])
+
+    op.create_table(
+        'work_order_vendors_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column('work_order_id', sa.Integer(), sa.ForeignKey('work_orders_archive.id'), nullable=False),
+        sa.Column('vendor_name', sa.String(length=200), nullable=True),
+    )
+    op.create_index('ix_work_order_vendors_archive_work_order_id', 'work_order_vendors_archive', ['work_order_id'])
+
+    op.create_table(
+        'supporting_documents_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column('work_order_id', sa.Integer(), sa.ForeignKey('work_orders_archive.id'), nullable=False),
+        sa.Column('document_type', sa.String(length=100), nullable=False),
+        sa.Column('has_document', sa.Boolean(), nullable=True),
+    )
+    op.create_index('ix_supporting_documents_archive_work_order_id', 'supporting_documents_archive', ['work_order_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_supporting_documents_archive_work_order_id', table_name='supporting_documents_archive')
+    op.drop_table('supporting_documents_archive')
+    op.drop_index('ix_work_order_vendors_archive_work_order_id', table_name='work_order_vendors_archive')
+    op.drop_table('work_order_vendors_archive')
+    op.drop_index('ix_work_order_items_archive_work_order_id', table_name='work_order_items_archive')
+    op.drop_table('work_order_items_archive')
+    op.drop_index('ix_work_orders_archive_document_number', table_name='work_orders_archive')
+    op.drop_table('work_orders_archive')
+    op.drop_index('ix_work_orders_end_date', table_name='work_orders')
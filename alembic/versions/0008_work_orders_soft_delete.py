@@ -0,0 +1,116 @@
+"""work orders soft delete
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHILD_TABLES = ('work_order_items', 'work_order_vendors', 'supporting_documents')
+
+# Names for constraints that were created unnamed (SQLite batch mode needs them)
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s"}
+
+LIVE = sa.text('deleted_at IS NULL')
+DELETED = sa.text('deleted_at IS NOT NULL')
+
+
+# Names the server gave the unnamed child -> work_orders keys of create_all,
+# for `alembic upgrade --sql` where there is no connection to look them up
+DEFAULT_FK_NAMES = {
+    'postgresql': '{table}_work_order_id_fkey',
+    'mysql': '{table}_ibfk_1',
+}
+
+# SQL Server and Oracle generate random names, so the offline script finds them itself
+DROP_WORK_ORDER_FKS_SQL = {
+    'mssql': (
+        "DECLARE @sql NVARCHAR(MAX) = N''; "
+        "SELECT @sql += N'ALTER TABLE {table} DROP CONSTRAINT ' + QUOTENAME(name) + N'; ' "
+        "FROM sys.foreign_keys "
+        "WHERE parent_object_id = OBJECT_ID(N'{table}') AND referenced_object_id = OBJECT_ID(N'work_orders'); "
+        "EXEC sp_executesql @sql"
+    ),
+    'oracle': (
+        "BEGIN "
+        "FOR c IN (SELECT fk.constraint_name FROM user_constraints fk "
+        "JOIN user_constraints pk ON pk.constraint_name = fk.r_constraint_name "
+        "WHERE fk.constraint_type = 'R' AND fk.table_name = UPPER('{table}') AND pk.table_name = 'WORK_ORDERS') "
+        "LOOP EXECUTE IMMEDIATE 'ALTER TABLE {table} DROP CONSTRAINT ' || c.constraint_name; END LOOP; "
+        "END;"
+    ),
+}
+
+
+def _drop_work_order_fks(table: str, dialect_name: str, offline_name: Union[str, None]) -> None:
+    """Drop the child -> work_orders foreign keys, by reflection or (offline) by name"""
+    if not context.is_offline_mode():
+        for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys(table):
+            if foreign_key['referred_table'] == 'work_orders' and foreign_key['name']:
+                op.drop_constraint(foreign_key['name'], table, type_='foreignkey')
+    elif offline_name is not None:
+        op.drop_constraint(offline_name, table, type_='foreignkey')
+    elif dialect_name in DROP_WORK_ORDER_FKS_SQL:
+        op.execute(DROP_WORK_ORDER_FKS_SQL[dialect_name].format(table=table))
+    else:
+        op.drop_constraint(DEFAULT_FK_NAMES[dialect_name].format(table=table), table, type_='foreignkey')
+
+
+def _replace_work_order_fk(table: str, ondelete: Union[str, None], offline_name: Union[str, None] = None) -> None:
+    """Recreate the child -> work_orders foreign key with the given ON DELETE action.
+
+    offline_name is the key being replaced when it is known (our own name on
+    downgrade); otherwise offline scripts fall back to the server defaults.
+    """
+    dialect_name = op.get_context().dialect.name
+    name = f'fk_{table}_work_order_id'
+    if dialect_name == 'sqlite':
+        if context.is_offline_mode():
+            raise RuntimeError("0008 rebuilds SQLite tables in batch mode and needs a live connection")
+        # SQLite cannot alter constraints in place; batch mode rebuilds the table
+        with op.batch_alter_table(table, recreate='always', naming_convention=NAMING_CONVENTION) as batch:
+            batch.drop_constraint(name, type_='foreignkey')
+            batch.create_foreign_key(name, 'work_orders', ['work_order_id'], ['id'], ondelete=ondelete)
+        return
+    _drop_work_order_fks(table, dialect_name, offline_name)
+    op.create_foreign_key(name, table, 'work_orders', ['work_order_id'], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    op.add_column('work_orders', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    # Filtered/partial indexes where supported; MySQL and Oracle get plain ones
+    op.drop_index('ix_work_orders_end_date', table_name='work_orders')
+    op.create_index(
+        'ix_work_orders_end_date', 'work_orders', ['end_date'],
+        postgresql_where=LIVE, mssql_where=LIVE, sqlite_where=LIVE,
+    )
+    op.create_index(
+        'ix_work_orders_deleted_at', 'work_orders', ['deleted_at'],
+        postgresql_where=DELETED, mssql_where=DELETED, sqlite_where=DELETED,
+    )
+
+    # Purges delete only the parent row; the database removes the children
+    for table in CHILD_TABLES:
+        _replace_work_order_fk(table, 'CASCADE')
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        _replace_work_order_fk(table, None, offline_name=f'fk_{table}_work_order_id')
+
+    op.drop_index('ix_work_orders_deleted_at', table_name='work_orders')
+    op.drop_index('ix_work_orders_end_date', table_name='work_orders')
+    op.create_index('ix_work_orders_end_date', 'work_orders', ['end_date'])
+    op.drop_column('work_orders', 'deleted_at')
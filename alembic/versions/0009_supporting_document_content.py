@@ -0,0 +1,43 @@
+"""supporting document content metadata
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Archived documents keep their metadata so the blobs stay reachable
+TABLES = ('supporting_documents', 'supporting_documents_archive')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('file_name', sa.String(length=255), nullable=True))
+        op.add_column(table, sa.Column('content_type', sa.String(length=100), nullable=True))
+        op.add_column(table, sa.Column('size_bytes', sa.BigInteger(), nullable=True))
+        op.add_column(table, sa.Column('content_hash', sa.String(length=64), nullable=True))
+        op.add_column(table, sa.Column('uploaded_at', sa.DateTime(), nullable=True))
+        # Reference checks before a blob is deleted look documents up by hash
+        op.create_index(f'ix_{table}_content_hash', table, ['content_hash'])
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_content_hash', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('uploaded_at')
+            batch_op.drop_column('content_hash')
+            batch_op.drop_column('size_bytes')
+            batch_op.drop_column('content_type')
+            batch_op.drop_column('file_name')
@@ -0,0 +1,64 @@
+"""work order authorizations
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'work_order_authorizations',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column(
+            'work_order_id', sa.Integer(),
+            sa.ForeignKey('work_orders.id', name='fk_work_order_authorizations_work_order_id', ondelete='CASCADE'),
+            nullable=False
+        ),
+        sa.Column('approver', sa.String(length=100), nullable=False),
+        sa.Column('role', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('step_order', sa.Integer(), nullable=True),
+        sa.Column('decided_at', sa.DateTime(), nullable=True),
+        sa.Column('comments', sa.Text(), nullable=True),
+    )
+    op.create_index('ix_work_order_authorizations_work_order_id', 'work_order_authorizations', ['work_order_id'])
+    op.create_index(
+        'ix_work_order_authorizations_approver_status', 'work_order_authorizations',
+        ['approver', 'status', 'work_order_id', 'step_order']
+    )
+
+    op.create_table(
+        'work_order_authorizations_archive',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False, nullable=False),
+        sa.Column('work_order_id', sa.Integer(), sa.ForeignKey('work_orders_archive.id'), nullable=False),
+        sa.Column('approver', sa.String(length=100), nullable=False),
+        sa.Column('role', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('step_order', sa.Integer(), nullable=True),
+        sa.Column('decided_at', sa.DateTime(), nullable=True),
+        sa.Column('comments', sa.Text(), nullable=True),
+    )
+    op.create_index(
+        'ix_work_order_authorizations_archive_work_order_id', 'work_order_authorizations_archive', ['work_order_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_work_order_authorizations_archive_work_order_id', table_name='work_order_authorizations_archive')
+    op.drop_table('work_order_authorizations_archive')
+    op.drop_index('ix_work_order_authorizations_approver_status', table_name='work_order_authorizations')
+    op.drop_index('ix_work_order_authorizations_work_order_id', table_name='work_order_authorizations')
+    op.drop_table('work_order_authorizations')
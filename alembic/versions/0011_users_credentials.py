@@ -0,0 +1,77 @@
+"""users table in the UserTable layout with room for password hashes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+users = sa.table('users', sa.column('Password', sa.String()))
+
+
+def _widen_password(length: int, from_length: int) -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column(
+            'Password', type_=sa.String(length=length), existing_type=sa.String(length=from_length), existing_nullable=True
+        )
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        # No connection to inspect: assume the legacy layout the user API reads
+        _widen_password(255, 50)
+        return
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column['name'] for column in inspector.get_columns('users')} if inspector.has_table('users') else set()
+
+    if 'UserID' in columns:
+        # Already in the legacy layout: widen Password for hashes (up to ~100 chars)
+        _widen_password(255, 50)
+        return
+
+    if columns:
+        # The id/username/email placeholder created by create_all was never
+        # readable through the user API (it queries UserID/Name/Password), so
+        # it is replaced, but only when that cannot lose anything
+        rows = bind.execute(sa.text('SELECT COUNT(*) FROM users')).scalar()
+        if rows:
+            raise RuntimeError(
+                f"0011 would replace the users table ({sorted(columns)}) but it holds {rows} rows; "
+                "move them to the UserID/Name/Password/UserGroup layout (or rename the table) and run it again"
+            )
+        op.drop_table('users')
+    op.create_table(
+        'users',
+        sa.Column('UserID', sa.String(length=50), primary_key=True, nullable=False),
+        sa.Column('Name', sa.String(length=200), nullable=True),
+        sa.Column('Password', sa.String(length=255), nullable=True),
+        sa.Column('UserGroup', sa.String(length=50), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    # Back to the 50-character Password column the previous code reads; an
+    # empty placeholder replaced by upgrade() is not recreated (nothing read it)
+    if not context.is_offline_mode():
+        too_long = op.get_bind().execute(
+            sa.select(sa.func.count()).select_from(users).where(sa.func.length(users.c.Password) > 50)
+        ).scalar()
+        if too_long:
+            raise RuntimeError(
+                f"{too_long} stored password hashes do not fit the old 50-character column; "
+                "reset those passwords before downgrading"
+            )
+    _widen_password(50, 255)
@@ -0,0 +1,53 @@
+"""never reuse work order ids on sqlite
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Identity/serial/sequence columns on the server databases never hand out an
+# id twice; a plain SQLite INTEGER PRIMARY KEY reuses the highest id once the
+# row is deleted, which collides with archived orders that keep their ids.
+
+
+def _recreate_work_orders(autoincrement: bool) -> None:
+    # Batch mode rebuilds the table from the reflected one (indexes included)
+    with op.batch_alter_table(
+        'work_orders', recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}
+    ):
+        pass
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    if context.is_offline_mode():
+        raise RuntimeError("0013 rebuilds the SQLite work_orders table and needs a live connection")
+    _recreate_work_orders(True)
+    # Start the counter above every id handed out so far, archived ones included
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'work_orders'")
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) "
+        "SELECT 'work_orders', COALESCE(MAX(id), 0) FROM ("
+        "SELECT id FROM work_orders UNION ALL SELECT id FROM work_orders_archive)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    if context.is_offline_mode():
+        raise RuntimeError("0013 rebuilds the SQLite work_orders table and needs a live connection")
+    _recreate_work_orders(False)
@@ -0,0 +1,47 @@
+"""release the document numbers of soft-deleted work orders
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same value the application writes on delete (DELETED_DOCUMENT_NUMBER_PREFIX + id)
+DELETED_DOCUMENT_NUMBER_PREFIX = '~deleted~'
+
+work_orders = sa.table(
+    'work_orders',
+    sa.column('id', sa.Integer()),
+    sa.column('document_number', sa.String()),
+    sa.column('deleted_at', sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    # Tombstones from before this revision still hold their unique number
+    # until the purge; free it so the number can be created again
+    op.execute(
+        work_orders.update()
+        .where(work_orders.c.deleted_at.isnot(None))
+        .values(
+            document_number=sa.literal(DELETED_DOCUMENT_NUMBER_PREFIX, sa.String())
+            + sa.cast(work_orders.c.id, sa.String(20))
+        )
+    )
+
+
+def downgrade() -> None:
+    # The original numbers are gone; tombstones keep their released numbers,
+    # which the older code treats like any other deleted row
+    pass
@@ -0,0 +1,99 @@
+# benchmarks/bench_workers.py
+"""Measure throughput of python -m src.server as the worker count grows.
+
+Starts the server once per worker count, drives it with concurrent HTTP
+clients for a fixed duration and prints requests/second per configuration.
+Uses the database configured in .env / the environment.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --path "/api/v1/work_orders/?limit=100"
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from typing import List
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError("Server did not become ready")
+
+
+def drive(url: str, clients: int, duration: float) -> List[float]:
+    """Hit url from `clients` threads for `duration` seconds; return latencies"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client() -> None:
+        local, failed = [], 0
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                local.append(time.perf_counter() - started)
+            except OSError:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors[0]:
+        print(f"  {errors[0]} failed requests")
+    return latencies
+
+
+def run(workers: int, args: argparse.Namespace) -> None:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), PORT=str(args.port))
+    server = subprocess.Popen([sys.executable, "-m", "src.server"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base_url)
+        drive(base_url + args.path, args.clients, 2.0)  # warm-up
+        latencies = sorted(drive(base_url + args.path, args.clients, args.duration))
+        if not latencies:
+            print(f"workers={workers}: no successful requests")
+            return
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"workers={workers:<3} req/s={len(latencies) / args.duration:>9.1f} "
+              f"p50={p50:>7.1f}ms p99={p99:>7.1f}ms")
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 4])
+    parser.add_argument("--path", default="/api/v1/work_orders/?limit=100")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"GET {args.path} with {args.clients} clients for {args.duration:.0f}s, {os.cpu_count()} CPUs")
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
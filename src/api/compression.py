@@ -0,0 +1,217 @@
+# src/api/compression.py
+import gzip
+import os
+import zlib
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from src.services.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", 3))
+
+# Server preference when the client accepts several encodings equally
+AVAILABLE_ENCODINGS = tuple(
+    encoding for encoding, available in (("zstd", zstandard is not None), ("br", brotli is not None), ("gzip", True))
+    if available
+)
+COMPRESSION_ENCODINGS = tuple(
+    encoding for encoding in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").replace(" ", "").split(",")
+    if encoding in AVAILABLE_ENCODINGS
+)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/xml", "application/javascript")
+UNCOMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str, supported: Tuple[str, ...] = COMPRESSION_ENCODINGS) -> Optional[str]:
+    """Pick the encoding with the highest q-value in Accept-Encoding (ties go to server preference)"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body"""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class StreamingEncoder:
+    """Incremental compressor that flushes after every chunk so streamed responses stay live"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "gzip":
+            return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating gzip/br/zstd response compression.
+
+    Complete bodies under `minimum_size` are sent as-is. Bodies that carry an
+    ETag are compressed once per (path, ETag, encoding) and served from a
+    cache afterwards. Streamed bodies go through an incremental encoder.
+    Range requests, event streams and already-encoded responses pass through.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_BYTES,
+        encodings: Tuple[str, ...] = COMPRESSION_ENCODINGS,
+        cache: Optional[TTLCache] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = encodings
+        self.cache = cache if cache is not None else TTLCache(
+            ttl_seconds=float(os.getenv("COMPRESSION_CACHE_TTL_SECONDS", 300)),
+            max_entries=int(os.getenv("COMPRESSION_CACHE_ENTRIES", 256)),
+        )
+
+    @staticmethod
+    def _compressible(status: int, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            200 <= status < 300 and status not in (204, 206)
+            and "content-encoding" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+            and not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+        )
+
+    def _compress_body(self, path: str, etag: Optional[str], encoding: str, body: bytes) -> bytes:
+        if not etag:
+            return compress(body, encoding)
+        key = (path, etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = compress(body, encoding)
+            self.cache.set(key, compressed)
+        return compressed
+
+    @staticmethod
+    def _encoded_headers(headers: MutableHeaders, encoding: str) -> None:
+        headers["Content-Encoding"] = encoding
+        # The compressed bytes are a different representation of the same version
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = None if "range" in request_headers else negotiate_encoding(
+            request_headers.get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder: Optional[StreamingEncoder] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is not None:
+                chunk = encoder.compress(body) if more_body else encoder.compress(body) + encoder.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._compressible(start["status"], headers):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if not more_body:
+                compressed = self._compress_body(scope["path"], headers.get("etag"), encoding, body)
+                self._encoded_headers(headers, encoding)
+                headers["Content-Length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            encoder = StreamingEncoder(encoding)
+            self._encoded_headers(headers, encoding)
+            if "content-length" in headers:
+                del headers["content-length"]
+            await send(start)
+            await send({"type": "http.response.body", "body": encoder.compress(body), "more_body": True})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,8 +1,12 @@
-from fastapi import Depends
+from typing import Optional
+from fastapi import Depends, Header, HTTPException
 from sqlalchemy.orm import Session
 from src.config.database import get_db
 from src.services.user_service import UserService
 from src.services.work_orders_service import WorkOrdersService
+from src.services.facet_service import WorkOrdersFacetService
+from src.services.attachment_service import AttachmentService
+from src.services.token_service import AUTH_REQUIRED, InvalidTokenError, Principal, token_authenticator
 
 # Use Depends properly
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
@@ -12,4 +16,38 @@ def get_user_service(db: Session = Depends(get_db)) -> UserService:
 
 def get_work_orders_service(db: Session = Depends(get_db)) -> WorkOrdersService:
     """Get work_orders service"""
-    return WorkOrdersService(db)
\ No newline at end of file
+    return WorkOrdersService(db)
+
+
+def get_facet_service(db: Session = Depends(get_db)) -> WorkOrdersFacetService:
+    """Get work_orders facet service"""
+    return WorkOrdersFacetService(db)
+
+
+def get_attachment_service(db: Session = Depends(get_db)) -> AttachmentService:
+    """Get work order attachment service"""
+    return AttachmentService(db)
+
+
+# Async on purpose: validation is pure CPU and memory, so it runs on the
+# event loop instead of taking a threadpool slot (or a database connection)
+async def get_current_principal(authorization: Optional[str] = Header(None)) -> Principal:
+    """Caller from the Authorization: Bearer token; 401 when missing or invalid"""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"}
+        )
+    try:
+        return token_authenticator.authenticate(token.strip())
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=401, detail=str(e), headers={"WWW-Authenticate": 'Bearer error="invalid_token"'}
+        )
+
+
+async def require_principal(authorization: Optional[str] = Header(None)) -> Optional[Principal]:
+    """Router-level guard; a no-op when AUTH_REQUIRED=false"""
+    if not AUTH_REQUIRED:
+        return None
+    return await get_current_principal(authorization)
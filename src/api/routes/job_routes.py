@@ -0,0 +1,28 @@
+# src/api/routes/job_routes.py
+from fastapi import APIRouter, HTTPException, Path, status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from src.services.job_service import job_queue, serialize_job
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str = Path(..., max_length=36)):
+    """Get the status of a background job"""
+    job = await run_in_threadpool(job_queue.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return serialize_job(job)
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str = Path(..., max_length=36)):
+    """Get the result of a finished job (202 while it is still queued or running).
+
+    A failed job is a normal outcome of the poll: 200 with status "failed" and its error.
+    """
+    job = await run_in_threadpool(job_queue.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in ('succeeded', 'failed'):
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=serialize_job(job))
+    return serialize_job(job, include_result=True)
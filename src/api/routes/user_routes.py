@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 from src.config.database import get_db
 from src.services.user_service import UserService
-from src.api.dependencies import get_user_service
+from src.api.dependencies import get_user_service, get_current_principal
+from src.services.token_service import Principal, token_signer
 
 # Pydantic schemas
 class UserBase(BaseModel):
@@ -34,6 +35,8 @@ class UserResponse(BaseModel):
 
 # Router
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
+# Token endpoints, mounted without the bearer token guard that covers `router`
+auth_router = APIRouter(prefix="/api/v1/users", tags=["auth"])
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def create_user(
@@ -115,14 +118,31 @@ def delete_user(
     if not user_service.delete_user(user_id):
         raise HTTPException(status_code=404, detail="User not found")
 
-@router.post("/authenticate")
-def authenticate(
+@auth_router.post("/authenticate")
+async def authenticate(
+    request: Request,
     UserID: str,
     password: str,
     user_service: UserService = Depends(get_user_service)
 ):
-    """Authenticate user"""
-    user = user_service.authenticate_user(UserID, password)
+    """Authenticate user and issue a bearer token (rate limited per user and per client IP)"""
+    client_ip = request.client.host if request.client else "unknown"
+    user = await user_service.authenticate_user(UserID, password, client_ip)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    return {"message": "Authentication successful", "user_id": user.UserID}  # Changed to user.UserID
\ No newline at end of file
+    access_token, claims = token_signer.issue(user["UserID"], user["UserGroup"])
+    return {
+        "message": "Authentication successful",
+        "user_id": user["UserID"],
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": token_signer.ttl_seconds
+    }
+
+@auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    principal: Principal = Depends(get_current_principal),
+    user_service: UserService = Depends(get_user_service)
+):
+    """Revoke the bearer token used for this request"""
+    user_service.revoke_token(principal)
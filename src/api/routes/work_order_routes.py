@@ -1,80 +1,420 @@
 # src/api/routes/work_orders_routes.py
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+import json
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Path, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
+from datetime import date, datetime, timedelta
+from urllib.parse import quote
 from src.services.work_orders_service import WorkOrdersService
-from src.api.dependencies import get_work_orders_service
-from src.schemas.work_orders_schema import WorkOrdersCreate, WorkOrdersUpdate, WorkOrdersResponse, WorkOrdersCreateRequest, WorkOrdersFullResponse
+from src.services.facet_service import WorkOrdersFacetService
+from src.services.change_feed_service import wait_for_changes, stream_changes, latest_token
+from src.services.idempotency_service import idempotency_store, fingerprint_request, replay_response
+from src.api.dependencies import get_work_orders_service, get_facet_service, get_attachment_service
+from src.services.attachment_service import AttachmentService
+from src.services.attachment_storage import (
+    attachment_storage, BlobTooLargeError, ATTACHMENT_MAX_BYTES, ATTACHMENT_SENDFILE_HEADER, ATTACHMENT_SENDFILE_PREFIX
+)
+from src.schemas.work_orders_schema import WorkOrdersCreate, WorkOrdersUpdate, WorkOrdersResponse, WorkOrdersCreateRequest, WorkOrdersFullResponse, WorkOrdersBulkDeleteRequest, WorkOrdersBulkUpdateRequest, work_orders_row_serializer
+from src.services.job_service import job_queue
+from src.services.work_order_jobs import BULK_CREATE_JOB, BULK_DELETE_JOB, BULK_UPDATE_JOB, COMPLEX_CREATE_JOB, ARCHIVE_JOB, PURGE_JOB
 
 router = APIRouter(prefix="/api/v1/work_orders", tags=["work_orders"])  # Fixed typo: work_orderss -> work_orders
 
+
+def _etag(work_orders_id: int, version: int) -> str:
+    """Strong ETag for a work order version"""
+    return f'"{work_orders_id}-{version}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def _accepted(job_id: str) -> JSONResponse:
+    """202 response pointing at the job status endpoint"""
+    status_url = f"/api/v1/jobs/{job_id}"
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"job_id": job_id, "status": "queued", "status_url": status_url},
+        headers={"Location": status_url}
+    )
+
+
+def _expected_version(if_match: Optional[str], work_orders_id: int) -> Optional[int]:
+    """Extract the version a client is editing from If-Match (None = unconditional)"""
+    if not if_match or if_match.strip() == "*":
+        return None
+    prefix = f'"{work_orders_id}-'
+    for tag in if_match.split(","):
+        # Compressed responses carry the weak form of the same version tag
+        tag = tag.strip().removeprefix("W/")
+        if tag.startswith(prefix) and tag.endswith('"') and tag[len(prefix):-1].isdigit():
+            return int(tag[len(prefix):-1])
+    raise HTTPException(status_code=412, detail="If-Match does not match this work order")
+
+
 @router.post("/", response_model=WorkOrdersResponse, status_code=status.HTTP_201_CREATED)
 def create_work_orders(
     work_orders: WorkOrdersCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
     """Create a new work_orders record (simple version)"""
+    if idempotency_key:
+        fingerprint = fingerprint_request("POST", router.prefix + "/", work_orders.model_dump_json())
+        existing = idempotency_store.begin(idempotency_key, fingerprint)
+        if existing is not None:
+            return replay_response(existing, fingerprint)
     try:
         created_work_orders = work_orders_service.create_work_orders(work_orders)
-        return created_work_orders
+    except HTTPException:
+        if idempotency_key:
+            idempotency_store.release(idempotency_key)
+        raise
+    except IntegrityError:
+        if idempotency_key:
+            idempotency_store.release(idempotency_key)
+        raise HTTPException(
+            status_code=409,
+            detail="A work order with this document_number already exists; use PUT /by-document-number/{document_number} to upsert"
+        )
     except Exception as e:
+        if idempotency_key:
+            idempotency_store.release(idempotency_key)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    if idempotency_key:
+        body = jsonable_encoder(WorkOrdersResponse.model_validate(created_work_orders))
+        idempotency_store.complete(idempotency_key, fingerprint, status.HTTP_201_CREATED, body)
+    return created_work_orders
+
+@router.put("/by-document-number/{document_number}", response_model=WorkOrdersResponse)
+def upsert_work_order(
+    work_orders: WorkOrdersCreate,
+    response: Response,
+    document_number: str = Path(..., min_length=1, max_length=100),
+    work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
+):
+    """Create or replace a work order by document_number (201 when created, 200 when updated)"""
+    try:
+        result = work_orders_service.upsert_work_order(document_number, work_orders)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    work_order = result["work_order"]
+    response.status_code = status.HTTP_201_CREATED if result["created"] else status.HTTP_200_OK
+    response.headers["ETag"] = _etag(work_order.id, work_order.version_id)
+    return work_order
+
+@router.post("/upsert")
+def bulk_upsert_work_orders(
+    work_orders: List[WorkOrdersCreate],
+    work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
+):
+    """Create or replace many work orders by document_number in batched native upserts"""
+    if not work_orders:
+        raise HTTPException(status_code=400, detail="No work orders supplied")
+    try:
+        results = work_orders_service.upsert_work_orders(work_orders)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    created = sum(1 for result in results if result["created"])
+    return {
+        "upserted": len(results),
+        "created": created,
+        "updated": len(results) - created,
+        "results": results,
+    }
+
+@router.post("/bulk", status_code=status.HTTP_202_ACCEPTED)
+def bulk_create_work_orders(work_orders: List[WorkOrdersCreate]):
+    """Queue creation of many work_orders records (returns a job id)"""
+    if not work_orders:
+        raise HTTPException(status_code=400, detail="No work orders supplied")
+    return _accepted(job_queue.submit(BULK_CREATE_JOB, [item.model_dump() for item in work_orders]))
+
+@router.post("/bulk-delete", status_code=status.HTTP_202_ACCEPTED)
+def bulk_delete_work_orders(request_data: WorkOrdersBulkDeleteRequest):
+    """Queue soft deletion of work_orders by ids or filter (returns a job id; the result has the count)"""
+    criteria = request_data.filter.model_dump(exclude_none=True) if request_data.filter else None
+    return _accepted(job_queue.submit(BULK_DELETE_JOB, {"ids": request_data.ids, "filter": criteria}))
+
+@router.post("/bulk-update")
+def bulk_update_work_orders(
+    request_data: WorkOrdersBulkUpdateRequest,
+    background: bool = Query(False, description="Run as a background job and return 202 with a job id"),
+    work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
+):
+    """Set fields (e.g. budget_index, is_urgent) on every work order matching a filter"""
+    criteria = request_data.filter.model_dump(exclude_none=True)
+    values = request_data.set.model_dump(exclude_unset=True)
+    if background:
+        return _accepted(job_queue.submit(BULK_UPDATE_JOB, {"filter": criteria, "set": values}))
+    return work_orders_service.bulk_update_work_orders(criteria, values)
+
+@router.post("/archive/run", status_code=status.HTTP_202_ACCEPTED)
+def run_work_order_archival(
+    horizon_days: Optional[int] = Query(None, ge=0, description="Archive orders whose end_date is older than this (default ARCHIVE_HORIZON_DAYS)"),
+    batch_size: Optional[int] = Query(None, ge=1, le=1000, description="Orders moved per transaction"),
+):
+    """Queue a batched move of closed work orders to the archive tables (returns a job id)"""
+    return _accepted(job_queue.submit(ARCHIVE_JOB, {"horizon_days": horizon_days, "batch_size": batch_size}))
+
+@router.post("/purge/run", status_code=status.HTTP_202_ACCEPTED)
+def run_work_order_purge(
+    retention_days: Optional[float] = Query(None, ge=0, description="Purge orders deleted longer ago than this (default SOFT_DELETE_RETENTION_DAYS)"),
+):
+    """Queue physical deletion of soft-deleted work orders (returns a job id)"""
+    return _accepted(job_queue.submit(PURGE_JOB, {"retention_days": retention_days}))
 
 @router.post("/complex", status_code=status.HTTP_201_CREATED)
 def create_complex_work_order(
     request_data: WorkOrdersCreateRequest,
+    background: bool = Query(False, description="Run as a background job and return 202 with a job id"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
     """Create a new work order with complex payload (with work items)"""
+    if idempotency_key:
+        # A background retry must not be answered with a synchronous result (or vice versa)
+        path = router.prefix + "/complex" + ("?background=true" if background else "")
+        fingerprint = fingerprint_request("POST", path, request_data.model_dump_json())
+        existing = idempotency_store.begin(idempotency_key, fingerprint)
+        if existing is not None:
+            return replay_response(existing, fingerprint)
+    if background:
+        try:
+            accepted = _accepted(job_queue.submit(COMPLEX_CREATE_JOB, request_data.model_dump()))
+        except Exception:
+            if idempotency_key:
+                idempotency_store.release(idempotency_key)
+            raise
+        if idempotency_key:
+            # The retry gets the same job id back instead of queueing a second create
+            idempotency_store.complete(
+                idempotency_key, fingerprint, status.HTTP_202_ACCEPTED, json.loads(accepted.body)
+            )
+        return accepted
     try:
         result = work_orders_service.create_work_order_from_request(request_data)
-        return {
+        body = {
             "message": "Work order created successfully",
             "work_order_id": result["work_order"].id,
             "document_number": result["work_order"].document_number,
             "work_items_count": result["work_items_count"],
             "total_cost": result["total_cost"]
         }
+    except HTTPException:
+        if idempotency_key:
+            idempotency_store.release(idempotency_key)
+        raise
+    except IntegrityError:
+        if idempotency_key:
+            idempotency_store.release(idempotency_key)
+        raise HTTPException(
+            status_code=409,
+            detail="A work order with this document_number already exists; use PUT /{id}/complex to update it"
+        )
     except Exception as e:
+        if idempotency_key:
+            idempotency_store.release(idempotency_key)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    if idempotency_key:
+        idempotency_store.complete(idempotency_key, fingerprint, status.HTTP_201_CREATED, body)
+    return body
 
 
 @router.get("/", response_model=List[WorkOrdersResponse])
 def get_work_orderss(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None, description=f"Search in document_number, scope_of_works, budget_index"),
+    approximate_count: bool = Query(False, description="Use engine statistics for the unfiltered X-Total-Count"),
+    include_archived: bool = Query(False, description="Also list work orders moved to the archive"),
+    modified_since: Optional[datetime] = Query(None, description="Incremental sync: rows with updated_at after this (database time)"),
+    after_id: int = Query(0, ge=0, description="Incremental sync: id tie-breaker for rows at exactly modified_since"),
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
-    """Get all work_orderss with pagination and search"""
-    if search:
-        return work_orders_service.search_work_orderss(search, skip, limit)
-    return work_orders_service.get_work_orderss(skip, limit)
+    """Get all work_orderss with pagination and search (total in X-Total-Count header).
+
+    With modified_since, returns changed rows in (updated_at, id) order instead;
+    pass back X-Next-Modified-Since / X-Next-After-Id to fetch the next page.
+    """
+    if modified_since is not None:
+        rows = work_orders_service.get_work_orders_modified_since(modified_since, after_id, limit)
+        if rows:
+            response.headers["X-Next-Modified-Since"] = rows[-1].updated_at.isoformat()
+            response.headers["X-Next-After-Id"] = str(rows[-1].id)
+        else:
+            response.headers["X-Next-Modified-Since"] = modified_since.isoformat()
+            response.headers["X-Next-After-Id"] = str(after_id)
+        return rows
+    
+    total = work_orders_service.count_work_orderss(
+        search=search, approximate=approximate_count, include_archived=include_archived
+    )
+    # Read-only page: plain rows straight into the pre-built serializer
+    rows = work_orders_service.get_work_orders_rows(skip, limit, search, include_archived=include_archived)
+    return Response(
+        content=work_orders_row_serializer.to_json(rows),
+        media_type="application/json",
+        headers={"X-Total-Count": str(total)}
+    )
+
+@router.get("/facets")
+def get_work_order_facets(
+    columns: List[str] = Query(..., description="Columns to facet, e.g. cost_type, submitted_by"),
+    prefix: Optional[str] = Query(None, description="Only values starting with this prefix"),
+    limit: int = Query(20, ge=1, le=500, description="Top-N values per column"),
+    facet_service: WorkOrdersFacetService = Depends(get_facet_service)
+):
+    """Get value -> count pairs for filter dropdowns"""
+    try:
+        return {"facets": facet_service.get_facets(columns, prefix=prefix, limit=limit)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/changes")
+async def get_work_order_changes(
+    since: Optional[int] = Query(None, ge=0, description="Token from a previous response; omit to start from now"),
+    limit: int = Query(100, ge=1, le=1000),
+    wait: float = Query(0, ge=0, le=60, description="Long-poll: seconds to wait for new changes"),
+):
+    """Change feed of work order mutations (resume with next_token)"""
+    if since is None:
+        return {"changes": [], "next_token": await run_in_threadpool(latest_token)}
+    changes = await wait_for_changes(since, limit, wait)
+    return {"changes": changes, "next_token": changes[-1]["token"] if changes else since}
+
+@router.get("/changes/stream")
+async def stream_work_order_changes(
+    since: Optional[int] = Query(None, ge=0, description="Token to resume after; omit to start from now"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Server-Sent Events stream of work order mutations"""
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = await run_in_threadpool(latest_token)
+    return StreamingResponse(
+        stream_changes(since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/dashboard/summary")
+def get_dashboard_summary(
+    group_by: Optional[str] = Query(None, description="submitted_by (division), cost_type or budget_status"),
+    month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Request month, e.g. 2025-10"),
+    start_date: Optional[date] = Query(None, description="Request date from (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Request date to (inclusive)"),
+    is_urgent: Optional[bool] = Query(None),
+    over_budget: Optional[bool] = Query(None, description="cost_estimation greater than remaining_budget"),
+    submitted_by: Optional[str] = Query(None),
+    cost_type: Optional[str] = Query(None),
+    budget_status: Optional[str] = Query(None),
+    work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
+):
+    """Counts and cost totals for dashboard tiles, e.g. urgent orders per division this month over budget"""
+    if month:
+        year, month_number = int(month[:4]), int(month[5:])
+        if not 1 <= month_number <= 12:
+            raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+        start_date = date(year, month_number, 1)
+        end_date = date(year + month_number // 12, month_number % 12 + 1, 1) - timedelta(days=1)
+    equals = {
+        name: value
+        for name, value in (("submitted_by", submitted_by), ("cost_type", cost_type), ("budget_status", budget_status))
+        if value is not None
+    }
+    try:
+        return work_orders_service.dashboard_summary(
+            group_by=group_by, start_date=start_date, end_date=end_date,
+            is_urgent=is_urgent, over_budget=over_budget, equals=equals
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/autocomplete")
+def autocomplete_work_orders(
+    field: str = Query(..., description="document_number, recommended_contractor, budget_name or vendor_name"),
+    q: str = Query(..., min_length=1, description="Prefix to complete"),
+    limit: int = Query(10, ge=1, le=100),
+    work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
+):
+    """Typeahead suggestions for work order pickers (prefix match, case-insensitive)"""
+    try:
+        return {"field": field, "results": work_orders_service.autocomplete(field, q, limit)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/authorizations/pending")
+def get_pending_authorizations(
+    approver: str = Query(..., min_length=1, max_length=100, description="Approver to list pending steps for"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
+):
+    """Approval steps still pending for an approver (one indexed query)"""
+    return {
+        "approver": approver,
+        "results": work_orders_service.get_pending_authorizations(approver.strip(), skip, limit)
+    }
 
 # In src/api/routes/work_orders_routes.py
 @router.get("/{work_orders_id}", response_model=WorkOrdersFullResponse)  # Changed response model
 def get_work_orders(
+    response: Response,
     work_orders_id: int = Path(..., ge=1, description="WorkOrders ID"),
+    if_none_match: Optional[str] = Header(None),
+    include_archived: bool = Query(False, description="Fall back to the archive when the order is not live"),
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
     """Get a single work_orders by ID (returns same structure as POST payload)"""
+    # Conditional GET: compare versions before loading and serializing the order
+    if if_none_match:
+        version = work_orders_service.get_work_order_version(work_orders_id, include_archived=include_archived)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Work order not found")
+        etag = _etag(work_orders_id, version)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
     # FIX: Changed from get_work_orderss (plural) to get_work_orders (singular)
-    work_orders = work_orders_service.get_work_orders(work_orders_id)  # <-- Fixed here
+    work_orders = work_orders_service.get_work_orders(work_orders_id, include_archived=include_archived)  # <-- Fixed here
     if not work_orders:
         raise HTTPException(status_code=404, detail="Work order not found")
+    response.headers["ETag"] = _etag(work_orders_id, work_orders["workOrder"]["version"])
     return work_orders
 
 @router.put("/{work_orders_id}", response_model=WorkOrdersResponse)
 def update_work_orders(
     work_orders_id: int,
     work_orders_update: WorkOrdersUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
-    """Update work_orders"""
+    """Update work_orders (If-Match: <ETag> rejects stale edits with 412)"""
+    expected_version = _expected_version(if_match, work_orders_id)
     try:
-        updated_work_orders = work_orders_service.update_work_orders(work_orders_id, work_orders_update)
+        updated_work_orders = work_orders_service.update_work_orders(
+            work_orders_id, work_orders_update, expected_version=expected_version
+        )
         if not updated_work_orders:
-            raise HTTPException(status_code=404, detail=f"{pascal_name} not found")
+            raise HTTPException(status_code=404, detail="Work order not found")
+        response.headers["ETag"] = _etag(work_orders_id, updated_work_orders.version_id)
         return updated_work_orders
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -82,11 +422,17 @@ def update_work_orders(
 def update_complex_work_order(
     work_orders_id: int,
     request_data: WorkOrdersCreateRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
     """Create a new work order with complex payload (with work items)"""
+    expected_version = _expected_version(if_match, work_orders_id)
     try:
-        result = work_orders_service.update_work_order_from_request(work_orders_id, request_data)
+        result = work_orders_service.update_work_order_from_request(
+            work_orders_id, request_data, expected_version=expected_version
+        )
+        response.headers["ETag"] = _etag(work_orders_id, result["work_order"].version_id)
         return {
             "message": "Work order created successfully",
             "work_order_id": result["work_order"].id,
@@ -94,6 +440,8 @@ def update_complex_work_order(
             "work_items_count": result["work_items_count"],
             "total_cost": result["total_cost"]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -102,6 +450,98 @@ def delete_work_orders(
     work_orders_id: int,
     work_orders_service: WorkOrdersService = Depends(get_work_orders_service)
 ):
-    """Delete work_orders"""
+    """Delete work_orders (soft delete; purged later by POST /purge/run)"""
     if not work_orders_service.delete_work_orders(work_orders_id):
-        raise HTTPException(status_code=404, detail=f"{pascal_name} not found")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Work order not found")
+
+def _document_response(work_orders_id: int, document) -> dict:
+    """Attachment metadata plus the URL its content is served from"""
+    return {
+        "id": document.id,
+        "workOrderId": document.work_order_id,
+        "documentType": document.document_type,
+        "hasDocument": bool(document.has_document),
+        "fileName": document.file_name,
+        "contentType": document.content_type,
+        "sizeBytes": document.size_bytes,
+        "contentHash": document.content_hash,
+        "uploadedAt": document.uploaded_at,
+        "contentUrl": f"{router.prefix}/{work_orders_id}/documents/{document.document_type}/content",
+    }
+
+
+@router.put("/{work_orders_id}/documents/{document_type}/content")
+async def upload_work_order_document(
+    request: Request,
+    work_orders_id: int = Path(..., ge=1),
+    document_type: str = Path(..., max_length=100),
+    filename: Optional[str] = Query(None, max_length=255, description="Original file name (defaults to the document type)"),
+    attachment_service: AttachmentService = Depends(get_attachment_service)
+):
+    """Store a document's content from the raw request body (streamed, never buffered whole)"""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > ATTACHMENT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Attachment exceeds {ATTACHMENT_MAX_BYTES} bytes")
+    await run_in_threadpool(attachment_service.ensure_work_order, work_orders_id)
+    try:
+        content_hash, size_bytes = await attachment_storage.put(request.stream())
+    except BlobTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    content_type = request.headers.get("content-type") or "application/octet-stream"
+    try:
+        document = await run_in_threadpool(
+            attachment_service.attach, work_orders_id, document_type, content_hash, size_bytes,
+            filename or document_type, content_type[:100]
+        )
+    except Exception:
+        # Do not leave a blob behind that nothing points at
+        await run_in_threadpool(attachment_service.release, [content_hash])
+        raise
+    return _document_response(work_orders_id, document)
+
+
+@router.get("/{work_orders_id}/documents/{document_type}/content")
+def download_work_order_document(
+    work_orders_id: int = Path(..., ge=1),
+    document_type: str = Path(..., max_length=100),
+    if_none_match: Optional[str] = Header(None),
+    include_archived: bool = Query(False, description="Fall back to the archive when the order is not live"),
+    attachment_service: AttachmentService = Depends(get_attachment_service)
+):
+    """Download a document's content (supports Range requests)"""
+    document = attachment_service.locate(work_orders_id, document_type, include_archived=include_archived)
+    # Content-addressed, so the hash is a strong validator for If-None-Match and If-Range
+    etag = f'"{document.content_hash}"'
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    media_type = document.content_type or "application/octet-stream"
+    file_name = document.file_name or document.document_type
+    if ATTACHMENT_SENDFILE_HEADER and attachment_storage.local_path(document.content_hash):
+        # The fronting proxy serves the file (and Range requests) with sendfile
+        return Response(
+            media_type=media_type,
+            headers={
+                ATTACHMENT_SENDFILE_HEADER: ATTACHMENT_SENDFILE_PREFIX + attachment_storage.key(document.content_hash),
+                "ETag": etag,
+                "Content-Disposition": f"attachment; filename*=utf-8''{quote(file_name)}",
+            }
+        )
+    path = attachment_storage.local_path(document.content_hash)
+    if path:
+        return FileResponse(path, media_type=media_type, filename=file_name, headers={"ETag": etag})
+    # Backends without local files stream the blob (no Range support)
+    return StreamingResponse(
+        iterate_in_threadpool(attachment_storage.open(document.content_hash)),
+        media_type=media_type,
+        headers={"ETag": etag}
+    )
+
+
+@router.delete("/{work_orders_id}/documents/{document_type}/content", status_code=status.HTTP_204_NO_CONTENT)
+def delete_work_order_document(
+    work_orders_id: int = Path(..., ge=1),
+    document_type: str = Path(..., max_length=100),
+    attachment_service: AttachmentService = Depends(get_attachment_service)
+):
+    """Remove a document's stored content"""
+    attachment_service.detach(work_orders_id, document_type)
@@ -1,8 +1,8 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-from typing import Optional
+from typing import Optional, Tuple
 import os
 from dotenv import load_dotenv
 
@@ -33,10 +33,11 @@ class DatabaseConfig:
             # Use pymysql driver
             return f"mysql+pymysql://{db_user}:{db_password}@{db_host}{port}/{db_name}?charset=utf8mb4"
         
-        # PostgreSQL
+        # PostgreSQL (psycopg2 by default; DB_PG_DRIVER=psycopg for psycopg 3)
         elif db_engine == "postgresql":
             port = f":{db_port}" if db_port else ""
-            return f"postgresql://{db_user}:{db_password}@{db_host}{port}/{db_name}"
+            driver = "+psycopg" if os.getenv("DB_PG_DRIVER", "psycopg2").lower() == "psycopg" else ""
+            return f"postgresql{driver}://{db_user}:{db_password}@{db_host}{port}/{db_name}"
         
         # Oracle
         elif db_engine == "oracle":
@@ -47,6 +48,37 @@ class DatabaseConfig:
         else:
             raise ValueError(f"Unsupported database engine: {db_engine}")
 
+    @staticmethod
+    def get_pool_settings() -> Tuple[int, int]:
+        """Get (pool_size, max_overflow) for this process.
+
+        When DB_CONNECTION_BUDGET is set, it is the maximum number of connections
+        for the whole deployment and is split evenly across WEB_CONCURRENCY workers.
+        """
+        pool_size = int(os.getenv("DB_POOL_SIZE", 10))
+        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
+        budget = os.getenv("DB_CONNECTION_BUDGET")
+        if budget:
+            workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+            per_worker = max(1, int(budget) // workers)
+            pool_size = min(pool_size, per_worker)
+            max_overflow = min(max_overflow, per_worker - pool_size)
+        return pool_size, max_overflow
+
+    @staticmethod
+    def get_connect_args() -> dict:
+        """Driver arguments for server-side prepared statements where supported.
+
+        psycopg 3 prepares a statement on the server after it has run
+        DB_PREPARE_THRESHOLD times on a connection. psycopg2, pymysql and
+        pyodbc have no equivalent switch.
+        """
+        if os.getenv("DB_ENGINE", "sqlserver").lower() == "postgresql" \
+                and os.getenv("DB_PG_DRIVER", "psycopg2").lower() == "psycopg":
+            return {"prepare_threshold": int(os.getenv("DB_PREPARE_THRESHOLD", 5))}
+        return {}
+
 class DatabaseManager:
     """Database connection manager"""
     
@@ -60,9 +92,8 @@ class DatabaseManager:
         """Initialize database connection"""
         connection_string = DatabaseConfig.get_connection_string()
         
-        # Pool configuration
-        pool_size = int(os.getenv("DB_POOL_SIZE", 10))
-        max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 20))
+        # Pool configuration (split across workers when a budget is set)
+        pool_size, max_overflow = DatabaseConfig.get_pool_settings()
         
         # Create engine with connection pooling
         self.engine = create_engine(
@@ -71,9 +102,22 @@ class DatabaseManager:
             pool_size=pool_size,
             max_overflow=max_overflow,
             pool_pre_ping=True,  # Verify connections before using
+            # Compiled SQL cache; sized to hold every statement shape we issue
+            query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", 1200)),
+            connect_args=DatabaseConfig.get_connect_args(),
             echo=os.getenv("DEBUG", "false").lower() == "true"
         )
         
+        # cx_Oracle keeps a per-connection cache of parsed statements
+        if self.engine.dialect.name == "oracle":
+            @event.listens_for(self.engine, "connect")
+            def _set_statement_cache(dbapi_connection, connection_record):
+                dbapi_connection.stmtcachesize = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 50))
+
+        # Compiled-cache hit counters for GET /health/statement-cache
+        from src.repositories.statements import attach_statement_cache_listener
+        attach_statement_cache_listener(self.engine)
+
         # Create session factory
         self.SessionLocal = sessionmaker(
             autocommit=False,
@@ -0,0 +1,137 @@
+# src/config/startup.py
+"""Cold-start helpers: schema mode, pool/statement warm-up and a startup profile.
+
+For a per-module breakdown of third-party imports, run once with
+`python -X importtime -m src.server`; the profile here tracks our own
+routers and the lifespan phases on every boot.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# "create" runs Base.metadata.create_all on boot; "migrations" trusts alembic
+DB_SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "create").lower()
+# Connections to open before accepting traffic (0 = lazily on first use)
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", 0))
+# Run the hot queries once so their compiled SQL is cached before traffic
+WARM_STATEMENTS = os.getenv("WARM_STATEMENTS", "true").lower() == "true"
+
+
+class StartupProfile:
+    """Timings for imports and lifespan phases, plus time to first request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports: Dict[str, float] = {}
+        self.phases: Dict[str, float] = {}
+        self.ready_after: Optional[float] = None
+        self.first_request_after: Optional[float] = None
+
+    def _elapsed(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    @contextmanager
+    def track_import(self, name: str) -> Iterator[None]:
+        """Time an import block (cumulative, includes what it imports in turn)"""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports[name] = round((time.perf_counter() - began) * 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a startup phase"""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - began) * 1000, 1)
+
+    def mark_ready(self) -> None:
+        self.ready_after = self._elapsed()
+
+    def mark_first_request(self) -> None:
+        if self.first_request_after is None:
+            self.first_request_after = self._elapsed()
+
+    def report(self) -> Dict[str, Any]:
+        """Milliseconds since this module was imported (roughly process start)"""
+        return {
+            "schema_mode": DB_SCHEMA_MODE,
+            "imports_ms": self.imports,
+            "phases_ms": self.phases,
+            "ready_after_ms": self.ready_after,
+            "first_request_after_ms": self.first_request_after,
+        }
+
+    def summary(self) -> str:
+        slowest = sorted({**self.imports, **self.phases}.items(), key=lambda item: -item[1])[:5]
+        return f"Startup ready after {self.ready_after}ms (slowest: " + ", ".join(
+            f"{name}={ms}ms" for name, ms in slowest
+        ) + ")"
+
+
+# Process-wide profile, filled in by src.main
+startup_profile = StartupProfile()
+
+
+class FirstRequestTimer:
+    """ASGI middleware recording when the first HTTP request arrives"""
+
+    def __init__(self, app, profile: StartupProfile = startup_profile):
+        self.app = app
+        self.profile = profile
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.profile.first_request_after is None:
+            self.profile.mark_first_request()
+        await self.app(scope, receive, send)
+
+
+def warm_pool(engine, connections: int) -> int:
+    """Open up to `connections` pooled connections concurrently and return them to the pool"""
+    connections = min(connections, engine.pool.size()) if hasattr(engine.pool, "size") else connections
+    if connections <= 0:
+        return 0
+
+    def open_connection(_):
+        connection = engine.connect()
+        connection.execute(text("SELECT 1") if engine.dialect.name != "oracle" else text("SELECT 1 FROM DUAL"))
+        return connection
+
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        opened = list(executor.map(open_connection, range(connections)))
+    for connection in opened:
+        connection.close()
+    return len(opened)
+
+
+def warm_statements(db: Session) -> int:
+    """Run the hot read paths once against a missing id so SQLAlchemy compiles and caches their SQL"""
+    from src.repositories.work_orders_repository import WorkOrdersRepository
+    from src.services.count_service import WorkOrdersCountService
+    from src.services.work_orders_service import WorkOrdersService
+
+    service = WorkOrdersService(db)
+    repository = WorkOrdersRepository(db)
+    warmups = (
+        lambda: service.get_work_orders(0),
+        lambda: service.get_work_order_version(0),
+        lambda: repository.list_rows(skip=0, limit=1),
+        lambda: WorkOrdersCountService(db).exact_count(),
+    )
+    warmed = 0
+    for warmup in warmups:
+        try:
+            warmup()
+            warmed += 1
+        except Exception as e:
+            print(f"Error warming statement: {e}")
+            db.rollback()
+    db.rollback()
+    return warmed
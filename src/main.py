@@ -1,31 +1,113 @@
-from fastapi import FastAPI
+from src.config.startup import (
+    startup_profile, FirstRequestTimer, warm_pool, warm_statements,
+    DB_SCHEMA_MODE, DB_POOL_WARM, WARM_STATEMENTS,
+)
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from contextlib import asynccontextmanager
 
 from src.config.database import db_manager
-from src.api.routes.user_routes import router as api_router
-from src.api.routes.work_order_routes import router as work_order_router
+from src.api.compression import CompressionMiddleware, COMPRESSION_ENABLED
+with startup_profile.track_import("src.api.routes.user_routes"):
+    from src.api.routes.user_routes import router as api_router, auth_router
+with startup_profile.track_import("src.api.routes.work_order_routes"):
+    from src.api.routes.work_order_routes import router as work_order_router
+with startup_profile.track_import("src.api.routes.job_routes"):
+    from src.api.routes.job_routes import router as job_router
+# Already loaded by the routers above, so it does not skew their timings
+from src.api.dependencies import require_principal
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events"""
     # Startup
     print("Initializing database...")
-    db_manager.init_db()
+    with startup_profile.phase("init_db"):
+        db_manager.init_db()
     
-    # Create tables (in production, use Alembic migrations)
+    # Create tables only in "create" mode; with DB_SCHEMA_MODE=migrations the
+    # schema is owned by `alembic upgrade head` and boot skips the metadata queries
     from src.models.base import Base
+    if DB_SCHEMA_MODE == "create":
+        try:
+            with startup_profile.phase("create_all"):
+                Base.metadata.create_all(bind=db_manager.engine)
+            print("Database tables created/verified")
+        except Exception as e:
+            print(f"Error creating tables: {e}")
+    else:
+        print("Skipping create_all (DB_SCHEMA_MODE=migrations)")
+    
+    # Open connections up front so the first requests don't pay for the handshake
+    if DB_POOL_WARM > 0:
+        try:
+            with startup_profile.phase("warm_pool"):
+                opened = warm_pool(db_manager.engine, DB_POOL_WARM)
+            print(f"Connection pool warmed with {opened} connections")
+        except Exception as e:
+            print(f"Error warming connection pool: {e}")
+    
+    db = db_manager.SessionLocal()
     try:
-        Base.metadata.create_all(bind=db_manager.engine)
-        print("Database tables created/verified")
+        # Compile the hot queries before traffic arrives
+        if WARM_STATEMENTS:
+            with startup_profile.phase("warm_statements"):
+                warm_statements(db)
+        
+        # Warm the typeahead index so the first lookup doesn't pay for it
+        from src.services.autocomplete_index import autocomplete_index
+        try:
+            with startup_profile.phase("warm_autocomplete"):
+                autocomplete_index.warm(db)
+            print("Autocomplete index warmed")
+        except Exception as e:
+            print(f"Error warming autocomplete index: {e}")
+        
+        # Load the user directory behind the user pickers
+        from src.services.user_directory import user_directory
+        try:
+            with startup_profile.phase("warm_user_directory"):
+                user_directory.warm(db)
+            print(f"User directory warmed ({len(user_directory)} users)")
+        except Exception as e:
+            print(f"Error warming user directory: {e}")
+        
+        # Build the dashboard snapshot before traffic when it is enabled
+        from src.services.work_order_snapshot import work_order_snapshot, WORK_ORDER_SNAPSHOT_ENABLED
+        if WORK_ORDER_SNAPSHOT_ENABLED:
+            try:
+                with startup_profile.phase("build_snapshot"):
+                    work_order_snapshot.rebuild(db)
+                print(f"Work order snapshot built ({len(work_order_snapshot)} rows)")
+            except Exception as e:
+                print(f"Error building work order snapshot: {e}")
+    finally:
+        db.close()
+    
+    # Start background workers (also re-enqueues jobs interrupted by a restart)
+    from src.services.job_service import job_queue
+    try:
+        with startup_profile.phase("start_jobs"):
+            job_queue.start()
+        print("Background job workers started")
     except Exception as e:
-        print(f"Error creating tables: {e}")
+        print(f"Error starting background job workers: {e}")
+    
+    # Load token revocations, then keep them fresh in the background
+    from src.services.token_service import revocation_list
+    with startup_profile.phase("load_revocations"):
+        revocation_list.start()
+    
+    startup_profile.mark_ready()
+    print(startup_profile.summary())
     
     yield
     
     # Shutdown
     print("Shutting down...")
+    job_queue.stop()
+    revocation_list.stop()
     if db_manager.engine:
         db_manager.engine.dispose()
 
@@ -44,11 +126,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Total-Count", "Idempotent-Replayed", "ETag",
+        "X-Next-Modified-Since", "X-Next-After-Id",
+    ],
 )
 
-# Include routers
-app.include_router(api_router)
-app.include_router(work_order_router)
+# Compress JSON responses (gzip, plus br/zstd when installed)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Records time to first request for /health/startup
+app.add_middleware(FirstRequestTimer)
+
+# Include routers; everything but /authenticate and the health checks needs a bearer token
+app.include_router(auth_router)
+app.include_router(api_router, dependencies=[Depends(require_principal)])
+app.include_router(work_order_router, dependencies=[Depends(require_principal)])
+app.include_router(job_router, dependencies=[Depends(require_principal)])
 
 # Health check endpoint
 @app.get("/health")
@@ -60,6 +155,23 @@ async def health_check():
         "database": "connected" if db_manager.engine else "disconnected"
     }
 
+@app.get("/health/startup")
+async def startup_report():
+    """Startup profile: import and phase timings, time to ready and to first request"""
+    return startup_profile.report()
+
+@app.get("/health/statement-cache")
+async def statement_cache_report():
+    """Compiled SQL cache hit rates for the statement registry"""
+    from src.repositories.statements import statement_cache_stats
+    return {"statements": statement_cache_stats.report()}
+
+@app.get("/health/transactions")
+async def transaction_report():
+    """How often units of work were retried after deadlocks and lock timeouts"""
+    from src.services.unit_of_work import unit_of_work_metrics
+    return {"transactions": unit_of_work_metrics.report()}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
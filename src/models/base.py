@@ -1,6 +1,7 @@
 # src/models/base.py
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, SmallInteger, Numeric, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, SmallInteger, Numeric, ForeignKey, Boolean, Index, event, text
+from sqlalchemy.orm import relationship, Session, with_loader_criteria
+from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -11,7 +12,7 @@ class WorkOrderItems(Base):
     __tablename__ = "work_order_items"
 
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
-    work_order_id = Column(Integer, ForeignKey('work_orders.id'), nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders.id', ondelete='CASCADE'), nullable=False)
     description = Column(Text, nullable=False)
     quantity = Column(Numeric(10, 2), nullable=False, default=1.00)
     unit_price = Column(Numeric(15, 2), nullable=False, default=0.00)
@@ -31,7 +32,7 @@ class WorkOrderVendors(Base):
     __tablename__ = "work_order_vendors"
 
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
-    work_order_id = Column(Integer, ForeignKey('work_orders.id'), nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders.id', ondelete='CASCADE'), nullable=False)
     vendor_name = Column(String(200), nullable=True)
     
     # Use string reference for relationship
@@ -46,9 +47,15 @@ class SupportingDocuments(Base):
     __tablename__ = "supporting_documents"
     
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
-    work_order_id = Column(Integer, ForeignKey('work_orders.id'), nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders.id', ondelete='CASCADE'), nullable=False)
     document_type = Column(String(100), nullable=False)
     has_document = Column(Boolean, default=False)
+    # Stored content (see src/services/attachment_storage.py); NULL until uploaded
+    file_name = Column(String(255), nullable=True)
+    content_type = Column(String(100), nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
+    uploaded_at = Column(DateTime, nullable=True)
     
     # FIXED: Point to WorkOrders, not self, and match the back_populates name
     work_order = relationship("WorkOrders", back_populates="supporting_documents")
@@ -56,6 +63,30 @@ class SupportingDocuments(Base):
     def __repr__(self):
         return f"<SupportingDocuments(id={self.id}, document_type='{self.document_type}', has_document={self.has_document})>"
 
+class WorkOrderAuthorizations(Base):
+    """work_order_authorizations model (one row per approval step)"""
+    __tablename__ = "work_order_authorizations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders.id', ondelete='CASCADE'), nullable=False, index=True)
+    approver = Column(String(100), nullable=False)
+    role = Column(String(100), nullable=True)
+    status = Column(String(20), nullable=False, default='pending', server_default='pending')
+    step_order = Column(Integer, nullable=True, default=0)
+    decided_at = Column(DateTime, nullable=True)
+    comments = Column(Text, nullable=True)
+
+    work_order = relationship("WorkOrders", back_populates="authorizations")
+
+    __table_args__ = (
+        # "Pending for approver X" is an equality seek on the leading columns,
+        # already in (work_order_id, step_order) order
+        Index('ix_work_order_authorizations_approver_status', 'approver', 'status', 'work_order_id', 'step_order'),
+    )
+
+    def __repr__(self):
+        return f"<WorkOrderAuthorizations(id={self.id}, approver='{self.approver}', status='{self.status}')>"
+
 # Define WorkOrders LAST, now it can reference the already-defined classes
 class WorkOrders(Base):
     """work_orders model"""
@@ -82,28 +113,277 @@ class WorkOrders(Base):
     reason = Column(Text, nullable=True)
     vendor_selection_method = Column(String, nullable=True)
     test_and_analysis = Column(Text, nullable=True)
-    created_at = Column(DateTime, nullable=True, server_default='CURRENT_TIMESTAMP')
-    updated_at = Column(DateTime, nullable=True, onupdate='CURRENT_TIMESTAMP')
+    # Both timestamps come from the database clock, never from clients
+    created_at = Column(DateTime, nullable=True, server_default=func.now())
+    updated_at = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
+    # Incremented by the ORM on every UPDATE; exposed as the ETag
+    version_id = Column(Integer, nullable=False, default=1, server_default='1')
+    # Soft delete: set instead of deleting; rows are purged later by a background job.
+    # The tombstone also gives up its document number (see DELETED_DOCUMENT_NUMBER_PREFIX)
+    deleted_at = Column(DateTime, nullable=True)
     
-    # Now we can reference the already-defined classes
-    work_items = relationship("WorkOrderItems", back_populates="work_order", cascade="all, delete-orphan")
-    vendors = relationship("WorkOrderVendors", back_populates="work_order", cascade="all, delete-orphan")
+    # Now we can reference the already-defined classes (children go with the
+    # parent through ON DELETE CASCADE instead of being loaded and deleted one by one)
+    work_items = relationship("WorkOrderItems", back_populates="work_order", cascade="all, delete-orphan", passive_deletes=True)
+    vendors = relationship("WorkOrderVendors", back_populates="work_order", cascade="all, delete-orphan", passive_deletes=True)
     # FIXED: Now matches SupportingDocuments.work_order
-    supporting_documents = relationship("SupportingDocuments", back_populates="work_order", cascade="all, delete-orphan")
+    supporting_documents = relationship("SupportingDocuments", back_populates="work_order", cascade="all, delete-orphan", passive_deletes=True)
+    authorizations = relationship(
+        "WorkOrderAuthorizations", back_populates="work_order", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="WorkOrderAuthorizations.step_order"
+    )
+
+    __mapper_args__ = {"version_id_col": version_id}
+    __table_args__ = (
+        # Keyset index for incremental sync (modified_since)
+        Index('ix_work_orders_updated_at_id', 'updated_at', 'id'),
+        # Archival scans for live orders closed before the horizon
+        Index(
+            'ix_work_orders_end_date', 'end_date',
+            postgresql_where=text('deleted_at IS NULL'),
+            mssql_where=text('deleted_at IS NULL'),
+            sqlite_where=text('deleted_at IS NULL'),
+        ),
+        # Purge scans over tombstones only (Oracle leaves all-NULL keys out of
+        # B-tree indexes, so its plain index is just as small)
+        Index(
+            'ix_work_orders_deleted_at', 'deleted_at',
+            postgresql_where=text('deleted_at IS NOT NULL'),
+            mssql_where=text('deleted_at IS NOT NULL'),
+            sqlite_where=text('deleted_at IS NOT NULL'),
+        ),
+        # Archived orders keep their ids, so SQLite must never hand an id out twice
+        # (plain INTEGER PRIMARY KEY reuses the highest id once it is deleted)
+        {'sqlite_autoincrement': True},
+    )
 
     def __repr__(self):
         return f"<WorkOrders(id={self.id}, document_number='{self.document_number}')>"
 
 
+# Soft-deleted orders get document_number = prefix + id, so the unique number
+# can be reused at once instead of staying taken until the purge
+DELETED_DOCUMENT_NUMBER_PREFIX = "~deleted~"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted_work_orders(execute_state):
+    """Global filter: ORM selects only see live work orders unless run with include_deleted=True"""
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(WorkOrders, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
+# Archive tier: closed work orders moved out of the hot tables by the archival
+# job. Same columns and ids as the live tables, plus when the row was moved.
+class ArchivedWorkOrderItems(Base):
+    """work_order_items_archive model"""
+    __tablename__ = "work_order_items_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False, nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders_archive.id'), nullable=False, index=True)
+    description = Column(Text, nullable=False)
+    quantity = Column(Numeric(10, 2), nullable=False)
+    unit_price = Column(Numeric(15, 2), nullable=False)
+    total_price = Column(Numeric(15, 2), nullable=False)
+    item_order = Column(Integer, nullable=True)
+
+    work_order = relationship("ArchivedWorkOrders", back_populates="work_items")
+
+    def __repr__(self):
+        return f"<ArchivedWorkOrderItems(id={self.id}, work_order_id={self.work_order_id})>"
+
+
+class ArchivedWorkOrderVendors(Base):
+    """work_order_vendors_archive model"""
+    __tablename__ = "work_order_vendors_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False, nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders_archive.id'), nullable=False, index=True)
+    vendor_name = Column(String(200), nullable=True)
+
+    work_order = relationship("ArchivedWorkOrders", back_populates="vendors")
+
+    def __repr__(self):
+        return f"<ArchivedWorkOrderVendors(id={self.id}, vendor_name='{self.vendor_name}')>"
+
+
+class ArchivedSupportingDocuments(Base):
+    """supporting_documents_archive model"""
+    __tablename__ = "supporting_documents_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False, nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders_archive.id'), nullable=False, index=True)
+    document_type = Column(String(100), nullable=False)
+    has_document = Column(Boolean, nullable=True)
+    file_name = Column(String(255), nullable=True)
+    content_type = Column(String(100), nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
+    uploaded_at = Column(DateTime, nullable=True)
+
+    work_order = relationship("ArchivedWorkOrders", back_populates="supporting_documents")
+
+    def __repr__(self):
+        return f"<ArchivedSupportingDocuments(id={self.id}, document_type='{self.document_type}')>"
+
+
+class ArchivedWorkOrderAuthorizations(Base):
+    """work_order_authorizations_archive model"""
+    __tablename__ = "work_order_authorizations_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False, nullable=False)
+    work_order_id = Column(Integer, ForeignKey('work_orders_archive.id'), nullable=False, index=True)
+    approver = Column(String(100), nullable=False)
+    role = Column(String(100), nullable=True)
+    status = Column(String(20), nullable=False)
+    step_order = Column(Integer, nullable=True)
+    decided_at = Column(DateTime, nullable=True)
+    comments = Column(Text, nullable=True)
+
+    work_order = relationship("ArchivedWorkOrders", back_populates="authorizations")
+
+    def __repr__(self):
+        return f"<ArchivedWorkOrderAuthorizations(id={self.id}, approver='{self.approver}')>"
+
+
+class ArchivedWorkOrders(Base):
+    """work_orders_archive model (read-only copies of archived work orders)"""
+    __tablename__ = "work_orders_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False, nullable=False)
+    document_number = Column(String(100), nullable=False, index=True)
+    request_date = Column(Date, nullable=False)
+    request_type = Column(String, nullable=False)
+    submitted_by = Column(String, nullable=False)
+    scope_of_works = Column(Text, nullable=True)
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)
+    is_urgent = Column(SmallInteger, nullable=True)
+    budget_status = Column(String, nullable=True)
+    cost_type = Column(String, nullable=True)
+    budget_index = Column(String(50), nullable=True)
+    budget_name = Column(String(200), nullable=True)
+    cost_estimation = Column(Numeric(15,2), nullable=True)
+    remaining_budget = Column(Numeric(15,2), nullable=True)
+    under_over = Column(String(50), nullable=True)
+    charge_to_tenant = Column(SmallInteger, nullable=True)
+    recommended_contractor = Column(String(200), nullable=True)
+    reason = Column(Text, nullable=True)
+    vendor_selection_method = Column(String, nullable=True)
+    test_and_analysis = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    version_id = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    work_items = relationship("ArchivedWorkOrderItems", back_populates="work_order", order_by="ArchivedWorkOrderItems.id")
+    vendors = relationship("ArchivedWorkOrderVendors", back_populates="work_order", order_by="ArchivedWorkOrderVendors.id")
+    supporting_documents = relationship(
+        "ArchivedSupportingDocuments", back_populates="work_order", order_by="ArchivedSupportingDocuments.id"
+    )
+    authorizations = relationship(
+        "ArchivedWorkOrderAuthorizations", back_populates="work_order", order_by="ArchivedWorkOrderAuthorizations.step_order"
+    )
+
+    def __repr__(self):
+        return f"<ArchivedWorkOrders(id={self.id}, document_number='{self.document_number}')>"
+
+
+class DocumentNumberSequence(Base):
+    """document_number_sequences model (server-side document number ranges)"""
+    __tablename__ = "document_number_sequences"
+
+    name = Column(String(100), primary_key=True, nullable=False)
+    next_value = Column(BigInteger, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<DocumentNumberSequence(name='{self.name}', next_value={self.next_value})>"
+
+
+class IdempotencyKey(Base):
+    """idempotency_keys model (stored responses for Idempotency-Key replays)"""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True, nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is in flight
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.key}', status_code={self.status_code})>"
+
+
+class WorkOrderChange(Base):
+    """work_order_changes model (transactional outbox / change feed)"""
+    __tablename__ = "work_order_changes"
+
+    # The id doubles as the feed token consumers resume from
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True, nullable=False)
+    work_order_id = Column(Integer, nullable=False)  # No FK: delete events outlive the order
+    operation = Column(String(20), nullable=False)
+    version_id = Column(Integer, nullable=True)
+    changed_columns = Column(Text, nullable=True)  # JSON list, NULL when the whole order changed
+    changed_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<WorkOrderChange(id={self.id}, work_order_id={self.work_order_id}, operation='{self.operation}')>"
+
+
+class BackgroundJob(Base):
+    """background_jobs model (durable state of queued long-running operations)"""
+    __tablename__ = "background_jobs"
+
+    id = Column(String(36), primary_key=True, nullable=False)
+    job_type = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default='queued', index=True)
+    payload = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=True, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<BackgroundJob(id='{self.id}', job_type='{self.job_type}', status='{self.status}')>"
+
+
+class RevokedToken(Base):
+    """revoked_tokens model (access token revocation list)"""
+    __tablename__ = "revoked_tokens"
+
+    # A token's jti, or "user:<UserID>" to revoke every token issued to a user so far
+    token_id = Column(String(64), primary_key=True, nullable=False)
+    user_id = Column(String(50), nullable=False)
+    # Epoch milliseconds, comparable with token iat/exp on any dialect
+    revoked_at = Column(BigInteger, nullable=False)
+    expires_at = Column(BigInteger, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(token_id='{self.token_id}', user_id='{self.user_id}')>"
+
+
 # If you have User model, define it AFTER WorkOrders if they have relationships
 class User(Base):
-    """user model"""
+    """users model (legacy UserTable layout)"""
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    username = Column(String(50), unique=True, nullable=False)
-    email = Column(String(100), unique=True, nullable=False)
-    # ... other columns ...
+    UserID = Column(String(50), primary_key=True)
+    Name = Column(String(200), nullable=True)
+    # Self-describing hash (see src/services/credential_service.py); legacy
+    # plaintext values are rehashed on the next successful login
+    Password = Column(String(255), nullable=True)
+    UserGroup = Column(String(50), nullable=True)
     
     def __repr__(self):
-        return f"<User(id={self.id}, username='{self.username}')>"
\ No newline at end of file
+        return f"<User(UserID='{self.UserID}', UserGroup='{self.UserGroup}')>"
\ No newline at end of file
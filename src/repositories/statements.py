@@ -0,0 +1,280 @@
+# src/repositories/statements.py
+"""Registry of the hottest work order statements.
+
+The constructs are built once at import with bound parameters (or as
+lambda_stmt for the paged list), so each request skips building the query
+and deriving its cache key and goes straight to SQLAlchemy's compiled cache.
+Every statement carries a `statement_name` execution option. A cursor
+listener uses it to count compiled-cache hits per statement (see
+statement_cache_stats and GET /health/statement-cache).
+"""
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import String, asc, bindparam, cast, delete, desc, event, lambda_stmt, literal, or_, select, union_all
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import ColumnElement
+from src.models.base import (
+    WorkOrders, WorkOrderItems, WorkOrderVendors, SupportingDocuments, WorkOrderAuthorizations, ArchivedWorkOrders,
+    DELETED_DOCUMENT_NUMBER_PREFIX
+)
+from src.schemas.work_orders_schema import WorkOrdersResponse
+
+
+# Columns matched by the free-text search on list endpoints
+SEARCH_COLUMNS = [
+    WorkOrders.document_number,
+    WorkOrders.scope_of_works,
+    WorkOrders.budget_index,
+    WorkOrders.budget_name,
+    WorkOrders.under_over,
+    WorkOrders.recommended_contractor,
+    WorkOrders.reason,
+    WorkOrders.test_and_analysis,
+]
+
+# Plain table columns for the Core read path (no ORM entity, no identity map),
+# in the field order the row serializer expects
+WORK_ORDER_ROW_COLUMNS = tuple(WorkOrders.__table__.c[name] for name in WorkOrdersResponse.model_fields)
+
+# Core statements bypass the ORM soft-delete filter, so they add this themselves
+LIVE_WORK_ORDER = WorkOrders.__table__.c.deleted_at.is_(None)
+
+# SET value releasing a soft-deleted order's document number (ORM attribute or Core UPDATE)
+DELETED_DOCUMENT_NUMBER = literal(DELETED_DOCUMENT_NUMBER_PREFIX, String) + cast(WorkOrders.__table__.c.id, String(20))
+
+# The same columns on the archive tier (include_archived reads)
+ARCHIVE_ROW_COLUMNS = tuple(ArchivedWorkOrders.__table__.c[name] for name in WorkOrdersResponse.model_fields)
+
+
+def _named(stmt, name: str):
+    return stmt.execution_options(statement_name=name)
+
+
+WORK_ORDER_BY_ID = _named(
+    select(WorkOrders).where(WorkOrders.id == bindparam("work_order_id")),
+    "work_order_by_id",
+)
+
+WORK_ORDER_VERSION_BY_ID = _named(
+    select(WorkOrders.version_id).where(WorkOrders.id == bindparam("work_order_id")),
+    "work_order_version_by_id",
+)
+
+WORK_ORDER_EXISTS = _named(
+    select(WorkOrders.id).where(WorkOrders.id == bindparam("work_order_id")),
+    "work_order_exists",
+)
+
+# Detail load: children come from one IN query each instead of a joinedload
+# of all three collections, which multiplies items x vendors x documents rows
+WORK_ORDER_DETAIL_BY_ID = _named(
+    select(WorkOrders)
+    .options(
+        selectinload(WorkOrders.work_items),
+        selectinload(WorkOrders.vendors),
+        selectinload(WorkOrders.supporting_documents),
+        selectinload(WorkOrders.authorizations),
+    )
+    .where(WorkOrders.id == bindparam("work_order_id")),
+    "work_order_detail_by_id",
+)
+
+ARCHIVED_WORK_ORDER_DETAIL_BY_ID = _named(
+    select(ArchivedWorkOrders)
+    .options(
+        selectinload(ArchivedWorkOrders.work_items),
+        selectinload(ArchivedWorkOrders.vendors),
+        selectinload(ArchivedWorkOrders.supporting_documents),
+        selectinload(ArchivedWorkOrders.authorizations),
+    )
+    .where(ArchivedWorkOrders.id == bindparam("work_order_id")),
+    "archived_work_order_detail_by_id",
+)
+
+ARCHIVED_WORK_ORDER_VERSION_BY_ID = _named(
+    select(ArchivedWorkOrders.version_id).where(ArchivedWorkOrders.id == bindparam("work_order_id")),
+    "archived_work_order_version_by_id",
+)
+
+VENDOR_NAMES_BY_WORK_ORDER = _named(
+    select(WorkOrderVendors.vendor_name).where(WorkOrderVendors.work_order_id == bindparam("work_order_id")),
+    "vendor_names_by_work_order",
+)
+
+DOCUMENTS_BY_WORK_ORDER = _named(
+    select(SupportingDocuments)
+    .where(SupportingDocuments.work_order_id == bindparam("work_order_id"))
+    .order_by(SupportingDocuments.id),
+    "documents_by_work_order",
+)
+
+DELETE_WORK_ITEMS_BY_WORK_ORDER = _named(
+    delete(WorkOrderItems).where(WorkOrderItems.work_order_id == bindparam("work_order_id")),
+    "delete_work_items_by_work_order",
+)
+
+DELETE_VENDORS_BY_WORK_ORDER = _named(
+    delete(WorkOrderVendors).where(WorkOrderVendors.work_order_id == bindparam("work_order_id")),
+    "delete_vendors_by_work_order",
+)
+
+DELETE_AUTHORIZATIONS_BY_WORK_ORDER = _named(
+    delete(WorkOrderAuthorizations).where(WorkOrderAuthorizations.work_order_id == bindparam("work_order_id")),
+    "delete_authorizations_by_work_order",
+)
+
+# Approver inbox: a seek on ix_work_order_authorizations_approver_status, which
+# also yields the work_order_id order, joined to the live parent by primary key
+PENDING_AUTHORIZATIONS_BY_APPROVER = _named(
+    select(
+        WorkOrderAuthorizations.id,
+        WorkOrderAuthorizations.work_order_id,
+        WorkOrderAuthorizations.role,
+        WorkOrderAuthorizations.step_order,
+        WorkOrders.document_number,
+        WorkOrders.request_date,
+        WorkOrders.submitted_by,
+        WorkOrders.is_urgent,
+        WorkOrders.cost_estimation,
+    )
+    .join(WorkOrders, WorkOrders.id == WorkOrderAuthorizations.work_order_id)
+    .where(
+        WorkOrderAuthorizations.approver == bindparam("approver"),
+        WorkOrderAuthorizations.status == "pending",
+        LIVE_WORK_ORDER,
+    )
+    .order_by(WorkOrderAuthorizations.work_order_id, WorkOrderAuthorizations.step_order)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit")),
+    "pending_authorizations_by_approver",
+)
+
+
+# Free-text search over SEARCH_COLUMNS with a single :search parameter
+SEARCH_CONDITION = or_(*[column.ilike(bindparam("search")) for column in SEARCH_COLUMNS])
+ARCHIVE_SEARCH_CONDITION = or_(*[
+    ArchivedWorkOrders.__table__.c[column.key].ilike(bindparam("search")) for column in SEARCH_COLUMNS
+])
+
+
+def _paged(stmt, order: ColumnElement, name: str):
+    stmt += lambda s: s.order_by(order).offset(bindparam("skip")).limit(bindparam("limit"))
+    return stmt.execution_options(statement_name=name)
+
+
+def paged_work_orders(
+    order: ColumnElement,
+    skip: int,
+    limit: int,
+    filters: Iterable[Tuple[ColumnElement, Any]] = ()
+) -> Tuple[Any, Dict[str, Any]]:
+    """Paged ORM list as a lambda_stmt plus its parameters.
+
+    The SQL elements captured by the lambdas only contain named bindparams,
+    so the cache key depends on the shape of the query (filtered columns,
+    ordering) and never on the values, which are passed at execution time.
+    Plain values captured inside a lambda would be cached with the first
+    call's values instead.
+    """
+    params: Dict[str, Any] = {"skip": skip, "limit": limit}
+    stmt = lambda_stmt(lambda: select(WorkOrders))
+    for column, value in filters:
+        if value is None:
+            condition = column.is_(None)
+        else:
+            condition = column == bindparam(f"filter_{column.key}")
+            params[f"filter_{column.key}"] = value
+        stmt += lambda s: s.where(condition)
+    return _paged(stmt, order, "paged_work_orders"), params
+
+
+def paged_work_order_rows(
+    order: ColumnElement,
+    skip: int,
+    limit: int,
+    search: Optional[str] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """Paged list or search over plain columns (read-only responses), plus its parameters"""
+    params: Dict[str, Any] = {"skip": skip, "limit": limit}
+    stmt = lambda_stmt(lambda: select(*WORK_ORDER_ROW_COLUMNS).where(LIVE_WORK_ORDER))
+    if search:
+        params["search"] = f"%{search}%"
+        stmt += lambda s: s.where(SEARCH_CONDITION)
+    return _paged(stmt, order, "paged_work_order_rows"), params
+
+
+def paged_work_order_rows_with_archive(
+    order_by: str,
+    order_desc: bool,
+    skip: int,
+    limit: int,
+    search: Optional[str] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """Paged list or search over live and archived rows (UNION ALL), plus its parameters"""
+    params: Dict[str, Any] = {"skip": skip, "limit": limit}
+    live = select(*WORK_ORDER_ROW_COLUMNS).where(LIVE_WORK_ORDER)
+    archived = select(*ARCHIVE_ROW_COLUMNS)
+    if search:
+        params["search"] = f"%{search}%"
+        live = live.where(SEARCH_CONDITION)
+        archived = archived.where(ARCHIVE_SEARCH_CONDITION)
+    combined = union_all(live, archived).subquery("all_work_orders")
+    order_column = combined.c[order_by] if order_by in combined.c else combined.c.id
+    stmt = (
+        select(*combined.c)
+        .order_by(desc(order_column) if order_desc else asc(order_column), combined.c.id)
+        .offset(bindparam("skip"))
+        .limit(bindparam("limit"))
+    )
+    return _named(stmt, "paged_work_order_rows_with_archive"), params
+
+
+class StatementCacheStats:
+    """Compiled-cache outcomes, per named statement and overall"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(name, {"hits": 0, "misses": 0, "uncached": 0})
+            counts[outcome] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            statements = {name: dict(counts) for name, counts in self._counts.items()}
+        for counts in statements.values():
+            cached = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = round(counts["hits"] / cached, 4) if cached else None
+        return statements
+
+
+statement_cache_stats = StatementCacheStats()
+
+
+def _record_cache_outcome(conn, cursor, statement, parameters, context, executemany):
+    """Classify each execution as a compiled-cache hit, miss or uncached"""
+    if context is None or getattr(context, "compiled", None) is None:
+        return
+    name = context.execution_options.get("statement_name", "_other")
+    cache_hit = context.cache_hit
+    if cache_hit is CacheStats.CACHE_HIT:
+        outcome = "hits"
+    elif cache_hit is CacheStats.CACHE_MISS:
+        outcome = "misses"
+    else:
+        outcome = "uncached"
+    statement_cache_stats.record(name, outcome)
+
+
+def attach_statement_cache_listener(engine: Engine) -> None:
+    """Count compiled-cache outcomes on this application's engine (not every Engine in the process)"""
+    if not event.contains(engine, "after_cursor_execute", _record_cache_outcome):
+        event.listen(engine, "after_cursor_execute", _record_cache_outcome)
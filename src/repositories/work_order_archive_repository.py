@@ -0,0 +1,94 @@
+# src/repositories/work_order_archive_repository.py
+from datetime import date
+from typing import Iterable, List, Set
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.orm import Session
+from src.models.base import (
+    WorkOrders, WorkOrderItems, WorkOrderVendors, SupportingDocuments, WorkOrderAuthorizations,
+    ArchivedWorkOrders, ArchivedWorkOrderItems, ArchivedWorkOrderVendors, ArchivedSupportingDocuments,
+    ArchivedWorkOrderAuthorizations,
+)
+
+# (live, archive) pairs, parent first: archive children reference the archived parent
+ARCHIVE_PAIRS = (
+    (WorkOrders, ArchivedWorkOrders),
+    (WorkOrderItems, ArchivedWorkOrderItems),
+    (WorkOrderVendors, ArchivedWorkOrderVendors),
+    (SupportingDocuments, ArchivedSupportingDocuments),
+    (WorkOrderAuthorizations, ArchivedWorkOrderAuthorizations),
+)
+
+# Oracle caps IN lists at 1000 expressions
+IN_LIST_CHUNK_SIZE = 1000
+
+
+class WorkOrderArchiveRepository:
+    """Moves closed work orders and their children into the archive tables"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def candidate_ids(self, cutoff: date, limit: int) -> List[int]:
+        """Ids of orders that ended before the cutoff, oldest ids first.
+
+        Rows are locked for the rest of the transaction so a concurrent edit
+        cannot land between the copy and the delete; rows already locked by
+        an editor are skipped and picked up by a later batch. SQLite has no
+        row locks, but its single writer gives the same guarantee.
+        """
+        stmt = (
+            select(WorkOrders.id)
+            .where(WorkOrders.end_date < cutoff)
+            .order_by(WorkOrders.id)
+            .limit(limit)
+        )
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name == "mssql":
+            # SQL Server ignores FOR UPDATE; the table hint does the same job
+            stmt = stmt.with_hint(WorkOrders, "WITH (UPDLOCK, ROWLOCK, READPAST)", "mssql")
+        elif dialect_name == "oracle":
+            # Oracle rejects FOR UPDATE together with FETCH FIRST, so the limit
+            # moves into a subquery and the outer query takes the locks
+            stmt = (
+                select(WorkOrders.id)
+                .where(WorkOrders.id.in_(stmt))
+                .order_by(WorkOrders.id)
+                .with_for_update(skip_locked=True)
+            )
+        else:
+            stmt = stmt.with_for_update(skip_locked=True)
+        return list(self.db.execute(stmt).scalars().all())
+
+    def move(self, work_order_ids: List[int]) -> int:
+        """Copy orders and children to the archive and delete them from the live tables (caller commits)"""
+        if not work_order_ids:
+            return 0
+        for live, archive in ARCHIVE_PAIRS:
+            key = live.id if live is WorkOrders else live.work_order_id
+            # Soft-delete bookkeeping stays behind (only live orders are archived)
+            columns = [column for column in live.__table__.c if column.name in archive.__table__.c]
+            self.db.execute(
+                insert(archive.__table__).from_select(
+                    [column.name for column in columns],
+                    select(*columns).where(key.in_(work_order_ids))
+                )
+            )
+        for live, _ in reversed(ARCHIVE_PAIRS):
+            key = live.id if live is WorkOrders else live.work_order_id
+            result = self.db.execute(delete(live.__table__).where(key.in_(work_order_ids)))
+        return result.rowcount
+
+    def archived_document_numbers(self, document_numbers: Iterable[str]) -> Set[str]:
+        """The given document numbers that already belong to archived work orders"""
+        numbers = list(dict.fromkeys(number for number in document_numbers if number))
+        found: Set[str] = set()
+        for start in range(0, len(numbers), IN_LIST_CHUNK_SIZE):
+            found.update(self.db.execute(
+                select(ArchivedWorkOrders.document_number)
+                .where(ArchivedWorkOrders.document_number.in_(numbers[start:start + IN_LIST_CHUNK_SIZE]))
+            ).scalars())
+        return found
+
+    def count(self) -> int:
+        """Number of archived work orders"""
+        return self.db.execute(select(func.count(ArchivedWorkOrders.id))).scalar_one()
@@ -0,0 +1,139 @@
+# src/repositories/work_order_changes_repository.py
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional, Iterable
+from sqlalchemy import select, insert, func, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from src.models.base import WorkOrderChange
+
+# Start time of the oldest other open transaction, and the current statement time.
+# Rows a still-open transaction stamps with now()/CURRENT_TIMESTAMP are never
+# older than its start, so anything stamped before the minimum is committed.
+OLDEST_OPEN_TRANSACTION = {
+    "postgresql": text(
+        "SELECT CAST(MIN(xact_start) AS timestamp), CAST(clock_timestamp() AS timestamp) "
+        "FROM pg_stat_activity "
+        "WHERE datname = current_database() AND pid <> pg_backend_pid() AND xact_start IS NOT NULL"
+    ),
+    "mssql": text(
+        "SELECT MIN(t.transaction_begin_time), CURRENT_TIMESTAMP "
+        "FROM sys.dm_tran_active_transactions t "
+        "JOIN sys.dm_tran_session_transactions s ON s.transaction_id = t.transaction_id "
+        "WHERE s.session_id <> @@SPID"
+    ),
+    "mysql": text(
+        "SELECT MIN(trx_started), NOW(6) FROM information_schema.innodb_trx "
+        "WHERE trx_mysql_thread_id <> CONNECTION_ID()"
+    ),
+}
+_watermark_fallback_dialects = set()
+
+
+def commit_watermark(db: Session, margin_seconds: float = 0.0) -> datetime:
+    """Database time before which every stamped row is already committed.
+
+    It is the start of the oldest transaction still open (or now, when there
+    is none), less a margin for clock resolution. A reader that only moves
+    its cursor up to the watermark never passes a row that commits later,
+    however long its transaction ran. Dialects without an activity view, or
+    a role without permission to read it, fall back to now - margin.
+    """
+    dialect = db.get_bind().dialect.name
+    query = OLDEST_OPEN_TRANSACTION.get(dialect)
+    if query is not None and dialect not in _watermark_fallback_dialects:
+        try:
+            with db.begin_nested():
+                if dialect == "postgresql":
+                    # Activity is otherwise cached for the rest of the transaction
+                    db.execute(text("SELECT pg_stat_clear_snapshot()"))
+                oldest, db_now = db.execute(query).one()
+            return min(oldest or db_now, db_now) - timedelta(seconds=margin_seconds)
+        except DBAPIError as e:
+            _watermark_fallback_dialects.add(dialect)
+            print(f"Cannot read open transactions on {dialect} ({e.orig}); "
+                  "change feed and sync fall back to the settle window")
+    db_now = db.execute(select(func.now())).scalar()
+    return db_now - timedelta(seconds=margin_seconds)
+
+
+def statement_clock(db: Session):
+    """Per-statement database time (PostgreSQL's now() is the transaction start)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.clock_timestamp()
+    return func.now()
+
+
+class WorkOrderChangesRepository:
+    """work_order_changes outbox repository.
+
+    Writers add change rows inside their own transaction and never commit here,
+    so a change is visible exactly when the write it describes is.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def record(
+        self,
+        work_order_id: int,
+        operation: str,
+        version_id: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> None:
+        """Add a change row to the current transaction"""
+        self.db.add(WorkOrderChange(
+            work_order_id=work_order_id,
+            operation=operation,
+            version_id=version_id,
+            changed_columns=json.dumps(sorted(columns)) if columns is not None else None,
+            changed_at=statement_clock(self.db),
+        ))
+    
+    def record_many(
+        self,
+        work_order_ids: Iterable[int],
+        operation: str,
+        columns: Optional[Iterable[str]] = None
+    ) -> None:
+        """Add change rows for a set-based write with one multi-row INSERT"""
+        changed_columns = json.dumps(sorted(columns)) if columns is not None else None
+        rows = [
+            {"work_order_id": work_order_id, "operation": operation, "changed_columns": changed_columns}
+            for work_order_id in work_order_ids
+        ]
+        if rows:
+            self.db.execute(
+                insert(WorkOrderChange.__table__).values(changed_at=statement_clock(self.db)), rows
+            )
+    
+    def get_since(self, token: int, limit: int = 100, settle_seconds: float = 0.0) -> List[WorkOrderChange]:
+        """Get changes after a token in commit-safe order.
+
+        The page stops at the first row stamped after the commit watermark, so
+        a consumer's token never moves past a change whose transaction is still
+        open (it would take a lower id but commit later).
+        """
+        watermark = commit_watermark(self.db, settle_seconds)
+        changes = self.db.execute(
+            select(WorkOrderChange)
+            .where(WorkOrderChange.id > token)
+            .order_by(WorkOrderChange.id)
+            .limit(limit)
+        ).scalars().all()
+        settled = []
+        for change in changes:
+            if change.changed_at > watermark:
+                break
+            settled.append(change)
+        return settled
+    
+    def latest_token(self, settle_seconds: float = 0.0) -> int:
+        """Get the newest token (0 when the feed is empty) that no open transaction can still precede"""
+        watermark = commit_watermark(self.db, settle_seconds)
+        first_unsettled = self.db.execute(
+            select(func.min(WorkOrderChange.id)).where(WorkOrderChange.changed_at > watermark)
+        ).scalar()
+        if first_unsettled is not None:
+            return first_unsettled - 1
+        return self.db.execute(select(func.max(WorkOrderChange.id))).scalar() or 0
@@ -1,28 +1,60 @@
 # src/repositories/work_orders_repository.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Sequence, Tuple
+from datetime import date, datetime
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, and_, or_
-from src.models.base import WorkOrders
+from sqlalchemy import desc, asc, and_, or_, select, insert, update, delete, func, cast, literal, text, union_all, String
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models.base import WorkOrders, SupportingDocuments
+from src.repositories.work_order_changes_repository import WorkOrderChangesRepository, commit_watermark
+from src.repositories import statements
+
+# Low-cardinality columns that can be faceted for filter dropdowns
+FACET_COLUMNS = [
+    'request_type',
+    'submitted_by',
+    'is_urgent',
+    'budget_status',
+    'cost_type',
+    'budget_index',
+    'under_over',
+    'charge_to_tenant',
+    'vendor_selection_method',
+]
+NUMERIC_FACET_COLUMNS = {'is_urgent', 'charge_to_tenant'}
+
+# Columns written by upserts (id, timestamps, version and soft delete are server-managed)
+UPSERT_COLUMNS = [
+    column.key for column in WorkOrders.__table__.c
+    if column.key not in ('id', 'created_at', 'updated_at', 'version_id', 'deleted_at')
+]
+# Bind parameters per upsert statement; SQL Server caps a request at 2100
+MAX_UPSERT_PARAMETERS = {"mssql": 2000, "sqlite": 999, "postgresql": 30000, "mysql": 30000}
 
 class WorkOrdersRepository:
     """work_orders repository with CRUD operations"""
     
     def __init__(self, db: Session):
         self.db = db
+        self.changes = WorkOrderChangesRepository(db)
     
     def create(self, work_orders_data: Dict[str, Any]) -> WorkOrders:
         """Create a new work_orders record"""
         work_orders = WorkOrders(**work_orders_data)
         self.db.add(work_orders)
+        self.db.flush()
+        self.changes.record(work_orders.id, "create", work_orders.version_id)
         self.db.commit()
         self.db.refresh(work_orders)
         return work_orders
 
     def get_by_id(self, work_orders_id: int) -> Optional[WorkOrders]:
         """Get work_orders by id (primary key)"""
-        return self.db.query(WorkOrders).filter(
-            WorkOrders.id == work_orders_id,
-        ).first()
+        return self.db.execute(
+            statements.WORK_ORDER_BY_ID, {"work_order_id": work_orders_id}
+        ).scalar_one_or_none()
 
     def get_by_document_number_like(self, document_number: str) -> List[WorkOrders]:
         """Get work_orderss by document_number (partial match)"""
@@ -81,32 +113,76 @@ class WorkOrdersRepository:
         order_desc: bool = False
     ) -> List[WorkOrders]:
         """Get all work_orderss with optional filtering and ordering"""
-        query = self.db.query(WorkOrders)
+        columns = WorkOrders.__table__.c
+        filter_pairs = [
+            (getattr(WorkOrders, key), value)
+            for key, value in (filters or {}).items()
+            if key in columns
+        ]
         
-        if filters:
-            for key, value in filters.items():
-                if hasattr(WorkOrders, key):
-                    # Handle None values for nullable fields
-                    if value is None:
-                        query = query.filter(getattr(WorkOrders, key).is_(None))
-                    else:
-                        query = query.filter(getattr(WorkOrders, key) == value)
+        # Apply ordering, falling back to the primary key
+        order_column = getattr(WorkOrders, order_by) if order_by in columns else WorkOrders.id
+        order = desc(order_column) if order_desc else asc(order_column)
         
-        # Apply ordering
-        if hasattr(WorkOrders, order_by):
-            order_column = getattr(WorkOrders, order_by)
-            if order_desc:
-                query = query.order_by(desc(order_column))
-            else:
-                query = query.order_by(asc(order_column))
-        else:
-            # Fallback to default ordering by primary key
-            if order_desc:
-                query = query.order_by(desc(WorkOrders.id))
-            else:
-                query = query.order_by(asc(WorkOrders.id))
+        return self.db.execute(
+            *statements.paged_work_orders(order, skip, limit, filter_pairs)
+        ).scalars().all()
+
+    def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: str = "id",
+        order_desc: bool = False,
+        search: Optional[str] = None,
+        include_archived: bool = False
+    ) -> Sequence[Row]:
+        """Read-only page as plain rows (Core select, no ORM identities)"""
+        if include_archived:
+            return self.db.connection().execute(
+                *statements.paged_work_order_rows_with_archive(order_by, order_desc, skip, limit, search)
+            ).all()
+        columns = WorkOrders.__table__.c
+        order_column = columns[order_by] if order_by in columns else columns.id
+        order = desc(order_column) if order_desc else asc(order_column)
+        return self.db.connection().execute(
+            *statements.paged_work_order_rows(order, skip, limit, search)
+        ).all()
+
+    def search_rows(
+        self,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        include_archived: bool = False
+    ) -> Sequence[Row]:
+        """Read-only search page as plain rows"""
+        return self.list_rows(skip=skip, limit=limit, search=search_term, include_archived=include_archived)
+
+    def get_modified_since(
+        self,
+        modified_since: datetime,
+        after_id: int = 0,
+        limit: int = 1000,
+        settle_seconds: float = 0.0
+    ) -> List[WorkOrders]:
+        """Get work_orderss changed after an (updated_at, id) high-water mark, in keyset order.
+
+        Only rows stamped up to the commit watermark are returned: every
+        transaction still open stamps updated_at at or after its own start, so
+        the next high-water mark never passes a row that commits later.
+        settle_seconds is the margin below the watermark.
+        """
+        watermark = commit_watermark(self.db, settle_seconds)
+        query = self.db.query(WorkOrders).filter(
+            or_(
+                WorkOrders.updated_at > modified_since,
+                and_(WorkOrders.updated_at == modified_since, WorkOrders.id > after_id),
+            ),
+            WorkOrders.updated_at <= watermark,
+        )
         
-        return query.offset(skip).limit(limit).all()
+        return query.order_by(asc(WorkOrders.updated_at), asc(WorkOrders.id)).limit(limit).all()
 
     def update(self, work_orders_id: int, work_orders_data: Dict[str, Any]) -> Optional[WorkOrders]:
         """Update work_orders"""
@@ -136,25 +212,31 @@ class WorkOrdersRepository:
             'reason',
             'vendor_selection_method',
             'test_and_analysis',
-            'created_at',
-            'updated_at',
         ]
         
         for key, value in work_orders_data.items():
             if hasattr(work_orders, key) and key in allowed_fields:
                 setattr(work_orders, key, value)
         
+        self.db.flush()
+        self.changes.record(
+            work_orders_id, "update", work_orders.version_id,
+            [key for key in work_orders_data if key in allowed_fields]
+        )
         self.db.commit()
         self.db.refresh(work_orders)
         return work_orders
 
     def delete(self, work_orders_id: int) -> bool:
-        """Delete work_orders (hard delete since no soft delete field)"""
+        """Soft-delete work_orders (a single versioned UPDATE; children stay until the purge)"""
         work_orders = self.get_by_id(work_orders_id)
         if not work_orders:
             return False
         
-        self.db.delete(work_orders)
+        work_orders.deleted_at = func.now()
+        work_orders.document_number = statements.DELETED_DOCUMENT_NUMBER
+        self.db.flush()
+        self.changes.record(work_orders_id, "delete", work_orders.version_id)
         self.db.commit()
         return True
 
@@ -205,77 +287,366 @@ class WorkOrdersRepository:
 
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count work_orderss with optional filters"""
-        query = self.db.query(WorkOrders)
+        # Direct SELECT count(id) instead of Query.count(), which wraps the
+        # full entity SELECT in a subquery
+        stmt = select(func.count(WorkOrders.id)).select_from(WorkOrders)
         
         if filters:
             for key, value in filters.items():
                 if hasattr(WorkOrders, key):
                     if value is None:
-                        query = query.filter(getattr(WorkOrders, key).is_(None))
+                        stmt = stmt.where(getattr(WorkOrders, key).is_(None))
                     else:
-                        query = query.filter(getattr(WorkOrders, key) == value)
+                        stmt = stmt.where(getattr(WorkOrders, key) == value)
         
-        return query.count()
+        return self.db.execute(stmt).scalar_one()
 
     def exists(self, work_orders_id: int) -> bool:
         """Check if work_orders exists"""
-        return self.db.query(WorkOrders).filter(
-            WorkOrders.id == work_orders_id
+        return self.db.execute(
+            statements.WORK_ORDER_EXISTS, {"work_order_id": work_orders_id}
         ).first() is not None
 
-    def get_document_number_values(self) -> List[str]:
-        """Get list of all unique document_number values"""
-        results = self.db.query(WorkOrders.document_number).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_scope_of_works_values(self) -> List[str]:
-        """Get list of all unique scope_of_works values"""
-        results = self.db.query(WorkOrders.scope_of_works).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_budget_index_values(self) -> List[str]:
-        """Get list of all unique budget_index values"""
-        results = self.db.query(WorkOrders.budget_index).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_budget_name_values(self) -> List[str]:
-        """Get list of all unique budget_name values"""
-        results = self.db.query(WorkOrders.budget_name).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_under_over_values(self) -> List[str]:
-        """Get list of all unique under_over values"""
-        results = self.db.query(WorkOrders.under_over).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_recommended_contractor_values(self) -> List[str]:
-        """Get list of all unique recommended_contractor values"""
-        results = self.db.query(WorkOrders.recommended_contractor).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_reason_values(self) -> List[str]:
-        """Get list of all unique reason values"""
-        results = self.db.query(WorkOrders.reason).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
-
-    def get_test_and_analysis_values(self) -> List[str]:
-        """Get list of all unique test_and_analysis values"""
-        results = self.db.query(WorkOrders.test_and_analysis).distinct().all()
-        return [row[0] for row in results if row[0] is not None]
+    def get_facet_counts(
+        self,
+        columns: List[str],
+        prefix: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get value -> count pairs for low-cardinality columns in one grouped query"""
+        selects = []
+        for name in columns:
+            column = getattr(WorkOrders, name)
+            is_text = name not in NUMERIC_FACET_COLUMNS
+            value = column if is_text else cast(column, String(20))
+            stmt = select(
+                literal(name).label("facet"),
+                value.label("value"),
+                func.count(WorkOrders.id).label("count"),
+            # Soft-deleted rows are excluded here: the ORM filter does not reach into the union
+            ).where(column.isnot(None), WorkOrders.deleted_at.is_(None)).group_by(column)
+            if prefix and is_text:
+                escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                stmt = stmt.where(column.like(f"{escaped}%", escape="\\"))
+            selects.append(stmt)
+        
+        facets: Dict[str, List[Dict[str, Any]]] = {name: [] for name in columns}
+        if not selects:
+            return facets
+        
+        combined = selects[0] if len(selects) == 1 else union_all(*selects)
+        grouped = combined.subquery()
+        # Top `limit` values per facet are picked in SQL, so only those rows come back
+        ranked = select(
+            grouped.c.facet,
+            grouped.c.value,
+            grouped.c.count,
+            func.row_number().over(
+                partition_by=grouped.c.facet,
+                order_by=(desc(grouped.c.count), grouped.c.value)
+            ).label("rank"),
+        ).subquery()
+        rows = self.db.execute(
+            select(ranked.c.facet, ranked.c.value, ranked.c.count)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.facet, ranked.c.rank)
+        ).all()
+        
+        for facet, value, count in rows:
+            facets[facet].append({"value": value, "count": count})
+        return facets
+
+    def get_dashboard_summary(
+        self,
+        group_by: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        is_urgent: Optional[bool] = None,
+        over_budget: Optional[bool] = None,
+        equals: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Count and total cost estimation of matching orders, optionally grouped (SQL fallback of the snapshot)"""
+        conditions = []
+        if start_date:
+            conditions.append(WorkOrders.request_date >= start_date)
+        if end_date:
+            conditions.append(WorkOrders.request_date <= end_date)
+        if is_urgent is not None:
+            conditions.append(WorkOrders.is_urgent == (1 if is_urgent else 0))
+        if over_budget is not None:
+            over = WorkOrders.cost_estimation > WorkOrders.remaining_budget
+            conditions.append(over if over_budget else or_(
+                ~over, WorkOrders.cost_estimation.is_(None), WorkOrders.remaining_budget.is_(None)
+            ))
+        for name, value in (equals or {}).items():
+            conditions.append(getattr(WorkOrders, name) == value)
+        
+        measures = (
+            func.count(WorkOrders.id).label("count"),
+            func.coalesce(func.sum(WorkOrders.cost_estimation), 0).label("total_cost"),
+        )
+        if not group_by:
+            count, total = self.db.execute(select(*measures).where(*conditions)).one()
+            return {"group_by": None, "count": count, "total_cost": round(float(total), 2), "groups": None}
+        
+        key = getattr(WorkOrders, group_by)
+        rows = self.db.execute(
+            select(key.label("key"), *measures).where(*conditions).group_by(key)
+        ).all()
+        groups = sorted(
+            ({"key": row.key, "count": row.count, "total_cost": round(float(row.total_cost), 2)} for row in rows),
+            key=lambda item: (-item["count"], item["key"] or "")
+        )
+        return {
+            "group_by": group_by,
+            "count": sum(group["count"] for group in groups),
+            "total_cost": round(sum(group["total_cost"] for group in groups), 2),
+            "groups": groups,
+        }
+
+    def upsert(self, work_orders_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or update one work order by document_number"""
+        return self.bulk_upsert([work_orders_data])[0]
+
+    def bulk_upsert(self, work_orders_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert or update work orders by document_number with one native statement per batch.
+
+        Existing rows get every upsert column replaced, version_id bumped and
+        updated_at stamped. Soft-deleted orders no longer hold their number, so
+        a deleted number gets a new order, the same as a create.
+        Returns id, version and whether the row was created for each distinct
+        document_number (the last occurrence wins).
+        """
+        latest = {}
+        for data in work_orders_data_list:
+            latest[data['document_number']] = {column: data.get(column) for column in UPSERT_COLUMNS}
+        rows = list(latest.values())
+        if not rows:
+            return []
+        
+        dialect = self.db.get_bind().dialect.name
+        upsert_batch = {
+            "postgresql": self._upsert_on_conflict,
+            "sqlite": self._upsert_on_conflict,
+            "mysql": self._upsert_on_duplicate_key,
+            "mssql": self._upsert_merge,
+        }.get(dialect, self._upsert_row_by_row)
+        batch_size = max(1, MAX_UPSERT_PARAMETERS.get(dialect, 1000) // len(UPSERT_COLUMNS))
+        
+        results = []
+        for start in range(0, len(rows), batch_size):
+            results.extend(upsert_batch(rows[start:start + batch_size]))
+        
+        self.changes.record_many([row.id for row in results], "upsert")
+        self.db.commit()
+        return [
+            {
+                "id": row.id,
+                "document_number": row.document_number,
+                "version": row.version_id,
+                "created": row.version_id == 1,
+            }
+            for row in results
+        ]
+
+    def _upsert_result_columns(self):
+        table = WorkOrders.__table__
+        return table.c.id, table.c.version_id, table.c.document_number
+
+    def _upsert_on_conflict(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        """PostgreSQL / SQLite: INSERT ... ON CONFLICT (document_number) DO UPDATE ... RETURNING"""
+        table = WorkOrders.__table__
+        insert_ = postgresql_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert_(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.document_number],
+            set_={
+                **{column: stmt.excluded[column] for column in UPSERT_COLUMNS if column != 'document_number'},
+                'version_id': table.c.version_id + 1,
+                'updated_at': func.now(),
+            },
+        ).returning(*self._upsert_result_columns())
+        return self.db.execute(stmt).all()
+
+    def _upsert_on_duplicate_key(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        """MySQL: INSERT ... ON DUPLICATE KEY UPDATE, then read back ids (no RETURNING)"""
+        table = WorkOrders.__table__
+        stmt = mysql_insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update({
+            **{column: stmt.inserted[column] for column in UPSERT_COLUMNS if column != 'document_number'},
+            'version_id': table.c.version_id + 1,
+            'updated_at': func.now(),
+        })
+        self.db.execute(stmt)
+        return self.db.execute(
+            select(*self._upsert_result_columns())
+            .where(table.c.document_number.in_([row['document_number'] for row in rows]))
+        ).all()
+
+    def _upsert_merge(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        """SQL Server: MERGE ... WITH (HOLDLOCK) over a VALUES source, with OUTPUT"""
+        quote = self.db.get_bind().dialect.identifier_preparer.quote
+        columns = [quote(column) for column in UPSERT_COLUMNS]
+        values = ", ".join(
+            "(" + ", ".join(f":p{index}_{position}" for position in range(len(UPSERT_COLUMNS))) + ")"
+            for index in range(len(rows))
+        )
+        params = {
+            f"p{index}_{position}": row[column]
+            for index, row in enumerate(rows)
+            for position, column in enumerate(UPSERT_COLUMNS)
+        }
+        key = quote('document_number')
+        updates = ", ".join(
+            f"target.{column} = source.{column}" for column in columns if column != key
+        )
+        sql = (
+            f"MERGE INTO {quote(WorkOrders.__tablename__)} WITH (HOLDLOCK) AS target "
+            f"USING (VALUES {values}) AS source ({', '.join(columns)}) "
+            f"ON target.{key} = source.{key} "
+            f"WHEN MATCHED THEN UPDATE SET {updates}, "
+            f"target.version_id = target.version_id + 1, target.updated_at = CURRENT_TIMESTAMP "
+            f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}, version_id) "
+            f"VALUES ({', '.join('source.' + column for column in columns)}, 1) "
+            f"OUTPUT inserted.id, inserted.version_id, inserted.document_number;"
+        )
+        return self.db.execute(text(sql), params).all()
+
+    def _upsert_row_by_row(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Other engines: UPDATE by document_number, INSERT when nothing matched"""
+        table = WorkOrders.__table__
+        for row in rows:
+            result = self.db.execute(
+                update(table)
+                .where(table.c.document_number == row['document_number'])
+                .values(
+                    **{column: row[column] for column in UPSERT_COLUMNS if column != 'document_number'},
+                    version_id=table.c.version_id + 1,
+                    updated_at=func.now(),
+                )
+            )
+            if result.rowcount == 0:
+                self.db.execute(insert(table).values(**row, version_id=1))
+        return self.db.execute(
+            select(*self._upsert_result_columns())
+            .where(table.c.document_number.in_([row['document_number'] for row in rows]))
+        ).all()
 
     def bulk_create(self, work_orders_data_list: List[Dict[str, Any]]) -> List[WorkOrders]:
         """Create multiple work_orders records"""
         work_orderss = [WorkOrders(**data) for data in work_orders_data_list]
         self.db.add_all(work_orderss)
+        self.db.flush()
+        self.changes.record_many([work_orders.id for work_orders in work_orderss], "create")
         self.db.commit()
         for work_orders in work_orderss:
             self.db.refresh(work_orders)
         return work_orderss
 
-    def bulk_delete(self, work_orders_ids: List[int]) -> int:
-        """Delete multiple work_orderss by IDs"""
-        deleted_count = self.db.query(WorkOrders)\
-            .filter(WorkOrders.id.in_(work_orders_ids))\
-            .delete(synchronize_session=False)
+    def bulk_filter_conditions(self, criteria: Dict[str, Any]) -> List[Any]:
+        """WHERE conditions for a bulk filter (ids are handled by matching_id_chunks)"""
+        conditions = []
+        for key, value in criteria.items():
+            if key == 'ids' or value is None:
+                continue
+            if key == 'request_date_from':
+                conditions.append(WorkOrders.request_date >= value)
+            elif key == 'request_date_to':
+                conditions.append(WorkOrders.request_date <= value)
+            elif key == 'is_urgent':
+                conditions.append(WorkOrders.is_urgent == (1 if value else 0))
+            else:
+                conditions.append(getattr(WorkOrders, key) == value)
+        return conditions
+
+    def matching_id_chunks(self, criteria: Dict[str, Any], chunk_size: int = 1000) -> Iterator[List[int]]:
+        """Yield ids of live orders matching the criteria in ascending chunks.
+
+        Filters walk the table by id (keyset), so rows changed by an earlier
+        chunk are never revisited; explicit id lists are split before binding
+        so no statement exceeds the driver's parameter limit.
+        """
+        conditions = self.bulk_filter_conditions(criteria)
+        ids = criteria.get('ids')
+        if ids is not None:
+            ids = sorted(set(ids))
+            for start in range(0, len(ids), chunk_size):
+                chunk = self.db.execute(
+                    select(WorkOrders.id)
+                    .where(WorkOrders.id.in_(ids[start:start + chunk_size]), *conditions)
+                    .order_by(WorkOrders.id)
+                ).scalars().all()
+                if chunk:
+                    yield list(chunk)
+            return
+        after_id = 0
+        while True:
+            chunk = self.db.execute(
+                select(WorkOrders.id)
+                .where(WorkOrders.id > after_id, *conditions)
+                .order_by(WorkOrders.id)
+                .limit(chunk_size)
+            ).scalars().all()
+            if not chunk:
+                return
+            yield list(chunk)
+            after_id = chunk[-1]
+
+    def update_ids(self, work_orders_ids: List[int], values: Dict[str, Any]) -> int:
+        """Set fields on live orders with one UPDATE, bumping their versions (caller commits)"""
+        updated = self.db.execute(
+            update(WorkOrders.__table__)
+            .where(WorkOrders.id.in_(work_orders_ids), WorkOrders.deleted_at.is_(None))
+            .values(**values, version_id=WorkOrders.version_id + 1, updated_at=func.now())
+        ).rowcount
+        # Outbox rows last, as close to the commit as possible
+        self.changes.record_many(work_orders_ids, "update", values.keys())
+        return updated
+
+    def soft_delete_ids(self, work_orders_ids: List[int]) -> int:
+        """Soft-delete live orders with one UPDATE (caller commits)"""
+        deleted = self.db.execute(
+            update(WorkOrders.__table__)
+            .where(WorkOrders.id.in_(work_orders_ids), WorkOrders.deleted_at.is_(None))
+            .values(
+                deleted_at=func.now(),
+                document_number=statements.DELETED_DOCUMENT_NUMBER,
+                version_id=WorkOrders.version_id + 1
+            )
+        ).rowcount
+        self.changes.record_many(work_orders_ids, "delete")
+        return deleted
+
+    def bulk_delete(self, work_orders_ids: List[int], chunk_size: int = 1000) -> int:
+        """Soft-delete multiple work_orderss by IDs, one set-based UPDATE per chunk"""
+        deleted_count = 0
+        for chunk in self.matching_id_chunks({'ids': work_orders_ids}, chunk_size):
+            deleted_count += self.soft_delete_ids(chunk)
+            self.db.commit()
+        return deleted_count
+
+    def purge_deleted(self, deleted_before: datetime, batch_size: int = 500) -> Tuple[int, List[str]]:
+        """Physically delete up to batch_size soft-deleted orders (children go by ON DELETE CASCADE).
+
+        Returns the purged count and the attachment hashes the purged documents pointed at.
+        """
+        work_orders_ids = self.db.execute(
+            select(WorkOrders.id)
+            .where(WorkOrders.deleted_at < deleted_before)
+            .order_by(WorkOrders.id)
+            .limit(batch_size)
+            .execution_options(include_deleted=True)
+        ).scalars().all()
+        if not work_orders_ids:
+            return 0, []
+        content_hashes = self.db.execute(
+            select(SupportingDocuments.content_hash).where(
+                SupportingDocuments.work_order_id.in_(work_orders_ids),
+                SupportingDocuments.content_hash.is_not(None)
+            )
+        ).scalars().all()
+        purged_count = self.db.execute(
+            delete(WorkOrders.__table__).where(WorkOrders.id.in_(work_orders_ids))
+        ).rowcount
         self.db.commit()
-        return deleted_count
\ No newline at end of file
+        return purged_count, list(content_hashes)
\ No newline at end of file
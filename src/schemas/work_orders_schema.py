@@ -1,6 +1,7 @@
 # src/schemas/work_orders_schema.py
-from pydantic import BaseModel, Field, ConfigDict, validator
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field, ConfigDict, validator, model_validator
+from typing import Optional, Dict, Any, List, Iterable, Sequence, Type, get_args
+from operator import methodcaller
 from datetime import datetime, date
 import json
 
@@ -30,6 +31,7 @@ class WorkOrdersResponse(BaseModel):
     test_and_analysis: Optional[str] = None
     created_at: Optional[datetime] = None  # Changed from str to datetime
     updated_at: Optional[datetime] = None  # Changed from str to datetime
+    version_id: Optional[int] = None
     
     model_config = ConfigDict(
         from_attributes=True,
@@ -41,9 +43,52 @@ class WorkOrdersResponse(BaseModel):
     )
 
 
+class RowSerializer:
+    """JSON serializer for plain result rows, built once from a response schema.
+
+    Rows are tuples in the schema's field order (see statements.WORK_ORDER_ROW_COLUMNS).
+    Produces the same JSON as returning the schema as response_model, without
+    validating each row through Pydantic.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.names = tuple(schema.model_fields)
+        self.converters = []
+        for position, field in enumerate(schema.model_fields.values()):
+            types = get_args(field.annotation) or (field.annotation,)
+            if date in types or datetime in types:
+                self.converters.append((position, methodcaller("isoformat")))
+            elif float in types:
+                self.converters.append((position, float))
+
+    def to_dicts(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        names, converters = self.names, self.converters
+        results = []
+        for row in rows:
+            values = list(row)
+            for position, converter in converters:
+                if values[position] is not None:
+                    values[position] = converter(values[position])
+            results.append(dict(zip(names, values)))
+        return results
+
+    def to_json(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        """Serialize rows the way FastAPI's JSONResponse would"""
+        return json.dumps(
+            self.to_dicts(rows),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+# Pre-built serializer for list and search pages
+work_orders_row_serializer = RowSerializer(WorkOrdersResponse)
+
+
 # Schema for creating records
 class WorkOrdersCreate(BaseModel):
-    document_number: str = Field(max_length=100)
+    document_number: Optional[str] = Field(None, max_length=100)  # Allocated server-side when omitted
     request_date: str
     request_type: str
     submitted_by: str
@@ -94,6 +139,65 @@ class WorkOrdersUpdate(BaseModel):
     updated_at: Optional[str] = None
 
 
+# Criteria selecting work orders for bulk operations (every given criterion must match)
+class WorkOrdersBulkFilter(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    request_type: Optional[str] = None
+    submitted_by: Optional[str] = None
+    budget_status: Optional[str] = None
+    cost_type: Optional[str] = None
+    budget_index: Optional[str] = None
+    is_urgent: Optional[bool] = None
+    request_date_from: Optional[date] = None
+    request_date_to: Optional[date] = None
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        # An empty filter would match every work order
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("At least one filter criterion is required")
+        return self
+
+
+# Schema for bulk deletes (by ids, or by filter)
+class WorkOrdersBulkDeleteRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1)
+    filter: Optional[WorkOrdersBulkFilter] = None
+
+    @model_validator(mode="after")
+    def require_target(self):
+        if self.ids is None and self.filter is None:
+            raise ValueError("Either ids or filter is required")
+        return self
+
+
+# Fields that can be set on many work orders at once (explicit nulls clear the field)
+class WorkOrdersBulkSet(BaseModel):
+    budget_index: Optional[str] = Field(None, max_length=50)
+    budget_name: Optional[str] = Field(None, max_length=200)
+    budget_status: Optional[str] = None
+    cost_type: Optional[str] = None
+    is_urgent: Optional[int] = Field(None, ge=0, le=1)
+    charge_to_tenant: Optional[int] = Field(None, ge=0, le=1)
+    submitted_by: Optional[str] = None
+    recommended_contractor: Optional[str] = Field(None, max_length=200)
+    vendor_selection_method: Optional[str] = None
+
+    @model_validator(mode="after")
+    def require_fields(self):
+        if not self.model_fields_set:
+            raise ValueError("At least one field to set is required")
+        if "submitted_by" in self.model_fields_set and self.submitted_by is None:
+            raise ValueError("submitted_by cannot be cleared")
+        return self
+
+
+# Schema for bulk updates: set the given fields on every matching work order
+class WorkOrdersBulkUpdateRequest(BaseModel):
+    filter: WorkOrdersBulkFilter
+    set: WorkOrdersBulkSet
+
+
 # Vendor schema based on your payload
 class VendorSchema(BaseModel):
     id: int
@@ -137,6 +241,16 @@ class WorkOrdersCreateRequest(BaseModel):
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid workItems JSON: {str(e)}")
 
+    @validator('authorizations')
+    def validate_authorizations(cls, v):
+        try:
+            parsed = json.loads(v)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid authorizations JSON: {str(e)}")
+        if not isinstance(parsed, (list, dict)):
+            raise ValueError("authorizations must be a JSON array or object")
+        return v
+
     @validator('tenderVendorData')
     def validate_tender_vendor_data(cls, v):
         try:
@@ -193,8 +307,6 @@ class WorkOrdersCreateRequest(BaseModel):
             'reason': form_data.get('vendorReason', '').strip(),
             'vendor_selection_method': vendor_selection_method,
             'test_and_analysis': tender_data.get('tenderDescription', '').strip(),
-            'created_at': datetime.now(),
-            'updated_at': datetime.now(),
         }
 
     def extract_work_items_data(self) -> List[Dict[str, Any]]:
@@ -250,6 +362,61 @@ class WorkOrdersCreateRequest(BaseModel):
         
         return vendors_data
 
+    def extract_authorizations_data(self) -> List[Dict[str, Any]]:
+        """Extract approval steps for work_order_authorizations table.
+
+        Accepts a list of steps or an object keyed by role
+        ({"manager": {"approver": ...}, ...}); steps without an approver are skipped.
+        """
+        authorizations = json.loads(self.authorizations)
+        if isinstance(authorizations, dict):
+            steps = [
+                {'role': role, **step} if isinstance(step, dict) else {'role': role, 'approver': step}
+                for role, step in authorizations.items()
+            ]
+        else:
+            steps = authorizations
+        
+        authorizations_data = []
+        for step in steps:
+            if not isinstance(step, dict):
+                continue
+            approver = str(
+                step.get('approver') or step.get('approverId') or step.get('userId') or step.get('name') or ''
+            ).strip()
+            if not approver:
+                continue
+            status = self._map_authorization_status(step.get('status', ''))
+            decided_at = self._parse_date(step.get('decidedAt') or step.get('date')) if status != 'pending' else None
+            authorizations_data.append({
+                'approver': approver[:100],
+                'role': (str(step.get('role') or step.get('title') or '').strip() or None),
+                'status': status,
+                'step_order': len(authorizations_data) + 1,
+                'decided_at': datetime.combine(decided_at, datetime.min.time()) if decided_at else None,
+                'comments': (str(step.get('comments') or step.get('remarks') or '').strip() or None),
+            })
+        
+        return authorizations_data
+
+    def _map_authorization_status(self, status: Any) -> str:
+        """Map approval status to pending / approved / rejected"""
+        if status is True:
+            return 'approved'
+        status = str(status or '').strip().lower()
+        
+        mapping = {
+            'approved': 'approved',
+            'approve': 'approved',
+            'signed': 'approved',
+            'rejected': 'rejected',
+            'reject': 'rejected',
+            'declined': 'rejected',
+        }
+        
+        # Anything undecided (empty, "pending", "waiting", false) is pending
+        return mapping.get(status, 'pending')
+
     def _parse_date(self, date_str: Optional[str]) -> Optional[date]:
         """Parse date string to date object - handle multiple formats"""
         if not date_str:
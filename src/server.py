@@ -0,0 +1,66 @@
+# src/server.py
+"""Production entry point: python -m src.server
+
+Runs the app in several uvicorn worker processes so request validation and
+JSON serialization use more than one core. Each worker is a separate process
+with its own connection pool, sized by DatabaseConfig.get_pool_settings() so
+that all workers together stay within DB_CONNECTION_BUDGET.
+"""
+import os
+import uvicorn
+
+
+# Upper bound for the default worker count on large hosts (each worker holds its own pool and caches)
+DEFAULT_MAX_WORKERS = 8
+
+
+def get_worker_count() -> int:
+    """WEB_CONCURRENCY, defaulting to one worker per usable CPU core (at most DEFAULT_MAX_WORKERS)"""
+    workers = os.getenv("WEB_CONCURRENCY")
+    if workers:
+        return max(1, int(workers))
+    # Cores this process may run on (respects cpusets/affinity in containers)
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    return max(1, min(cores or 1, DEFAULT_MAX_WORKERS))
+
+
+def warn_per_process_state(workers: int) -> None:
+    """Point out the in-memory state that is not shared between worker processes"""
+    if workers <= 1:
+        return
+    print(
+        f"Running {workers} worker processes: the login throttle (LOGIN_MAX_FAILURES_PER_USER and "
+        f"LOGIN_MAX_ATTEMPTS_PER_IP are enforced per worker, so up to {workers}x per deployment), "
+        "the count, facet, compression and auth caches, and the autocomplete and user directory "
+        "indexes are per-process; a write on one worker only invalidates that worker's caches"
+    )
+
+
+def main() -> None:
+    workers = get_worker_count()
+    # Workers are spawned processes and read this back when sizing their pools
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    warn_per_process_state(workers)
+
+    uvicorn.run(
+        "src.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8000)),
+        workers=workers,
+        reload=False,
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        # Keep-alive a bit above typical load balancer idle timeouts
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_SECONDS", 75)),
+        # On SIGTERM: stop accepting, let in-flight requests finish, then run the
+        # lifespan shutdown (stops job workers and disposes the engine)
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", 30)),
+        # Recycle workers periodically to bound memory growth (0 = never)
+        limit_max_requests=int(os.getenv("MAX_REQUESTS_PER_WORKER", 0)) or None,
+        access_log=os.getenv("ACCESS_LOG", "false").lower() == "true",
+        log_level=os.getenv("LOG_LEVEL", "info"),
+    )
+
+
+if __name__ == "__main__":
+    main()
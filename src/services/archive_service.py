@@ -0,0 +1,70 @@
+# src/services/archive_service.py
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy.orm import Session
+from src.repositories.work_order_archive_repository import WorkOrderArchiveRepository
+from src.repositories.work_order_changes_repository import WorkOrderChangesRepository
+from src.services.autocomplete_index import autocomplete_index
+from src.services.change_feed_service import change_notifier
+from src.services.count_service import count_cache
+from src.services.facet_service import invalidate_facets
+from src.services.unit_of_work import unit_of_work
+
+# Orders whose end_date is older than this are moved to the archive tier
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ARCHIVE_HORIZON_DAYS", 730))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 500))
+ARCHIVE_MAX_BATCHES = int(os.getenv("ARCHIVE_MAX_BATCHES", 200))
+
+
+class ArchiveService:
+    """Moves closed work orders to the archive tables in short, separately committed batches"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = WorkOrderArchiveRepository(db)
+        self.changes = WorkOrderChangesRepository(db)
+
+    def archive_batch(self, cutoff: date, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """Archive up to batch_size orders that ended before the cutoff in one transaction"""
+
+        def work():
+            work_order_ids = self.repository.candidate_ids(cutoff, batch_size)
+            if work_order_ids:
+                self.repository.move(work_order_ids)
+                # Consumers see the order leave the live tables
+                self.changes.record_many(work_order_ids, "archive")
+            return len(work_order_ids)
+
+        archived = unit_of_work.run(self.db, work)
+        if archived:
+            count_cache.clear()
+            invalidate_facets()
+            change_notifier.notify()
+            autocomplete_index.invalidate()
+        return archived
+
+    def run(
+        self,
+        horizon_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Archive everything past the horizon, batch by batch, up to max_batches"""
+        horizon_days = ARCHIVE_HORIZON_DAYS if horizon_days is None else horizon_days
+        batch_size = batch_size or ARCHIVE_BATCH_SIZE
+        max_batches = max_batches or ARCHIVE_MAX_BATCHES
+        cutoff = date.today() - timedelta(days=horizon_days)
+
+        archived = 0
+        batches = 0
+        while batches < max_batches:
+            moved = self.archive_batch(cutoff, batch_size)
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            if moved < batch_size:
+                break
+        print(f"Archived {archived} work orders ended before {cutoff} in {batches} batches")
+        return {"cutoff": cutoff.isoformat(), "archived_count": archived, "batches": batches}
@@ -0,0 +1,171 @@
+# src/services/attachment_service.py
+import time
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from src.models.base import WorkOrders, SupportingDocuments, ArchivedSupportingDocuments
+from src.repositories import statements
+from src.repositories.work_order_changes_repository import WorkOrderChangesRepository
+from src.services.attachment_storage import attachment_storage, ATTACHMENT_GC_GRACE_SECONDS
+from src.services.change_feed_service import change_notifier
+from src.services.unit_of_work import unit_of_work
+
+# Columns reported to change feed consumers for attachment writes
+ATTACHMENT_COLUMNS = ["supporting_documents"]
+
+
+class AttachmentService:
+    """Attachment metadata in supporting_documents; the bytes live in attachment_storage"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.changes = WorkOrderChangesRepository(db)
+        self.storage = attachment_storage
+
+    def _work_order(self, work_order_id: int) -> WorkOrders:
+        work_order = self.db.execute(
+            statements.WORK_ORDER_BY_ID, {"work_order_id": work_order_id}
+        ).scalar_one_or_none()
+        if not work_order:
+            raise HTTPException(status_code=404, detail="Work order not found")
+        return work_order
+
+    def _document(self, work_order_id: int, document_type: str) -> Optional[SupportingDocuments]:
+        return self.db.execute(
+            select(SupportingDocuments)
+            .where(
+                SupportingDocuments.work_order_id == work_order_id,
+                SupportingDocuments.document_type == document_type
+            )
+            .order_by(SupportingDocuments.id)
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def ensure_work_order(self, work_order_id: int) -> None:
+        """404 before an upload is streamed for an order that does not exist"""
+        self._work_order(work_order_id)
+
+    def attach(
+        self,
+        work_order_id: int,
+        document_type: str,
+        content_hash: str,
+        size_bytes: int,
+        file_name: str,
+        content_type: str
+    ) -> SupportingDocuments:
+        """Point the order's document of this type at a stored blob (replacing any previous content)"""
+
+        def work():
+            work_order = self._work_order(work_order_id)
+            document = self._document(work_order_id, document_type)
+            if document is None:
+                document = SupportingDocuments(work_order_id=work_order_id, document_type=document_type)
+                self.db.add(document)
+            replaced_hash = document.content_hash
+            document.has_document = True
+            document.file_name = file_name
+            document.content_type = content_type
+            document.size_bytes = size_bytes
+            document.content_hash = content_hash
+            document.uploaded_at = func.now()
+            # The order's version (and ETag) moves with its attachments
+            work_order.updated_at = func.now()
+            self.db.flush()
+            self.changes.record(work_order_id, "update", work_order.version_id, ATTACHMENT_COLUMNS)
+            return document, replaced_hash
+
+        document, replaced_hash = unit_of_work.run(self.db, work)
+        change_notifier.notify()
+        if replaced_hash and replaced_hash != content_hash:
+            self.release([replaced_hash])
+        self.db.refresh(document)
+        return document
+
+    def detach(self, work_order_id: int, document_type: str) -> None:
+        """Remove a document's stored content (the document type row itself stays)"""
+
+        def work():
+            work_order = self._work_order(work_order_id)
+            document = self._document(work_order_id, document_type)
+            if document is None or document.content_hash is None:
+                raise HTTPException(status_code=404, detail="Document content not found")
+            removed_hash = document.content_hash
+            document.has_document = False
+            document.file_name = None
+            document.content_type = None
+            document.size_bytes = None
+            document.content_hash = None
+            document.uploaded_at = None
+            work_order.updated_at = func.now()
+            self.db.flush()
+            self.changes.record(work_order_id, "update", work_order.version_id, ATTACHMENT_COLUMNS)
+            return removed_hash
+
+        removed_hash = unit_of_work.run(self.db, work)
+        change_notifier.notify()
+        self.release([removed_hash])
+
+    def locate(self, work_order_id: int, document_type: str, include_archived: bool = False):
+        """Document row with stored content, from the live tables or (optionally) the archive"""
+        # Child rows are not covered by the soft-delete filter, so join the live parent
+        document = self.db.execute(
+            select(SupportingDocuments)
+            .join(WorkOrders, WorkOrders.id == SupportingDocuments.work_order_id)
+            .where(
+                SupportingDocuments.work_order_id == work_order_id,
+                SupportingDocuments.document_type == document_type,
+                SupportingDocuments.content_hash.is_not(None),
+                statements.LIVE_WORK_ORDER
+            )
+            .limit(1)
+        ).scalar_one_or_none()
+        if document is None and include_archived:
+            document = self.db.execute(
+                select(ArchivedSupportingDocuments)
+                .where(
+                    ArchivedSupportingDocuments.work_order_id == work_order_id,
+                    ArchivedSupportingDocuments.document_type == document_type,
+                    ArchivedSupportingDocuments.content_hash.is_not(None)
+                )
+                .limit(1)
+            ).scalar_one_or_none()
+        if document is None:
+            raise HTTPException(status_code=404, detail="Document content not found")
+        return document
+
+    def is_referenced(self, content_hash: str) -> bool:
+        """Whether any live, soft-deleted or archived document still points at a blob"""
+        for model in (SupportingDocuments, ArchivedSupportingDocuments):
+            if self.db.execute(
+                select(model.id).where(model.content_hash == content_hash).limit(1)
+            ).first():
+                return True
+        return False
+
+    def _collectable(self, content_hash: str, stored_before: float) -> bool:
+        """Unreferenced and not stored (or re-stored by an identical upload) within the grace period"""
+        modified_at = self.storage.modified_at(content_hash)
+        if modified_at is None or modified_at > stored_before:
+            return False
+        return not self.is_referenced(content_hash)
+
+    def release(self, content_hashes: Iterable[str]) -> int:
+        """Delete blobs no document references any more; returns how many were removed.
+
+        Runs after the dereferencing commit. An identical upload stores (or
+        touches) its blob before committing its row, so blobs younger than
+        ATTACHMENT_GC_GRACE_SECONDS are left for sweep() instead.
+        """
+        stored_before = time.time() - ATTACHMENT_GC_GRACE_SECONDS
+        removed = 0
+        for content_hash in set(content_hashes):
+            if self._collectable(content_hash, stored_before):
+                self.storage.delete(content_hash)
+                removed += 1
+        return removed
+
+    def sweep(self) -> int:
+        """Delete every unreferenced blob older than the grace period (run by the purge job)"""
+        return self.release(self.storage.digests())
@@ -0,0 +1,176 @@
+# src/services/attachment_storage.py
+"""Content-addressed blob storage for work order attachments.
+
+Blobs are keyed by the SHA-256 of their bytes, so the same file uploaded to
+several orders (or twice to one) is stored once. Uploads are streamed to a
+temporary file while hashing and only then moved into place, so a blob is
+never visible half-written. Backends are registered by name and selected
+with ATTACHMENT_BACKEND; the local filesystem backend is the default.
+"""
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import AsyncIterable, Callable, Dict, Iterator, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+
+ATTACHMENT_BACKEND = os.getenv("ATTACHMENT_BACKEND", "local")
+ATTACHMENT_ROOT = os.getenv("ATTACHMENT_ROOT", "./data/attachments")
+ATTACHMENT_MAX_BYTES = int(os.getenv("ATTACHMENT_MAX_BYTES", 50 * 1024 * 1024))
+ATTACHMENT_CHUNK_BYTES = int(os.getenv("ATTACHMENT_CHUNK_BYTES", 1024 * 1024))
+# Hand downloads to a fronting proxy (e.g. X-Accel-Redirect for nginx, X-Sendfile for
+# Apache) so the kernel sends the file; the prefix is the proxy's internal location
+ATTACHMENT_SENDFILE_HEADER = os.getenv("ATTACHMENT_SENDFILE_HEADER", "")
+ATTACHMENT_SENDFILE_PREFIX = os.getenv("ATTACHMENT_SENDFILE_PREFIX", "/internal-attachments/")
+# Unreferenced blobs are only deleted once they are this old, so an identical
+# upload that has stored its blob but not yet committed its row keeps it
+ATTACHMENT_GC_GRACE_SECONDS = float(os.getenv("ATTACHMENT_GC_GRACE_SECONDS", 600))
+
+BLOB_BACKENDS: Dict[str, Callable[[], "BlobBackend"]] = {}
+
+
+class BlobTooLargeError(Exception):
+    """Raised when an upload exceeds the allowed size"""
+
+
+def register_blob_backend(name: str):
+    """Decorator registering a backend factory under ATTACHMENT_BACKEND=<name>"""
+    def decorator(factory):
+        BLOB_BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+class BlobBackend(ABC):
+    """Interface for attachment blob stores"""
+
+    @staticmethod
+    def key(digest: str) -> str:
+        """Blob location relative to the store root, fanned out as ab/cd/<digest>"""
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    @abstractmethod
+    async def put(self, chunks: AsyncIterable[bytes], max_bytes: int = ATTACHMENT_MAX_BYTES) -> Tuple[str, int]:
+        """Store a streamed upload and return (sha256 hex digest, size in bytes).
+
+        Storing content that already exists must refresh its modified time.
+        """
+
+    @abstractmethod
+    def open(self, digest: str) -> Iterator[bytes]:
+        """Iterate over a blob's bytes"""
+
+    def local_path(self, digest: str) -> Optional[str]:
+        """Filesystem path of a blob, when the backend has one (enables Range and sendfile)"""
+        return None
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        """Whether a blob is stored"""
+
+    @abstractmethod
+    def modified_at(self, digest: str) -> Optional[float]:
+        """When a blob was last stored (epoch seconds), or None when it is missing"""
+
+    @abstractmethod
+    def digests(self) -> Iterator[str]:
+        """Every stored blob digest (for garbage collection sweeps)"""
+
+    @abstractmethod
+    def delete(self, digest: str) -> None:
+        """Remove a blob; missing blobs are ignored"""
+
+
+@register_blob_backend("local")
+class LocalBlobBackend(BlobBackend):
+    """Blobs as files under ATTACHMENT_ROOT"""
+
+    def __init__(self, root: str = ATTACHMENT_ROOT):
+        self.root = os.path.abspath(root)
+        self.tmp_dir = os.path.join(self.root, "tmp")
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, *self.key(digest).split("/"))
+
+    async def put(self, chunks: AsyncIterable[bytes], max_bytes: int = ATTACHMENT_MAX_BYTES) -> Tuple[str, int]:
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False)
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with handle:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise BlobTooLargeError(f"Attachment exceeds {max_bytes} bytes")
+                    hasher.update(chunk)
+                    # Disk writes run off the event loop, as UploadFile does
+                    await run_in_threadpool(handle.write, chunk)
+            digest = hasher.hexdigest()
+            await run_in_threadpool(self._commit, handle.name, digest)
+        except BaseException:
+            if os.path.exists(handle.name):
+                os.unlink(handle.name)
+            raise
+        return digest, size
+
+    def _commit(self, tmp_path: str, digest: str) -> None:
+        """Move a finished upload into place, or drop it when the content is already stored"""
+        path = self._path(digest)
+        try:
+            # Already stored: restart its GC grace period for the reference about to be committed
+            os.utime(path)
+            os.unlink(tmp_path)
+            return
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Atomic on one filesystem; a concurrent identical upload just wins the same name
+        os.replace(tmp_path, path)
+
+    def open(self, digest: str) -> Iterator[bytes]:
+        with open(self._path(digest), "rb") as handle:
+            while chunk := handle.read(ATTACHMENT_CHUNK_BYTES):
+                yield chunk
+
+    def local_path(self, digest: str) -> Optional[str]:
+        path = self._path(digest)
+        return path if os.path.exists(path) else None
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def modified_at(self, digest: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(self._path(digest))
+        except FileNotFoundError:
+            return None
+
+    def digests(self) -> Iterator[str]:
+        for directory, subdirectories, files in os.walk(self.root):
+            if directory == self.root:
+                # Unfinished uploads are not blobs yet
+                subdirectories[:] = [name for name in subdirectories if name != "tmp"]
+            for name in files:
+                if len(name) == 64 and all(c in "0123456789abcdef" for c in name):
+                    yield name
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.unlink(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+
+def create_blob_backend(name: str = ATTACHMENT_BACKEND) -> BlobBackend:
+    """Instantiate the configured backend"""
+    if name not in BLOB_BACKENDS:
+        raise ValueError(f"Unknown ATTACHMENT_BACKEND: {name}")
+    return BLOB_BACKENDS[name]()
+
+
+attachment_storage = create_blob_backend()
@@ -0,0 +1,192 @@
+# src/services/autocomplete_index.py
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import List, Optional, Dict, Iterable, Tuple
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from src.models.base import WorkOrders, WorkOrderVendors
+
+# Fields served by the typeahead endpoint
+AUTOCOMPLETE_FIELDS = ('document_number', 'recommended_contractor', 'budget_name', 'vendor_name')
+WORK_ORDER_FIELDS = ('document_number', 'recommended_contractor', 'budget_name')
+
+
+class PrefixIndex:
+    """Case-insensitive prefix index over a sorted array, looked up with bisect"""
+
+    def __init__(self):
+        self._entries: List[Tuple[str, str]] = []
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def load(self, values: Iterable[Tuple[str, int]]) -> None:
+        """Replace the contents with (value, occurrences) pairs"""
+        counts: Dict[Tuple[str, str], int] = {}
+        for value, occurrences in values:
+            if value:
+                entry = (value.casefold(), value)
+                counts[entry] = counts.get(entry, 0) + occurrences
+        self._counts = counts
+        self._entries = sorted(counts)
+
+    def add(self, value: Optional[str]) -> None:
+        """Add one occurrence of a value"""
+        if not value:
+            return
+        entry = (value.casefold(), value)
+        if entry in self._counts:
+            self._counts[entry] += 1
+        else:
+            self._counts[entry] = 1
+            insort(self._entries, entry)
+
+    def remove(self, value: Optional[str]) -> None:
+        """Remove one occurrence of a value, dropping it once no rows use it"""
+        if not value:
+            return
+        entry = (value.casefold(), value)
+        remaining = self._counts.get(entry, 0) - 1
+        if remaining > 0:
+            self._counts[entry] = remaining
+            return
+        if self._counts.pop(entry, None) is not None:
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+    def lookup(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get up to `limit` values starting with prefix, in sorted order"""
+        folded = prefix.casefold()
+        results = []
+        position = bisect_left(self._entries, (folded,))
+        while position < len(self._entries) and len(results) < limit:
+            key, value = self._entries[position]
+            if not key.startswith(folded):
+                break
+            results.append(value)
+            position += 1
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AutocompleteIndex:
+    """In-memory typeahead index over work order and vendor names"""
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self.indexes: Dict[str, PrefixIndex] = {field: PrefixIndex() for field in AUTOCOMPLETE_FIELDS}
+        self.warmed_at: Optional[float] = None
+        self._invalidated = False
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        # Changes committed while a rebuild is reading, replayed after the swap
+        self._pending: Optional[List[Tuple[Optional[Dict[str, List[str]]], Optional[Dict[str, List[str]]]]]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed_at is not None
+
+    def is_stale(self) -> bool:
+        """True before the first warm-up, after invalidate(), or when the periodic rebuild is due"""
+        if self.warmed_at is None or self._invalidated:
+            return True
+        return self.refresh_seconds > 0 and time.monotonic() - self.warmed_at > self.refresh_seconds
+
+    def invalidate(self) -> None:
+        """Rebuild on the next lookup (after set-based writes); the current index is served until then"""
+        self._invalidated = True
+
+    def warm(self, db: Session) -> None:
+        """(Re)build every field index from the database"""
+        with self._lock:
+            self._pending = []
+            self._invalidated = False
+        try:
+            loaded = {}
+            for field in WORK_ORDER_FIELDS:
+                column = getattr(WorkOrders, field)
+                loaded[field] = db.execute(
+                    select(column, func.count()).where(column.isnot(None)).group_by(column)
+                ).all()
+            loaded['vendor_name'] = db.execute(
+                select(WorkOrderVendors.vendor_name, func.count())
+                .join(WorkOrders, WorkOrders.id == WorkOrderVendors.work_order_id)  # live orders only
+                .where(WorkOrderVendors.vendor_name.isnot(None))
+                .group_by(WorkOrderVendors.vendor_name)
+            ).all()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            for field, rows in loaded.items():
+                self.indexes[field].load(rows)
+            # A change committed just before the reads can be counted twice here;
+            # the next rebuild corrects it, whereas dropping changes would hide new values
+            for old, new in self._pending:
+                self._apply(old, new)
+            self._pending = None
+            self.warmed_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Rebuild when stale, one request at a time; others keep reading the current index"""
+        if not self.is_stale():
+            return
+        # Only the very first build makes callers wait
+        if not self._refresh_lock.acquire(blocking=not self.ready):
+            return
+        try:
+            if self.is_stale():
+                self.warm(db)
+        finally:
+            self._refresh_lock.release()
+
+    def lookup(self, field: str, prefix: str, limit: int = 10) -> List[str]:
+        """Get values of a field starting with prefix"""
+        if field not in self.indexes:
+            raise ValueError(
+                f"Unsupported autocomplete field: {field}. Allowed: {', '.join(AUTOCOMPLETE_FIELDS)}"
+            )
+        with self._lock:
+            return self.indexes[field].lookup(prefix, limit)
+
+    @staticmethod
+    def entry_for(work_order: WorkOrders, vendor_names: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """Capture the indexed values of a work order (call before mutating it)"""
+        entry = {field: [getattr(work_order, field)] for field in WORK_ORDER_FIELDS}
+        entry['vendor_name'] = list(vendor_names or [])
+        return entry
+
+    def _apply(
+        self,
+        old: Optional[Dict[str, List[str]]],
+        new: Optional[Dict[str, List[str]]]
+    ) -> None:
+        for field, values in (old or {}).items():
+            for value in values:
+                self.indexes[field].remove(value)
+        for field, values in (new or {}).items():
+            for value in values:
+                self.indexes[field].add(value)
+
+    def apply_change(
+        self,
+        old: Optional[Dict[str, List[str]]] = None,
+        new: Optional[Dict[str, List[str]]] = None
+    ) -> None:
+        """Apply a committed write: remove the old values and add the new ones"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((old, new))
+            if self.ready:
+                self._apply(old, new)
+
+
+# Process-wide index, warmed in the application lifespan
+autocomplete_index = AutocompleteIndex(
+    refresh_seconds=float(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", 300))
+)
@@ -0,0 +1,116 @@
+# src/services/change_feed_service.py
+import asyncio
+import json
+import os
+import threading
+from typing import List, Dict, Any, AsyncIterator, Optional
+from starlette.concurrency import run_in_threadpool
+from src.config.database import db_manager
+from src.models.base import WorkOrderChange
+from src.repositories.work_order_changes_repository import WorkOrderChangesRepository
+
+CHANGE_FEED_POLL_SECONDS = float(os.getenv("CHANGE_FEED_POLL_SECONDS", 1.0))
+CHANGE_FEED_SETTLE_SECONDS = float(os.getenv("CHANGE_FEED_SETTLE_SECONDS", 0.5))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", 15.0))
+
+
+class ChangeNotifier:
+    """Wakes long-poll and SSE waiters in this process when a write commits.
+
+    Writes from other workers are picked up by the poll interval instead.
+    """
+
+    def __init__(self):
+        self._waiters = set()
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        """Wake every waiter (safe to call from worker threads)"""
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(self._wake, future)
+
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep until the next local write or the timeout, whichever comes first"""
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+# Process-wide notifier, signalled by WorkOrdersService after each commit
+change_notifier = ChangeNotifier()
+
+
+def serialize_change(change: WorkOrderChange) -> Dict[str, Any]:
+    """Convert a change row to its API representation"""
+    return {
+        "token": change.id,
+        "work_order_id": change.work_order_id,
+        "operation": change.operation,
+        "version": change.version_id,
+        "columns": json.loads(change.changed_columns) if change.changed_columns else None,
+        "changed_at": change.changed_at.isoformat() if change.changed_at else None,
+    }
+
+
+def fetch_changes(since: int, limit: int = 100) -> List[Dict[str, Any]]:
+    """Read settled changes after a token with a short-lived session"""
+    db = db_manager.SessionLocal()
+    try:
+        changes = WorkOrderChangesRepository(db).get_since(
+            since, limit=limit, settle_seconds=CHANGE_FEED_SETTLE_SECONDS
+        )
+        return [serialize_change(change) for change in changes]
+    finally:
+        db.close()
+
+
+async def wait_for_changes(since: int, limit: int = 100, wait_seconds: float = 0.0) -> List[Dict[str, Any]]:
+    """Long-poll: return as soon as changes after `since` exist, or [] after wait_seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_seconds
+    while True:
+        changes = await run_in_threadpool(fetch_changes, since, limit)
+        remaining = deadline - loop.time()
+        if changes or remaining <= 0:
+            return changes
+        # Local writes wake us early; the settle window needs one more short pass
+        await change_notifier.wait(min(CHANGE_FEED_POLL_SECONDS, remaining))
+        await asyncio.sleep(min(CHANGE_FEED_SETTLE_SECONDS, max(0.0, deadline - loop.time())))
+
+
+async def stream_changes(since: int, batch_size: int = 100) -> AsyncIterator[str]:
+    """Server-Sent Events stream of changes, resumable via Last-Event-ID"""
+    token = since
+    yield f"retry: {int(CHANGE_FEED_POLL_SECONDS * 1000)}\n\n"
+    while True:
+        changes = await wait_for_changes(token, batch_size, CHANGE_FEED_HEARTBEAT_SECONDS)
+        if not changes:
+            yield ": keep-alive\n\n"
+            continue
+        for change in changes:
+            token = change["token"]
+            yield f"id: {token}\nevent: {change['operation']}\ndata: {json.dumps(change)}\n\n"
+
+
+def latest_token() -> Optional[int]:
+    """Newest token, for consumers that only want changes from now on"""
+    db = db_manager.SessionLocal()
+    try:
+        return WorkOrderChangesRepository(db).latest_token()
+    finally:
+        db.close()
@@ -0,0 +1,119 @@
+# src/services/count_service.py
+import os
+from typing import Optional, Dict, Any
+from sqlalchemy import select, func, or_, text
+from sqlalchemy.orm import Session
+from src.models.base import WorkOrders, ArchivedWorkOrders
+from src.repositories.statements import SEARCH_COLUMNS
+from src.services.cache import TTLCache
+
+# Totals are only used for the pager, so a few seconds of staleness is fine
+count_cache = TTLCache(
+    ttl_seconds=float(os.getenv("COUNT_CACHE_TTL_SECONDS", 5)),
+    max_entries=int(os.getenv("COUNT_CACHE_MAX_ENTRIES", 512)),
+)
+
+# Engine statistics queries used for unfiltered approximate totals
+APPROXIMATE_COUNT_SQL = {
+    "mssql": (
+        "SELECT SUM(p.rows) FROM sys.partitions p "
+        "WHERE p.object_id = OBJECT_ID(:table_name) AND p.index_id IN (0, 1)"
+    ),
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)",
+    "mysql": (
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+    ),
+    "oracle": "SELECT NUM_ROWS FROM USER_TABLES WHERE TABLE_NAME = UPPER(:table_name)",
+}
+
+
+class WorkOrdersCountService:
+    """Counts work_orders with a direct SELECT count(id) and a short-TTL cache"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def count(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        approximate: bool = False,
+        include_archived: bool = False
+    ) -> int:
+        """Count work_orders matching filters/search, served from cache when fresh"""
+        filters = {k: v for k, v in (filters or {}).items() if hasattr(WorkOrders, k)}
+        unfiltered = not filters and not search
+        mode = "approximate" if approximate and unfiltered else "exact"
+        key = (mode, frozenset(filters.items()), search or None, include_archived)
+
+        cached = count_cache.get(key)
+        if cached is not None:
+            return cached
+
+        total = None
+        if mode == "approximate":
+            total = self.approximate_count()
+            if total is not None and include_archived:
+                archived = self.approximate_count(ArchivedWorkOrders)
+                total = total + archived if archived is not None else None
+        if total is None:
+            total = self.exact_count(filters, search)
+            if include_archived:
+                total += self.exact_count(filters, search, ArchivedWorkOrders)
+
+        count_cache.set(key, total)
+        return total
+
+    def exact_count(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        model=WorkOrders
+    ) -> int:
+        """Issue SELECT count(id) with the same filters as the list queries"""
+        stmt = select(func.count(model.id)).select_from(model)
+
+        for key, value in (filters or {}).items():
+            if hasattr(model, key):
+                column = getattr(model, key)
+                stmt = stmt.where(column.is_(None) if value is None else column == value)
+
+        if search:
+            stmt = stmt.where(or_(*[getattr(model, column.key).ilike(f"%{search}%") for column in SEARCH_COLUMNS]))
+
+        return self.db.execute(stmt).scalar_one()
+
+    def approximate_count(self, model=WorkOrders) -> Optional[int]:
+        """Read the row estimate from engine statistics, or None when unavailable.
+
+        The statistics count soft-deleted rows too, so the tombstones (a seek
+        on the partial ix_work_orders_deleted_at index) are subtracted.
+        """
+        dialect = self.db.get_bind().dialect.name
+        sql = APPROXIMATE_COUNT_SQL.get(dialect)
+        if sql is None:
+            return None
+
+        try:
+            estimate = self.db.execute(
+                text(sql), {"table_name": model.__tablename__}
+            ).scalar()
+        except Exception:
+            self.db.rollback()
+            return None
+
+        # Postgres reports -1 for tables that have never been analyzed
+        if estimate is None or estimate < 0:
+            return None
+        if "deleted_at" in model.__table__.c:
+            # Core select: the ORM soft-delete filter would hide exactly these rows
+            deleted_at = model.__table__.c.deleted_at
+            tombstones = self.db.execute(
+                select(func.count()).select_from(model.__table__).where(deleted_at.is_not(None))
+            ).scalar_one()
+            # Statistics older than a burst of deletes; fall back to the exact count
+            if tombstones > estimate:
+                return None
+            estimate -= tombstones
+        return int(estimate)
@@ -0,0 +1,238 @@
+# src/services/credential_service.py
+"""Password hashing, verification and login throttling.
+
+Hashes use argon2 (argon2-cffi is in requirements.txt), or bcrypt when only
+that is installed, and fall back to PBKDF2-SHA256 from the standard
+library. Stored values are self-describing, so the scheme or its cost can
+change at any time: a successful login with an outdated (or legacy
+plaintext) value is rehashed.
+
+Hashing is deliberately slow, so it runs on a small dedicated thread pool
+(all three implementations release the GIL) instead of the event loop or
+the shared request threadpool. Successful verifications are remembered
+for a short TTL under an HMAC of (user, password, stored hash), so the
+password itself is never kept and a password change invalidates the entry.
+Rate limits and the cache are per worker process.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Optional, Tuple
+from fastapi import HTTPException
+from src.services.cache import TTLCache
+
+try:
+    import argon2
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    argon2 = None
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+PASSWORD_HASH_SCHEMES = ("argon2", "bcrypt", "pbkdf2_sha256")
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "")  # one of PASSWORD_HASH_SCHEMES (default: best available)
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", 600000))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 60))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 10000))
+LOGIN_RATE_WINDOW_SECONDS = float(os.getenv("LOGIN_RATE_WINDOW_SECONDS", 300))
+LOGIN_MAX_FAILURES_PER_USER = int(os.getenv("LOGIN_MAX_FAILURES_PER_USER", 5))
+LOGIN_MAX_ATTEMPTS_PER_IP = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", 100))
+LOGIN_RATE_MAX_TRACKED_KEYS = int(os.getenv("LOGIN_RATE_MAX_TRACKED_KEYS", 100000))
+
+
+def get_password_hash_workers() -> int:
+    """Hashing threads for this process.
+
+    PASSWORD_HASH_WORKERS (default: CPU count) is the budget for the whole
+    host and is split evenly across WEB_CONCURRENCY workers, so several
+    processes hashing at once do not oversubscribe the cores.
+    """
+    budget = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+    return max(1, budget // workers)
+
+
+PASSWORD_HASH_WORKERS = get_password_hash_workers()
+
+
+class PasswordHasher:
+    """Hashes new passwords with the preferred scheme and verifies any supported one"""
+
+    def __init__(self, scheme: str = PASSWORD_HASH_SCHEME):
+        self.scheme = scheme or ("argon2" if argon2 else "bcrypt" if bcrypt else "pbkdf2_sha256")
+        if self.scheme not in PASSWORD_HASH_SCHEMES:
+            raise RuntimeError(
+                f"Unsupported PASSWORD_HASH_SCHEME: {self.scheme}. Allowed: {', '.join(PASSWORD_HASH_SCHEMES)}"
+            )
+        if self.scheme == "argon2" and not argon2:
+            raise RuntimeError("PASSWORD_HASH_SCHEME=argon2 needs the argon2-cffi package")
+        if self.scheme == "bcrypt" and not bcrypt:
+            raise RuntimeError("PASSWORD_HASH_SCHEME=bcrypt needs the bcrypt package")
+        self._argon2 = argon2.PasswordHasher() if argon2 else None
+        self._dummy_hash: Optional[str] = None
+
+    def hash(self, password: str) -> str:
+        if self.scheme == "argon2":
+            return self._argon2.hash(password)
+        if self.scheme == "bcrypt":
+            return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+        salt = secrets.token_bytes(16)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+        return "$".join((
+            "pbkdf2_sha256", str(PBKDF2_ITERATIONS),
+            base64.b64encode(salt).decode(), base64.b64encode(digest).decode()
+        ))
+
+    def verify(self, password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+        """(matches, needs_rehash) for a stored value; a missing user still pays for one hash"""
+        if not stored:
+            # Same work as a real check, so response times do not reveal unknown users
+            self.verify(password, self.dummy_hash())
+            return False, False
+        if stored.startswith("$argon2"):
+            if not self._argon2:
+                return False, False
+            try:
+                self._argon2.verify(stored, password)
+            except (VerificationError, InvalidHashError):
+                return False, False
+            return True, self.scheme != "argon2" or self._argon2.check_needs_rehash(stored)
+        if stored.startswith(("$2a$", "$2b$", "$2y$")):
+            if not bcrypt:
+                return False, False
+            try:
+                matches = bcrypt.checkpw(password.encode(), stored.encode())
+            except ValueError:
+                return False, False
+            rounds = int(stored.split("$")[2])
+            return matches, matches and (self.scheme != "bcrypt" or rounds < BCRYPT_ROUNDS)
+        if stored.startswith("pbkdf2_sha256$"):
+            try:
+                _, iterations, salt, expected = stored.split("$")
+                digest = hashlib.pbkdf2_hmac(
+                    "sha256", password.encode(), base64.b64decode(salt), int(iterations)
+                )
+            except ValueError:
+                return False, False
+            matches = hmac.compare_digest(digest, base64.b64decode(expected))
+            return matches, matches and (self.scheme != "pbkdf2_sha256" or int(iterations) < PBKDF2_ITERATIONS)
+        # Legacy plaintext from UserTable: compare in constant time, then rehash
+        self.verify(password, self.dummy_hash())
+        matches = hmac.compare_digest(password.encode(), stored.encode())
+        return matches, matches
+
+    def dummy_hash(self) -> str:
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+        return self._dummy_hash
+
+
+class CredentialVerifier:
+    """Runs hashing off the event loop and remembers recent successful checks"""
+
+    def __init__(
+        self,
+        hasher: PasswordHasher,
+        workers: int = PASSWORD_HASH_WORKERS,
+        cache_ttl_seconds: float = AUTH_CACHE_TTL_SECONDS
+    ):
+        self.hasher = hasher
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="password-hash")
+        self.cache = TTLCache(ttl_seconds=cache_ttl_seconds, max_entries=AUTH_CACHE_MAX_ENTRIES)
+        # Per-process key: cache entries are useless outside this worker
+        self._cache_key_secret = secrets.token_bytes(32)
+
+    def _cache_key(self, user_id: str, password: str, stored: str) -> bytes:
+        message = "\0".join((user_id, password, stored)).encode()
+        return hmac.new(self._cache_key_secret, message, hashlib.sha256).digest()
+
+    async def verify(self, user_id: str, password: str, stored: Optional[str]) -> Tuple[bool, bool]:
+        """(matches, needs_rehash), from the cache or the hashing pool"""
+        cache_key = self._cache_key(user_id, password, stored) if stored else None
+        if cache_key is not None and self.cache.get(cache_key):
+            return True, False
+        loop = asyncio.get_running_loop()
+        matches, needs_rehash = await loop.run_in_executor(self.executor, self.hasher.verify, password, stored)
+        # Only successes are cached, so guessing always pays the full hash cost
+        if matches and not needs_rehash:
+            self.cache.set(cache_key, True)
+        return matches, needs_rehash
+
+    async def hash(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.hasher.hash, password)
+
+
+class LoginRateLimiter:
+    """Sliding-window limits: failed logins per user and attempts per client IP"""
+
+    def __init__(
+        self,
+        window_seconds: float = LOGIN_RATE_WINDOW_SECONDS,
+        max_failures_per_user: int = LOGIN_MAX_FAILURES_PER_USER,
+        max_attempts_per_ip: int = LOGIN_MAX_ATTEMPTS_PER_IP
+    ):
+        self.window_seconds = window_seconds
+        self.max_failures_per_user = max_failures_per_user
+        self.max_attempts_per_ip = max_attempts_per_ip
+        self._user_failures: Dict[str, Deque[float]] = {}
+        self._ip_attempts: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, events: Dict[str, Deque[float]], key: str, now: float) -> Deque[float]:
+        window = events.get(key)
+        if window is None:
+            return deque()
+        while window and window[0] <= now - self.window_seconds:
+            window.popleft()
+        if not window:
+            del events[key]
+        return window
+
+    def check(self, user_id: str, client_ip: str) -> None:
+        """Count the attempt, or raise 429 (before any hashing is done)"""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._ip_attempts) + len(self._user_failures) > LOGIN_RATE_MAX_TRACKED_KEYS:
+                # Many distinct clients: drop every expired window, not just this one
+                for events in (self._ip_attempts, self._user_failures):
+                    for key in list(events):
+                        self._prune(events, key, now)
+            failures = self._prune(self._user_failures, user_id, now)
+            attempts = self._prune(self._ip_attempts, client_ip, now)
+            if len(failures) >= self.max_failures_per_user:
+                retry_after = failures[0] + self.window_seconds - now
+            elif len(attempts) >= self.max_attempts_per_ip:
+                retry_after = attempts[0] + self.window_seconds - now
+            else:
+                self._ip_attempts.setdefault(client_ip, deque()).append(now)
+                return
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+        )
+
+    def record_failure(self, user_id: str) -> None:
+        with self._lock:
+            self._user_failures.setdefault(user_id, deque()).append(time.monotonic())
+
+    def record_success(self, user_id: str) -> None:
+        with self._lock:
+            self._user_failures.pop(user_id, None)
+
+
+password_hasher = PasswordHasher()
+credential_verifier = CredentialVerifier(password_hasher)
+login_rate_limiter = LoginRateLimiter()
@@ -0,0 +1,102 @@
+# src/services/document_number_service.py
+import os
+import threading
+from datetime import date
+from typing import Optional, Callable
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.config.database import db_manager
+from src.models.base import DocumentNumberSequence
+
+
+class DocumentNumberAllocator:
+    """Hands out unique document numbers from ranges reserved in document_number_sequences.
+
+    Each process reserves `block_size` numbers with a single row-locking UPDATE
+    and then serves them from memory, so creates never race on the unique
+    document_number constraint and workers only touch the sequence row once per block.
+    """
+
+    def __init__(
+        self,
+        sequence_name: str = "work_orders",
+        prefix: str = "WO-",
+        date_format: str = "%Y%m-",
+        padding: int = 6,
+        block_size: int = 50,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.sequence_name = sequence_name
+        self.prefix = prefix
+        self.date_format = date_format
+        self.padding = padding
+        self.block_size = max(1, block_size)
+        self.session_factory = session_factory
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_number(self, on: Optional[date] = None) -> str:
+        """Format the next number, e.g. WO-202510-000123"""
+        value = self.next_value()
+        date_part = (on or date.today()).strftime(self.date_format) if self.date_format else ""
+        return f"{self.prefix}{date_part}{value:0{self.padding}d}"
+
+    def next_value(self) -> int:
+        """Get the next raw sequence value, reserving a new block when exhausted"""
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self._reserve_block()
+                self._end = self._next + self.block_size
+            value = self._next
+            self._next += 1
+            return value
+
+    def _reserve_block(self) -> int:
+        """Reserve block_size values in their own transaction and return the first one"""
+        session_factory = self.session_factory or db_manager.SessionLocal
+        db = session_factory()
+        try:
+            for _ in range(2):
+                result = db.execute(
+                    update(DocumentNumberSequence)
+                    .where(DocumentNumberSequence.name == self.sequence_name)
+                    .values(next_value=DocumentNumberSequence.next_value + self.block_size)
+                )
+                if result.rowcount:
+                    # The row stays locked until commit, so this read is ours
+                    end = db.execute(
+                        select(DocumentNumberSequence.next_value)
+                        .where(DocumentNumberSequence.name == self.sequence_name)
+                    ).scalar_one()
+                    db.commit()
+                    return end - self.block_size
+
+                # First use of this sequence: create it holding our block
+                try:
+                    db.add(DocumentNumberSequence(name=self.sequence_name, next_value=1 + self.block_size))
+                    db.commit()
+                    return 1
+                except IntegrityError:
+                    # Another worker created it first; take a block from it
+                    db.rollback()
+            raise RuntimeError(f"Could not reserve document numbers from sequence '{self.sequence_name}'")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# Process-wide allocator configured from the environment
+document_number_allocator = DocumentNumberAllocator(
+    sequence_name=os.getenv("DOC_NUMBER_SEQUENCE", "work_orders"),
+    prefix=os.getenv("DOC_NUMBER_PREFIX", "WO-"),
+    date_format=os.getenv("DOC_NUMBER_DATE_FORMAT", "%Y%m-"),
+    padding=int(os.getenv("DOC_NUMBER_PADDING", 6)),
+    block_size=int(os.getenv("DOC_NUMBER_BLOCK_SIZE", 50)),
+)
+
+# When true, client-supplied document numbers are ignored and always allocated
+ALWAYS_ALLOCATE_DOCUMENT_NUMBERS = os.getenv("DOC_NUMBER_ALWAYS_ALLOCATE", "false").lower() == "true"
@@ -0,0 +1,52 @@
+# src/services/facet_service.py
+import os
+from typing import List, Optional, Dict, Any, Iterable
+from sqlalchemy.orm import Session
+from src.repositories.work_orders_repository import WorkOrdersRepository, FACET_COLUMNS
+from src.services.cache import TTLCache
+
+# Entries are dropped explicitly on writes; the TTL only bounds staleness
+# caused by writes from other worker processes
+facet_cache = TTLCache(
+    ttl_seconds=float(os.getenv("FACET_CACHE_TTL_SECONDS", 300)),
+    max_entries=int(os.getenv("FACET_CACHE_MAX_ENTRIES", 256)),
+)
+
+
+def invalidate_facets(columns: Optional[Iterable[str]] = None) -> None:
+    """Drop cached facets touching any of the given columns (all when None)"""
+    if columns is None:
+        facet_cache.clear()
+        return
+    changed = set(columns) & set(FACET_COLUMNS)
+    if changed:
+        facet_cache.delete_where(lambda key: bool(changed & set(key[0])))
+
+
+class WorkOrdersFacetService:
+    """Distinct value -> count facets for the work order filter dropdowns"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = WorkOrdersRepository(db)
+
+    def get_facets(
+        self,
+        columns: List[str],
+        prefix: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get facet counts for the requested columns, served from cache when possible"""
+        invalid = [name for name in columns if name not in FACET_COLUMNS]
+        if invalid:
+            raise ValueError(
+                f"Unsupported facet column(s): {', '.join(invalid)}. "
+                f"Allowed: {', '.join(FACET_COLUMNS)}"
+            )
+
+        columns = sorted(set(columns))
+        key = (tuple(columns), prefix or None, limit)
+        return facet_cache.get_or_set(
+            key,
+            lambda: self.repository.get_facet_counts(columns, prefix=prefix, limit=limit)
+        )
@@ -0,0 +1,238 @@
+# src/services/idempotency_service.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.config.database import db_manager
+from src.models.base import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def fingerprint_request(method: str, path: str, payload: str) -> str:
+    """Hash what makes a request 'the same request' for a given key"""
+    digest = hashlib.sha256()
+    for part in (method.upper(), path, payload):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class InMemoryIdempotencyStore:
+    """Per-process LRU of key -> {fingerprint, status_code, body} with TTL"""
+
+    def __init__(self, ttl_seconds: float = 86400, max_entries: int = 10000, lease_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return record
+
+    def _put(self, key: str, record: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() + (ttl_seconds or self.ttl_seconds), record)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get(key)
+
+    def begin(self, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Reserve the key, or return the existing record when already used"""
+        with self._lock:
+            existing = self._get(key)
+            if existing is not None:
+                return existing
+            # In flight: a short lease, so a request that never completes frees the key
+            self._put(key, {"fingerprint": fingerprint, "status_code": None, "body": None}, self.lease_seconds)
+            return None
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: Any) -> None:
+        with self._lock:
+            self._put(key, {"fingerprint": fingerprint, "status_code": status_code, "body": body})
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DatabaseIdempotencyStore:
+    """idempotency_keys table backend shared by all workers, fronted by the in-process LRU"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 86400,
+        lease_seconds: float = 60,
+        cache: Optional[InMemoryIdempotencyStore] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+        purge_every: int = 500
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.cache = cache or InMemoryIdempotencyStore(ttl_seconds=ttl_seconds)
+        self.session_factory = session_factory
+        self.purge_every = purge_every
+        self._begins = 0
+
+    def _session(self) -> Session:
+        return (self.session_factory or db_manager.SessionLocal)()
+
+    def begin(self, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Reserve the key with an in-flight row, or return the stored record.
+
+        The in-flight row expires after lease_seconds rather than the full TTL,
+        so after a crash or lost completion a retry takes the key over instead
+        of getting 409 for a day; complete() extends it to the TTL.
+        """
+        cached = self.cache.get(key)
+        if cached is not None and cached["status_code"] is not None:
+            return cached
+
+        self._begins += 1
+        if self._begins % self.purge_every == 0:
+            self.purge_expired()
+
+        now = datetime.utcnow()
+        db = self._session()
+        try:
+            for _ in range(2):
+                try:
+                    db.add(IdempotencyKey(
+                        key=key,
+                        fingerprint=fingerprint,
+                        created_at=now,
+                        expires_at=now + timedelta(seconds=self.lease_seconds),
+                    ))
+                    db.commit()
+                    return None
+                except IntegrityError:
+                    db.rollback()
+
+                row = db.get(IdempotencyKey, key)
+                if row is None:
+                    continue
+                if row.expires_at < now:
+                    # Conditional, so a concurrent retry that already took the key over keeps it
+                    db.execute(delete(IdempotencyKey).where(
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.expires_at < now,
+                    ))
+                    db.commit()
+                    continue
+                record = {
+                    "fingerprint": row.fingerprint,
+                    "status_code": row.status_code,
+                    "body": json.loads(row.response_body) if row.response_body is not None else None,
+                }
+                if record["status_code"] is not None:
+                    self.cache.complete(key, row.fingerprint, row.status_code, record["body"])
+                return record
+            raise HTTPException(status_code=409, detail="Idempotency key is being reused concurrently")
+        finally:
+            db.close()
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: Any) -> None:
+        db = self._session()
+        try:
+            row = db.get(IdempotencyKey, key)
+            if row is not None:
+                row.status_code = status_code
+                row.response_body = json.dumps(body)
+                row.expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                db.commit()
+        finally:
+            db.close()
+        self.cache.complete(key, fingerprint, status_code, body)
+
+    def release(self, key: str) -> None:
+        db = self._session()
+        try:
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            ))
+            db.commit()
+        finally:
+            db.close()
+        self.cache.release(key)
+
+    def purge_expired(self) -> int:
+        """Delete expired keys"""
+        db = self._session()
+        try:
+            result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow()))
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+
+def replay_response(record: Dict[str, Any], fingerprint: str) -> JSONResponse:
+    """Answer a repeated request from its stored record"""
+    if record["fingerprint"] != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{IDEMPOTENCY_HEADER} was already used with a different request payload"
+        )
+    if record["status_code"] is None:
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still being processed"
+        )
+    return JSONResponse(
+        status_code=record["status_code"],
+        content=record["body"],
+        headers={REPLAYED_HEADER: "true"}
+    )
+
+
+def create_idempotency_store():
+    """Build the store selected by IDEMPOTENCY_BACKEND (memory or database).
+
+    Without an explicit backend, several worker processes (WEB_CONCURRENCY > 1)
+    get the database store: a per-process memory store would let a retry that
+    lands on another worker run the request again.
+    """
+    ttl_seconds = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    lease_seconds = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", 60))
+    cache = InMemoryIdempotencyStore(
+        ttl_seconds=ttl_seconds,
+        max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", 10000)),
+        lease_seconds=lease_seconds,
+    )
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+    backend = os.getenv("IDEMPOTENCY_BACKEND", "").lower() or ("database" if workers > 1 else "memory")
+    if backend == "database":
+        return DatabaseIdempotencyStore(ttl_seconds=ttl_seconds, lease_seconds=lease_seconds, cache=cache)
+    if backend != "memory":
+        raise ValueError(f"Unsupported IDEMPOTENCY_BACKEND: {backend}. Allowed: memory, database")
+    if workers > 1:
+        print(f"IDEMPOTENCY_BACKEND=memory with {workers} workers: Idempotency-Key replays only work "
+              "when the retry reaches the same worker; use IDEMPOTENCY_BACKEND=database")
+    return cache
+
+
+# Process-wide store used by the create routes
+idempotency_store = create_idempotency_store()
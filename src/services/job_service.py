@@ -0,0 +1,367 @@
+# src/services/job_service.py
+import json
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.orm import Session
+from src.config.database import db_manager
+from src.models.base import BackgroundJob
+from src.services.unit_of_work import DEFERRED_HOOKS_KEY, run_deferred_hooks
+
+# job_type -> handler(db, payload) returning a JSON-serializable result
+JOB_HANDLERS: Dict[str, Callable[[Session, Any], Any]] = {}
+# Job types whose handler commits in its own batches instead of one transaction
+NON_ATOMIC_JOB_TYPES: Set[str] = set()
+
+UNFINISHED_STATUSES = ('queued', 'running')
+
+
+def register_job_handler(job_type: str, atomic: bool = True):
+    """Decorator registering the function that runs jobs of a given type.
+
+    Atomic handlers run inside one transaction that also records the job as
+    succeeded, so their commits become savepoints. Pass atomic=False for
+    idempotent handlers that commit in separate batches (archive, purge,
+    bulk delete/update), so each batch releases its locks as it commits.
+    """
+    def decorator(func: Callable[[Session, Any], Any]) -> Callable[[Session, Any], Any]:
+        JOB_HANDLERS[job_type] = func
+        if atomic:
+            NON_ATOMIC_JOB_TYPES.discard(job_type)
+        else:
+            NON_ATOMIC_JOB_TYPES.add(job_type)
+        return func
+    return decorator
+
+
+def serialize_job(job: BackgroundJob, include_result: bool = False) -> Dict[str, Any]:
+    """Convert a job row to its API representation"""
+    data = {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if include_result:
+        data["result"] = json.loads(job.result) if job.result is not None else None
+    return data
+
+
+class JobQueue:
+    """In-process worker pool with a bounded queue and a durable background_jobs table.
+
+    Jobs are claimed with a conditional UPDATE (queued -> running) and a lease,
+    so a job is only run once even when several processes recover the table,
+    and jobs interrupted by a restart are picked up again once their lease expires.
+    A heartbeat renews the lease while the handler runs, the attempt counter
+    fences a worker that lost its lease, and a job that keeps being interrupted
+    is marked failed after max_attempts claims.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queued: int = 100,
+        lease_seconds: float = 900,
+        recover_interval: float = 30,
+        max_attempts: int = 3,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.recover_interval = recover_interval
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queued)
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+
+    def _session(self) -> Session:
+        return (self.session_factory or db_manager.SessionLocal)()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """Start the worker threads and re-enqueue unfinished jobs from the table"""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.recover()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop taking jobs and wait for the running ones to finish"""
+        self._stopping.set()
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, job_type: str, payload: Any) -> str:
+        """Persist a job and enqueue it; raises 503 when the queue is full"""
+        if job_type not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if self._queue.full():
+            raise HTTPException(
+                status_code=503,
+                detail="Background job queue is full, retry later",
+                headers={"Retry-After": "5"}
+            )
+
+        job_id = uuid.uuid4().hex
+        db = self._session()
+        try:
+            db.add(BackgroundJob(
+                id=job_id,
+                job_type=job_type,
+                status='queued',
+                payload=json.dumps(jsonable_encoder(payload)),
+                attempts=0,
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            # Stays queued in the table; the next recovery sweep runs it
+            pass
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[BackgroundJob]:
+        """Load a job row"""
+        db = self._session()
+        try:
+            job = db.get(BackgroundJob, job_id)
+            if job is not None:
+                db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def recover(self) -> int:
+        """Enqueue queued jobs and running jobs whose lease expired (e.g. after a restart)"""
+        db = self._session()
+        try:
+            job_ids = db.execute(
+                select(BackgroundJob.id).where(or_(
+                    BackgroundJob.status == 'queued',
+                    and_(
+                        BackgroundJob.status == 'running',
+                        BackgroundJob.lease_expires_at < datetime.utcnow(),
+                    ),
+                )).order_by(BackgroundJob.created_at).limit(self._queue.maxsize)
+            ).scalars().all()
+        finally:
+            db.close()
+
+        enqueued = 0
+        for job_id in job_ids:
+            try:
+                self._queue.put_nowait(job_id)
+                enqueued += 1
+            except queue.Full:
+                break
+        return enqueued
+
+    def _claim(self, db: Session, job_id: str) -> Optional[int]:
+        """Atomically move a job to running and return its attempt number.
+
+        None when another worker owns the job, or when it already used up
+        max_attempts (it is then marked failed instead of being run again).
+        """
+        now = datetime.utcnow()
+        claimable = and_(
+            BackgroundJob.id == job_id,
+            or_(
+                BackgroundJob.status == 'queued',
+                and_(BackgroundJob.status == 'running', BackgroundJob.lease_expires_at < now),
+            ),
+        )
+        exhausted = db.execute(
+            update(BackgroundJob)
+            .where(claimable, BackgroundJob.attempts >= self.max_attempts)
+            .values(
+                status='failed',
+                error=f"Gave up after {self.max_attempts} attempts that did not finish",
+                finished_at=now,
+                lease_expires_at=None,
+            )
+        )
+        if exhausted.rowcount == 1:
+            db.commit()
+            return None
+        result = db.execute(
+            update(BackgroundJob)
+            .where(claimable, BackgroundJob.attempts < self.max_attempts)
+            .values(
+                status='running',
+                started_at=now,
+                lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                attempts=BackgroundJob.attempts + 1,
+            )
+        )
+        db.commit()
+        if result.rowcount != 1:
+            return None
+        return db.execute(select(BackgroundJob.attempts).where(BackgroundJob.id == job_id)).scalar_one()
+
+    def _finish_statement(self, job_id: str, attempt: int, status: str, result: Any = None, error: Optional[str] = None):
+        """UPDATE recording the outcome; matches nothing once another worker re-claimed the job"""
+        return (
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == 'running',
+                BackgroundJob.attempts == attempt,
+            )
+            .values(
+                status=status,
+                result=json.dumps(jsonable_encoder(result)) if result is not None else None,
+                error=error,
+                finished_at=datetime.utcnow(),
+                lease_expires_at=None,
+            )
+        )
+
+    def _finish(self, job_id: str, attempt: int, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        db = self._session()
+        try:
+            db.execute(self._finish_statement(job_id, attempt, status, result, error))
+            db.commit()
+        finally:
+            db.close()
+
+    def _heartbeat(self, job_id: str, attempt: int, done: threading.Event) -> None:
+        """Extend the lease every third of its length until the handler returns"""
+        while not done.wait(self.lease_seconds / 3):
+            db = self._session()
+            try:
+                renewed = db.execute(
+                    update(BackgroundJob)
+                    .where(
+                        BackgroundJob.id == job_id,
+                        BackgroundJob.status == 'running',
+                        BackgroundJob.attempts == attempt,
+                    )
+                    .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                )
+                db.commit()
+                if renewed.rowcount != 1:
+                    return
+            except Exception as e:
+                print(f"Error renewing lease of background job {job_id}: {e}")
+            finally:
+                db.close()
+
+    def _run_atomic(self, db: Session, job_id: str, attempt: int, handler: Callable[[Session, Any], Any], payload: Any) -> None:
+        """Run the handler and record success in the same transaction.
+
+        The handler's own commits only release savepoints, so a crash before
+        the outer commit leaves nothing behind and a crash after it leaves the
+        job succeeded: the work is never applied twice by a re-claim.
+        """
+        connection = db.get_bind().connect()
+        transaction = connection.begin()
+        work_db = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
+        # Caches, indexes and notifiers must not see the work before the outer commit
+        work_db.info[DEFERRED_HOOKS_KEY] = []
+        try:
+            result = handler(work_db, payload)
+            work_db.flush()
+            recorded = connection.execute(self._finish_statement(job_id, attempt, 'succeeded', result=result))
+            if recorded.rowcount != 1:
+                # Lease lost to another worker: its attempt owns the job now
+                transaction.rollback()
+                print(f"Background job {job_id} lost its lease; discarding attempt {attempt}")
+                return
+            transaction.commit()
+            run_deferred_hooks(work_db)
+        except Exception:
+            transaction.rollback()
+            raise
+        finally:
+            work_db.close()
+            connection.close()
+
+    def _run(self, job_id: str) -> None:
+        db = self._session()
+        attempt = None
+        done = threading.Event()
+        try:
+            attempt = self._claim(db, job_id)
+            if attempt is None:
+                return
+            threading.Thread(
+                target=self._heartbeat, args=(job_id, attempt, done), name=f"job-heartbeat-{job_id}", daemon=True
+            ).start()
+            job = db.get(BackgroundJob, job_id)
+            job_type = job.job_type
+            handler = JOB_HANDLERS.get(job_type)
+            if handler is None:
+                raise ValueError(f"No handler registered for job type: {job_type}")
+            payload = json.loads(job.payload) if job.payload else None
+            # End the read so the handler's transaction is the only one open
+            db.commit()
+            if job_type in NON_ATOMIC_JOB_TYPES:
+                result = handler(db, payload)
+                self._finish(job_id, attempt, 'succeeded', result=result)
+            else:
+                self._run_atomic(db, job_id, attempt, handler, payload)
+        except Exception as e:
+            db.rollback()
+            if attempt is not None:
+                self._finish(job_id, attempt, 'failed', error=str(e))
+        finally:
+            done.set()
+            db.close()
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job_id = self._queue.get(timeout=self.recover_interval)
+            except queue.Empty:
+                # Idle: pick up jobs left in the table by full queues or other restarts
+                try:
+                    self.recover()
+                except Exception as e:
+                    print(f"Error recovering background jobs: {e}")
+                continue
+            if job_id is None:
+                break
+            try:
+                self._run(job_id)
+            except Exception as e:
+                print(f"Error running background job {job_id}: {e}")
+
+
+# Process-wide queue, started and stopped in the application lifespan
+job_queue = JobQueue(
+    workers=int(os.getenv("JOB_WORKERS", 2)),
+    max_queued=int(os.getenv("JOB_QUEUE_SIZE", 100)),
+    lease_seconds=float(os.getenv("JOB_LEASE_SECONDS", 900)),
+    recover_interval=float(os.getenv("JOB_RECOVER_INTERVAL_SECONDS", 30)),
+    max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", 3)),
+)
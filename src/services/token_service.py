@@ -0,0 +1,269 @@
+# src/services/token_service.py
+"""Signed access tokens and in-memory request authorization.
+
+/users/authenticate issues an HS256 JWT carrying the user id and group, so
+authorizing a request only needs the signature, the expiry and the
+revocation list, never the users table. Decoded principals are kept in a
+bounded LRU keyed by a digest of the token. Revocations (logout, password
+or group change, user deletion) are written to revoked_tokens and applied
+locally at once; other workers pick them up on their next periodic refresh.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from src.config.database import db_manager
+from src.models.base import RevokedToken
+from src.services.cache import TTLCache
+
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "true").lower() == "true"
+AUTH_TOKEN_SECRET = os.getenv("AUTH_TOKEN_SECRET", "")
+# Local development only: allows a random per-process key when no secret is set
+AUTH_DEV_MODE = os.getenv("AUTH_DEV_MODE", "false").lower() == "true"
+# HS256 keys shorter than the 256-bit hash output are brute-forceable offline
+AUTH_TOKEN_SECRET_MIN_LENGTH = 32
+# Values copied from examples and docs instead of generated
+AUTH_TOKEN_PLACEHOLDER_SECRETS = {
+    "changeme", "change-me", "change_me", "secret", "your-secret-key", "your_secret_key", "replace-me",
+    "change-me-to-a-long-random-secret",
+}
+AUTH_TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", 3600))
+AUTH_TOKEN_ISSUER = os.getenv("AUTH_TOKEN_ISSUER", "workorder-service")
+AUTH_TOKEN_LEEWAY_SECONDS = int(os.getenv("AUTH_TOKEN_LEEWAY_SECONDS", 30))
+AUTH_PRINCIPAL_CACHE_ENTRIES = int(os.getenv("AUTH_PRINCIPAL_CACHE_ENTRIES", 10000))
+AUTH_REVOCATION_REFRESH_SECONDS = float(os.getenv("AUTH_REVOCATION_REFRESH_SECONDS", 30))
+
+
+class InvalidTokenError(ValueError):
+    """Raised for malformed, forged, expired or revoked tokens"""
+
+
+class Principal:
+    """The authenticated caller of a request"""
+    __slots__ = ("user_id", "user_group", "token_id", "issued_at", "expires_at")
+
+    def __init__(self, user_id: str, user_group: Optional[str], token_id: str, issued_at: float, expires_at: float):
+        self.user_id = user_id
+        self.user_group = user_group
+        self.token_id = token_id
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f"<Principal(user_id='{self.user_id}', user_group='{self.user_group}')>"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TokenSigner:
+    """Issues and checks compact HS256 JWTs"""
+
+    HEADER = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def __init__(
+        self,
+        secret: str = AUTH_TOKEN_SECRET,
+        ttl_seconds: int = AUTH_TOKEN_TTL_SECONDS,
+        dev_mode: bool = AUTH_DEV_MODE
+    ):
+        if not secret:
+            if not dev_mode:
+                raise RuntimeError(
+                    "AUTH_TOKEN_SECRET is not set; configure a shared secret of at least "
+                    f"{AUTH_TOKEN_SECRET_MIN_LENGTH} characters (or AUTH_DEV_MODE=true for a random local key)"
+                )
+            print("AUTH_DEV_MODE: using a random per-process token key "
+                  "(tokens will not survive restarts or work across workers)")
+            secret = secrets.token_urlsafe(32)
+        elif secret.lstrip().startswith("#") or secret.strip().lower() in AUTH_TOKEN_PLACEHOLDER_SECRETS:
+            # An inline comment after an empty value in a .env file becomes the value
+            raise RuntimeError("AUTH_TOKEN_SECRET is a comment or placeholder; configure a random shared secret")
+        elif len(secret) < AUTH_TOKEN_SECRET_MIN_LENGTH:
+            raise RuntimeError(f"AUTH_TOKEN_SECRET must be at least {AUTH_TOKEN_SECRET_MIN_LENGTH} characters")
+        self.key = secret.encode()
+        self.ttl_seconds = ttl_seconds
+
+    def _sign(self, signing_input: str) -> str:
+        return _b64encode(hmac.new(self.key, signing_input.encode(), hashlib.sha256).digest())
+
+    def issue(self, user_id: str, user_group: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        now = time.time()
+        claims = {
+            "iss": AUTH_TOKEN_ISSUER,
+            "sub": user_id,
+            "grp": user_group,
+            # Sub-second iat so a token issued right after a user-wide revocation stays valid
+            "iat": round(now, 3),
+            "exp": int(now) + self.ttl_seconds,
+            "jti": secrets.token_hex(16),
+        }
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = f"{self.HEADER}.{payload}"
+        return f"{signing_input}.{self._sign(signing_input)}", claims
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError:
+            raise InvalidTokenError("Malformed token")
+        # Only our own header is accepted, which also rules out alg=none
+        if header != self.HEADER or not hmac.compare_digest(signature, self._sign(f"{header}.{payload}")):
+            raise InvalidTokenError("Invalid token signature")
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            raise InvalidTokenError("Malformed token")
+        if claims.get("iss") != AUTH_TOKEN_ISSUER or not claims.get("sub") or not claims.get("jti"):
+            raise InvalidTokenError("Invalid token claims")
+        if float(claims.get("exp", 0)) + AUTH_TOKEN_LEEWAY_SECONDS < time.time():
+            raise InvalidTokenError("Token expired")
+        return claims
+
+
+class RevocationList:
+    """Revoked token ids and per-user cut-offs, mirrored from revoked_tokens"""
+
+    def __init__(self, refresh_seconds: float = AUTH_REVOCATION_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._token_ids: Set[str] = set()
+        # user_id -> epoch ms; tokens issued at or before it are rejected
+        self._user_cutoffs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @staticmethod
+    def user_key(user_id: str) -> str:
+        return f"user:{user_id}"
+
+    def is_revoked(self, principal: Principal) -> bool:
+        if principal.token_id in self._token_ids:
+            return True
+        cutoff = self._user_cutoffs.get(principal.user_id)
+        return cutoff is not None and principal.issued_at * 1000 <= cutoff
+
+    def _apply(self, row: RevokedToken) -> None:
+        if row.token_id.startswith("user:"):
+            cutoff = self._user_cutoffs.get(row.user_id, 0)
+            self._user_cutoffs[row.user_id] = max(cutoff, row.revoked_at)
+        else:
+            self._token_ids.add(row.token_id)
+
+    def _store(self, db: Session, row: RevokedToken) -> None:
+        db.merge(row)
+        db.commit()
+        with self._lock:
+            self._apply(row)
+
+    def revoke_token(self, db: Session, principal: Principal) -> None:
+        """Revoke one token (logout) until it would have expired anyway"""
+        self._store(db, RevokedToken(
+            token_id=principal.token_id,
+            user_id=principal.user_id,
+            revoked_at=int(time.time() * 1000),
+            expires_at=int(principal.expires_at * 1000),
+        ))
+
+    def revoke_user(self, db: Session, user_id: str) -> None:
+        """Revoke every token issued to a user so far (password/group change, deletion)"""
+        now = time.time()
+        self._store(db, RevokedToken(
+            token_id=self.user_key(user_id),
+            user_id=user_id,
+            revoked_at=int(now * 1000),
+            expires_at=int((now + AUTH_TOKEN_TTL_SECONDS + AUTH_TOKEN_LEEWAY_SECONDS) * 1000),
+        ))
+
+    def refresh(self, db: Session) -> int:
+        """Reload unexpired revocations and drop expired rows; returns the number loaded"""
+        now_ms = int(time.time() * 1000)
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now_ms))
+        db.commit()
+        rows = db.execute(select(RevokedToken).where(RevokedToken.expires_at >= now_ms)).scalars().all()
+        token_ids: Set[str] = set()
+        user_cutoffs: Dict[str, int] = {}
+        for row in rows:
+            if row.token_id.startswith("user:"):
+                user_cutoffs[row.user_id] = max(user_cutoffs.get(row.user_id, 0), row.revoked_at)
+            else:
+                token_ids.add(row.token_id)
+        with self._lock:
+            self._token_ids = token_ids
+            self._user_cutoffs = user_cutoffs
+        return len(rows)
+
+    def _refresh_now(self) -> None:
+        db = db_manager.SessionLocal()
+        try:
+            self.refresh(db)
+        except Exception as e:
+            print(f"Error refreshing token revocations: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.refresh_seconds):
+            self._refresh_now()
+
+    def start(self) -> None:
+        """Load revocations now, then refresh them in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._refresh_now()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="token-revocations", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+class TokenAuthenticator:
+    """Resolves bearer tokens to principals without touching the database"""
+
+    def __init__(self, signer: TokenSigner, revocations: RevocationList):
+        self.signer = signer
+        self.revocations = revocations
+        self.principals = TTLCache(ttl_seconds=AUTH_TOKEN_TTL_SECONDS, max_entries=AUTH_PRINCIPAL_CACHE_ENTRIES)
+
+    def authenticate(self, token: str) -> Principal:
+        cache_key = hashlib.sha256(token.encode()).digest()
+        principal = self.principals.get(cache_key)
+        if principal is None:
+            claims = self.signer.decode(token)
+            principal = Principal(
+                user_id=claims["sub"],
+                user_group=claims.get("grp"),
+                token_id=claims["jti"],
+                issued_at=float(claims["iat"]),
+                expires_at=float(claims["exp"]),
+            )
+            self.principals.set(cache_key, principal, ttl_seconds=max(1.0, principal.expires_at - time.time()))
+        elif principal.expires_at + AUTH_TOKEN_LEEWAY_SECONDS < time.time():
+            self.principals.delete(cache_key)
+            raise InvalidTokenError("Token expired")
+        # Checked on every request so revocations apply to cached principals too
+        if self.revocations.is_revoked(principal):
+            raise InvalidTokenError("Token revoked")
+        return principal
+
+
+token_signer = TokenSigner()
+revocation_list = RevocationList()
+token_authenticator = TokenAuthenticator(token_signer, revocation_list)
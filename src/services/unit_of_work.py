@@ -0,0 +1,229 @@
+# src/services/unit_of_work.py
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+from fastapi import HTTPException
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Native error codes that mean "run the transaction again", per dialect
+MSSQL_TRANSIENT = {1205: "deadlock", 1222: "lock_timeout", 3960: "serialization"}
+MYSQL_TRANSIENT = {1213: "deadlock", 1205: "lock_timeout"}
+POSTGRES_TRANSIENT = {"40001": "serialization", "40P01": "deadlock", "55P03": "lock_timeout"}
+ORACLE_TRANSIENT = {60: "deadlock", 8177: "serialization", 30006: "lock_timeout"}
+
+_MSSQL_NATIVE_CODE = re.compile(r"\((\d{3,5})\)")
+
+
+def classify_transient_error(error: BaseException, dialect_name: str) -> Optional[str]:
+    """Return why a database error is worth retrying (deadlock, lock_timeout,
+    serialization, disconnect) or None when it is not transient"""
+    if not isinstance(error, DBAPIError):
+        return None
+    if error.connection_invalidated:
+        return "disconnect"
+    orig = error.orig
+    if dialect_name == "mssql":
+        # pyodbc: ('40001', '[40001] [Microsoft]...deadlocked ... (1205) ...')
+        for code in _MSSQL_NATIVE_CODE.findall(" ".join(str(arg) for arg in getattr(orig, "args", ()))):
+            if int(code) in MSSQL_TRANSIENT:
+                return MSSQL_TRANSIENT[int(code)]
+        return None
+    if dialect_name == "mysql":
+        args = getattr(orig, "args", ())
+        return MYSQL_TRANSIENT.get(args[0]) if args and isinstance(args[0], int) else None
+    if dialect_name == "postgresql":
+        return POSTGRES_TRANSIENT.get(getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None))
+    if dialect_name == "oracle":
+        args = getattr(orig, "args", ())
+        code = getattr(args[0], "code", None) if args else None
+        return ORACLE_TRANSIENT.get(code)
+    if dialect_name == "sqlite" and "database is locked" in str(orig):
+        return "lock_timeout"
+    return None
+
+
+# Session.info key holding hooks to run once the enclosing transaction commits
+DEFERRED_HOOKS_KEY = "deferred_after_commit"
+
+
+def after_commit(db: Session, hook: Callable[[], Any]) -> None:
+    """Run a cache/index/notifier hook after a committed write.
+
+    When the session's commits only release savepoints (atomic background
+    jobs), the hook waits for the outer commit and is dropped on rollback.
+    """
+    deferred = db.info.get(DEFERRED_HOOKS_KEY)
+    if deferred is None:
+        hook()
+    else:
+        deferred.append(hook)
+
+
+def run_deferred_hooks(db: Session) -> None:
+    """Run the hooks deferred on a session, after its outer transaction committed"""
+    for hook in db.info.pop(DEFERRED_HOOKS_KEY, None) or []:
+        try:
+            hook()
+        except Exception as e:
+            print(f"Error running after-commit hook: {e}")
+
+
+class RetryBudget:
+    """Token bucket capping retries to a share of recent units of work.
+
+    Every unit deposits `ratio` tokens and every retry spends one, with a
+    small floor refill so low-traffic periods can still retry. Under a storm
+    of conflicts this stops retries from multiplying load on the database.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, capacity: float = 20.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class UnitOfWorkMetrics:
+    """Counters for how often units of work are retried and why"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.units = 0
+        self.committed = 0
+        self.retried_units = 0
+        self.retries: Dict[str, int] = {}
+        self.exhausted = 0
+        self.budget_denied = 0
+
+    def record(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def record_retry(self, reason: str, first: bool) -> None:
+        with self._lock:
+            self.retries[reason] = self.retries.get(reason, 0) + 1
+            if first:
+                self.retried_units += 1
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "units": self.units,
+                "committed": self.committed,
+                "retried_units": self.retried_units,
+                "retry_rate": round(self.retried_units / self.units, 4) if self.units else None,
+                "retries_by_reason": dict(self.retries),
+                "exhausted": self.exhausted,
+                "budget_denied": self.budget_denied,
+            }
+
+
+unit_of_work_metrics = UnitOfWorkMetrics()
+
+
+class UnitOfWork:
+    """Runs a multi-statement transaction and retries it as a whole on transient errors.
+
+    The work callable does its reads and writes on the session without
+    committing; the unit commits and, on a deadlock, lock timeout,
+    serialization failure or dropped connection, rolls back, backs off with
+    full jitter and runs the callable again. A commit that fails because the
+    connection dropped is not retried: the outcome is unknown.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        budget: Optional[RetryBudget] = None,
+        metrics: UnitOfWorkMetrics = unit_of_work_metrics
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.metrics = metrics
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def run(self, db: Session, work: Callable[[], T]) -> T:
+        """Run work() and commit, retrying the whole unit on transient errors"""
+        dialect_name = db.get_bind().dialect.name
+        self.metrics.record(units=1)
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            committing = False
+            try:
+                result = work()
+                committing = True
+                db.commit()
+                self.metrics.record(committed=1)
+                return result
+            except DBAPIError as error:
+                db.rollback()
+                reason = classify_transient_error(error, dialect_name)
+                if reason is None or (committing and reason == "disconnect"):
+                    raise
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    self.metrics.record(exhausted=1)
+                    raise self._unavailable(reason)
+                if not self.budget.withdraw():
+                    self.metrics.record(budget_denied=1)
+                    raise self._unavailable(reason)
+                self.metrics.record_retry(reason, first=attempt == 1)
+                print(f"Retrying unit of work after {reason} (attempt {attempt + 1}/{self.max_attempts})")
+                time.sleep(self.backoff(attempt))
+            except Exception:
+                db.rollback()
+                raise
+
+    @staticmethod
+    def _unavailable(reason: str) -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail=f"Database conflict ({reason}), please retry",
+            headers={"Retry-After": "1"}
+        )
+
+
+# Process-wide unit of work configured from the environment
+unit_of_work = UnitOfWork(
+    max_attempts=int(os.getenv("UOW_MAX_ATTEMPTS", 3)),
+    base_delay=float(os.getenv("UOW_BASE_DELAY_SECONDS", 0.05)),
+    max_delay=float(os.getenv("UOW_MAX_DELAY_SECONDS", 1.0)),
+    budget=RetryBudget(ratio=float(os.getenv("UOW_RETRY_BUDGET_RATIO", 0.2))),
+)
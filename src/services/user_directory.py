@@ -0,0 +1,212 @@
+# src/services/user_directory.py
+import os
+import re
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.models.base import User
+
+# Grams used for infix matches; shorter search terms match word prefixes only
+GRAM_SIZE = 3
+WORD_SEPARATORS = re.compile(r"[\s._@/-]+")
+
+
+class DirectoryEntry:
+    """Indexed fields of one user (never the password)"""
+    __slots__ = ("user_id", "name", "user_group", "folded", "words")
+
+    def __init__(self, user_id: str, name: Optional[str], user_group: Optional[str]):
+        self.user_id = user_id
+        self.name = name
+        self.user_group = user_group
+        self.folded = (user_id.casefold(), (name or "").casefold(), (user_group or "").casefold())
+        self.words = {word for field in self.folded for word in WORD_SEPARATORS.split(field) if word}
+
+    def terms(self) -> Set[str]:
+        """Strings whose prefixes find this entry: each whole field and each word in it"""
+        return {field for field in self.folded if field} | self.words
+
+    def grams(self) -> Set[str]:
+        return {
+            field[i:i + GRAM_SIZE]
+            for field in self.folded
+            for i in range(len(field) - GRAM_SIZE + 1)
+        }
+
+    def rank(self, folded: str) -> int:
+        """Lower is better: exact id, id prefix, name prefix, word prefix, group prefix, infix"""
+        user_id, name, user_group = self.folded
+        if user_id == folded:
+            return 0
+        if user_id.startswith(folded):
+            return 1
+        if name.startswith(folded):
+            return 2
+        if any(word.startswith(folded) for word in self.words):
+            return 3
+        if user_group.startswith(folded):
+            return 4
+        return 5
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"UserID": self.user_id, "Name": self.name, "UserGroup": self.user_group}
+
+
+class UserDirectory:
+    """In-memory prefix and n-gram index over user ids, names and groups"""
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self._entries: Dict[str, DirectoryEntry] = {}
+        # Sorted (term, user_id) pairs for prefix lookups with bisect
+        self._terms: List[Tuple[str, str]] = []
+        self._grams: Dict[str, Set[str]] = {}
+        self.warmed_at: Optional[float] = None
+        self._invalidated = False
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        # Writes committed while a reload is reading (user_id, entry or None), replayed after the swap
+        self._pending: Optional[List[Tuple[str, Optional[DirectoryEntry]]]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed_at is not None
+
+    def is_stale(self) -> bool:
+        """True before the first warm-up, after invalidate(), or when the periodic reload is due"""
+        if self.warmed_at is None or self._invalidated:
+            return True
+        return self.refresh_seconds > 0 and time.monotonic() - self.warmed_at > self.refresh_seconds
+
+    def invalidate(self) -> None:
+        """Reload on the next search; the current directory is served until then"""
+        self._invalidated = True
+
+    def warm(self, db: Session) -> None:
+        """(Re)load every user from the database"""
+        with self._lock:
+            self._pending = []
+            self._invalidated = False
+        try:
+            rows = db.execute(select(User.UserID, User.Name, User.UserGroup)).all()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        entries = {row.UserID: DirectoryEntry(row.UserID, row.Name, row.UserGroup) for row in rows}
+        terms: List[Tuple[str, str]] = []
+        grams: Dict[str, Set[str]] = {}
+        for user_id, entry in entries.items():
+            terms.extend((term, user_id) for term in entry.terms())
+            for gram in entry.grams():
+                grams.setdefault(gram, set()).add(user_id)
+        terms.sort()
+        with self._lock:
+            self._entries, self._terms, self._grams = entries, terms, grams
+            # Replaying is idempotent: a write the reads already saw is simply applied again
+            for user_id, entry in self._pending:
+                self._remove(user_id)
+                if entry is not None:
+                    self._put(entry)
+            self._pending = None
+            self.warmed_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Reload when stale, one request at a time; others keep searching the current directory"""
+        if not self.is_stale():
+            return
+        # Only the very first load makes callers wait
+        if not self._refresh_lock.acquire(blocking=not self.ready):
+            return
+        try:
+            if self.is_stale():
+                self.warm(db)
+        finally:
+            self._refresh_lock.release()
+
+    def _remove(self, user_id: str) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        for term in entry.terms():
+            position = bisect_left(self._terms, (term, user_id))
+            if position < len(self._terms) and self._terms[position] == (term, user_id):
+                del self._terms[position]
+        for gram in entry.grams():
+            user_ids = self._grams.get(gram)
+            if user_ids is not None:
+                user_ids.discard(user_id)
+                if not user_ids:
+                    del self._grams[gram]
+
+    def _put(self, entry: DirectoryEntry) -> None:
+        self._entries[entry.user_id] = entry
+        for term in entry.terms():
+            insort(self._terms, (term, entry.user_id))
+        for gram in entry.grams():
+            self._grams.setdefault(gram, set()).add(entry.user_id)
+
+    def upsert(self, user: User) -> None:
+        """Apply a committed create or update"""
+        entry = DirectoryEntry(user.UserID, user.Name, user.UserGroup)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((entry.user_id, entry))
+            if self.ready:
+                self._remove(entry.user_id)
+                self._put(entry)
+
+    def remove(self, user_id: str) -> None:
+        """Apply a committed delete"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((user_id, None))
+            if self.ready:
+                self._remove(user_id)
+
+    def _candidates(self, folded: str) -> Set[str]:
+        if len(folded) < GRAM_SIZE:
+            matches = set()
+            position = bisect_left(self._terms, (folded,))
+            while position < len(self._terms) and self._terms[position][0].startswith(folded):
+                matches.add(self._terms[position][1])
+                position += 1
+            return matches
+        gram_sets = [self._grams.get(folded[i:i + GRAM_SIZE], set()) for i in range(len(folded) - GRAM_SIZE + 1)]
+        gram_sets.sort(key=len)
+        matches = set(gram_sets[0]).intersection(*gram_sets[1:])
+        # Grams only narrow the set down; confirm the term really occurs
+        return {
+            user_id for user_id in matches
+            if any(folded in field for field in self._entries[user_id].folded)
+        }
+
+    def search(self, term: str, skip: int = 0, limit: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        """Ranked page of users matching term, plus the total number of matches.
+
+        Ties are broken by UserID, so the order is total and pages never
+        overlap or skip users.
+        """
+        folded = term.strip().casefold()
+        with self._lock:
+            if folded:
+                entries = [self._entries[user_id] for user_id in self._candidates(folded)]
+            else:
+                entries = list(self._entries.values())
+            page = heapq.nsmallest(
+                skip + limit, entries, key=lambda entry: (entry.rank(folded), entry.folded[0], entry.user_id)
+            )[skip:]
+            return [entry.as_dict() for entry in page], len(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide directory, warmed in the application lifespan
+user_directory = UserDirectory(
+    refresh_seconds=float(os.getenv("USER_DIRECTORY_REFRESH_SECONDS", 300))
+)
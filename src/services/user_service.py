@@ -1,6 +1,11 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from src.models.base import User
+from src.services.credential_service import password_hasher, credential_verifier, login_rate_limiter
+from src.services.token_service import Principal, revocation_list
+from src.services.user_directory import user_directory
 
 class UserService:
     """User service layer"""
@@ -18,13 +23,14 @@ class UserService:
         user = User(
             UserID=user_data.get("UserID"),
             Name=user_data.get("Name"),
-            Password=user_data.get("Password"),
+            Password=password_hasher.hash(user_data["Password"]) if user_data.get("Password") else None,
             UserGroup=user_data.get("UserGroup")
         )
         
         self.db.add(user)
         self.db.commit()
         self.db.refresh(user)
+        user_directory.upsert(user)
         return user
     
     def get_user(self, user_id: str) -> Optional[User]:  # Changed to string
@@ -49,13 +55,23 @@ class UserService:
         if not user:
             return None
         
+        # Tokens carry the group and were issued against the old password
+        revoke_tokens = "Password" in user_data or (
+            "UserGroup" in user_data and user_data["UserGroup"] != user.UserGroup
+        )
+        if user_data.get("Password"):
+            user_data = {**user_data, "Password": password_hasher.hash(user_data["Password"])}
+        
         # Update fields
         for key, value in user_data.items():
             if hasattr(user, key):
                 setattr(user, key, value)
         
         self.db.commit()
+        if revoke_tokens:
+            revocation_list.revoke_user(self.db, user_id)
         self.db.refresh(user)
+        user_directory.upsert(user)
         return user
     
     def delete_user(self, user_id: str) -> bool:  # Changed to string
@@ -66,23 +82,52 @@ class UserService:
         
         self.db.delete(user)
         self.db.commit()
+        user_directory.remove(user_id)
+        revocation_list.revoke_user(self.db, user_id)
         return True
     
-    def search_users(self, search_term: str, skip: int = 0, limit: int = 100) -> List[User]:
-        """Search users by Name or UserID"""
-        query = self.db.query(User)
-        
-        # Search in Name or UserID fields
-        query = query.filter(
-            (User.Name.ilike(f"%{search_term}%")) | 
-            (User.UserID.ilike(f"%{search_term}%"))
+    def revoke_token(self, principal: Principal) -> None:
+        """Revoke a single access token (logout)"""
+        revocation_list.revoke_token(self.db, principal)
+    
+    def search_users(self, search_term: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Search users by UserID, Name or UserGroup (ranked, from the in-memory directory)"""
+        user_directory.ensure_fresh(self.db)
+        users, _ = user_directory.search(search_term, skip, limit)
+        return users
+    
+    def _credentials(self, UserID: str) -> Tuple[Optional[str], Optional[str]]:
+        """(stored hash, group) only (primary key lookup, no full row)"""
+        row = self.db.execute(
+            select(User.Password, User.UserGroup).where(User.UserID == UserID)
+        ).first()
+        return (row.Password, row.UserGroup) if row else (None, None)
+    
+    def _replace_password_hash(self, UserID: str, old_hash: str, new_hash: str) -> None:
+        """Store a rehashed password unless it was changed in the meantime"""
+        self.db.execute(
+            update(User).where(User.UserID == UserID, User.Password == old_hash).values(Password=new_hash)
         )
-        
-        return query.offset(skip).limit(limit).all()
+        self.db.commit()
     
-    def authenticate_user(self, UserID: str, password: str) -> Optional[User]:
-        """Authenticate user"""
-        user = self.db.query(User).filter(User.UserID == UserID).first()
-        if user and user.Password == password:  # Note: your field is Password, not hashed_password
-            return user
-        return None
\ No newline at end of file
+    async def authenticate_user(
+        self, UserID: str, password: str, client_ip: str = "unknown"
+    ) -> Optional[Dict[str, Any]]:
+        """Authenticate user; returns {"UserID", "UserGroup"} on success.
+        
+        Raises 429 when the user or client IP is over its login rate limit.
+        Database calls go to the request threadpool and hashing to the
+        credential pool, so the event loop never waits on either.
+        """
+        login_rate_limiter.check(UserID, client_ip)
+        stored, user_group = await run_in_threadpool(self._credentials, UserID)
+        matches, needs_rehash = await credential_verifier.verify(UserID, password, stored)
+        if not matches:
+            login_rate_limiter.record_failure(UserID)
+            return None
+        login_rate_limiter.record_success(UserID)
+        if needs_rehash:
+            # Outdated parameters or legacy plaintext: upgrade while we have the password
+            new_hash = await credential_verifier.hash(password)
+            await run_in_threadpool(self._replace_password_hash, UserID, stored, new_hash)
+        return {"UserID": UserID, "UserGroup": user_group}
\ No newline at end of file
@@ -0,0 +1,79 @@
+# src/services/work_order_jobs.py
+from typing import Any, Dict, List
+from sqlalchemy.orm import Session
+from src.schemas.work_orders_schema import WorkOrdersCreate, WorkOrdersCreateRequest, WorkOrdersBulkFilter
+from src.services.archive_service import ArchiveService
+from src.services.job_service import register_job_handler
+from src.services.work_orders_service import WorkOrdersService
+
+# Job types for long-running work order operations
+BULK_CREATE_JOB = "work_orders.bulk_create"
+BULK_DELETE_JOB = "work_orders.bulk_delete"
+BULK_UPDATE_JOB = "work_orders.bulk_update"
+COMPLEX_CREATE_JOB = "work_orders.complex_create"
+ARCHIVE_JOB = "work_orders.archive"
+PURGE_JOB = "work_orders.purge"
+
+
+def _bulk_filter(criteria: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-parse a stored bulk filter (dates come back from JSON as strings)"""
+    return WorkOrdersBulkFilter(**criteria).model_dump(exclude_none=True)
+
+
+@register_job_handler(BULK_CREATE_JOB)
+def run_bulk_create(db: Session, payload: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create many simple work orders"""
+    created = WorkOrdersService(db).bulk_create_work_orders(
+        [WorkOrdersCreate(**item) for item in payload]
+    )
+    return {
+        "created_count": len(created),
+        "work_orders": [
+            {"work_order_id": work_orders.id, "document_number": work_orders.document_number}
+            for work_orders in created
+        ],
+    }
+
+
+@register_job_handler(BULK_DELETE_JOB, atomic=False)
+def run_bulk_delete(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Soft-delete many work orders by ids and/or filter"""
+    criteria = _bulk_filter(payload["filter"]) if payload.get("filter") else None
+    return WorkOrdersService(db).bulk_delete_work_orders(payload.get("ids"), criteria)
+
+
+@register_job_handler(BULK_UPDATE_JOB, atomic=False)
+def run_bulk_update(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the same fields on many work orders"""
+    return WorkOrdersService(db).bulk_update_work_orders(_bulk_filter(payload["filter"]), payload["set"])
+
+
+@register_job_handler(COMPLEX_CREATE_JOB)
+def run_complex_create(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a work order with a large complex payload"""
+    result = WorkOrdersService(db).create_work_order_from_request(WorkOrdersCreateRequest(**payload))
+    return {
+        "message": "Work order created successfully",
+        "work_order_id": result["work_order"].id,
+        "document_number": result["work_order"].document_number,
+        "work_items_count": result["work_items_count"],
+        "total_cost": result["total_cost"]
+    }
+
+
+@register_job_handler(ARCHIVE_JOB, atomic=False)
+def run_archive(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Move work orders closed before the horizon to the archive tables"""
+    return ArchiveService(db).run(
+        horizon_days=payload.get("horizon_days"),
+        batch_size=payload.get("batch_size"),
+    )
+
+
+@register_job_handler(PURGE_JOB, atomic=False)
+def run_purge(db: Session, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Physically delete work orders soft-deleted before the retention window"""
+    service = WorkOrdersService(db)
+    if payload.get("retention_days") is not None:
+        return service.purge_deleted_work_orders(retention_days=payload["retention_days"])
+    return service.purge_deleted_work_orders()
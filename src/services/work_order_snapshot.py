@@ -0,0 +1,320 @@
+# src/services/work_order_snapshot.py
+"""Optional in-process columnar snapshot of work_orders for dashboard aggregates.
+
+Columns live in compact array.array buffers. Low-cardinality text columns are
+dictionary-encoded into integer codes. When NumPy is installed, filters and
+group-bys run vectorized over zero-copy views of those buffers. Without it,
+the same queries run as a plain Python scan.
+
+The snapshot is built once, then kept current by replaying the
+work_order_changes feed. Only the changed rows are re-read from the database.
+"""
+import math
+import os
+import threading
+import time
+from array import array
+from datetime import date
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.models.base import WorkOrders
+from src.repositories.work_order_changes_repository import WorkOrderChangesRepository
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+WORK_ORDER_SNAPSHOT_ENABLED = os.getenv("WORK_ORDER_SNAPSHOT_ENABLED", "false").lower() == "true"
+
+# Text columns stored as dictionary codes; these are also the group-by keys
+DICTIONARY_COLUMNS = ('submitted_by', 'cost_type', 'budget_status')
+
+SNAPSHOT_COLUMNS = (
+    WorkOrders.id,
+    WorkOrders.request_date,
+    WorkOrders.is_urgent,
+    WorkOrders.cost_estimation,
+    WorkOrders.remaining_budget,
+    WorkOrders.submitted_by,
+    WorkOrders.cost_type,
+    WorkOrders.budget_status,
+)
+
+
+class Dictionary:
+    """Value <-> integer code mapping for a dictionary-encoded column"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+class WorkOrderSnapshot:
+    """Columnar copy of the dashboard columns of work_orders"""
+
+    def __init__(
+        self,
+        refresh_seconds: float = 1.0,
+        rebuild_seconds: float = 3600.0,
+        settle_seconds: float = 0.5,
+        batch_size: int = 1000
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.settle_seconds = settle_seconds
+        self.batch_size = batch_size
+        self.token = 0
+        self.built_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ids = array('q')
+        self.alive = array('b')
+        self.request_day = array('q')  # date.toordinal(), 0 when missing
+        self.is_urgent = array('b')
+        self.cost = array('d')  # NaN when missing
+        self.remaining = array('d')
+        self.dictionaries = {name: Dictionary() for name in DICTIONARY_COLUMNS}
+        self.codes = {name: array('i') for name in DICTIONARY_COLUMNS}
+        self.positions: Dict[int, int] = {}
+        self.dead = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    # Loading
+
+    def _store(self, row: Any) -> None:
+        """Insert or overwrite one row (caller holds the lock)"""
+        values = (
+            row.request_date.toordinal() if row.request_date else 0,
+            1 if row.is_urgent else 0,
+            float(row.cost_estimation) if row.cost_estimation is not None else math.nan,
+            float(row.remaining_budget) if row.remaining_budget is not None else math.nan,
+        )
+        codes = [self.dictionaries[name].encode(getattr(row, name)) for name in DICTIONARY_COLUMNS]
+
+        position = self.positions.get(row.id)
+        if position is None:
+            self.positions[row.id] = len(self.ids)
+            self.ids.append(row.id)
+            self.alive.append(1)
+            self.request_day.append(values[0])
+            self.is_urgent.append(values[1])
+            self.cost.append(values[2])
+            self.remaining.append(values[3])
+            for name, code in zip(DICTIONARY_COLUMNS, codes):
+                self.codes[name].append(code)
+        else:
+            self.request_day[position], self.is_urgent[position] = values[0], values[1]
+            self.cost[position], self.remaining[position] = values[2], values[3]
+            for name, code in zip(DICTIONARY_COLUMNS, codes):
+                self.codes[name][position] = code
+
+    def _remove(self, work_order_id: int) -> None:
+        position = self.positions.pop(work_order_id, None)
+        if position is not None:
+            self.alive[position] = 0
+            self.dead += 1
+
+    def rebuild(self, db: Session) -> None:
+        """Load every row; also compacts rows deleted since the last build"""
+        # Take the token first: changes after it are replayed on the next refresh
+        token = WorkOrderChangesRepository(db).latest_token(settle_seconds=self.settle_seconds)
+        result = db.connection().execute(
+            select(*SNAPSHOT_COLUMNS).where(WorkOrders.deleted_at.is_(None)).order_by(WorkOrders.id)
+        ).all()
+        with self._lock:
+            self._reset()
+            for row in result:
+                self._store(row)
+            self.token = token
+            self.built_at = self.refreshed_at = time.monotonic()
+
+    def refresh(self, db: Session) -> int:
+        """Apply changes from the change feed since the last build or refresh"""
+        changes_repository = WorkOrderChangesRepository(db)
+        applied = 0
+        while True:
+            changes = changes_repository.get_since(
+                self.token, limit=self.batch_size, settle_seconds=self.settle_seconds
+            )
+            if not changes:
+                break
+            changed_ids = {change.work_order_id for change in changes}
+            rows = db.connection().execute(
+                select(*SNAPSHOT_COLUMNS).where(WorkOrders.id.in_(changed_ids), WorkOrders.deleted_at.is_(None))
+            ).all()
+            with self._lock:
+                for row in rows:
+                    self._store(row)
+                for work_order_id in changed_ids - {row.id for row in rows}:
+                    self._remove(work_order_id)
+                self.token = changes[-1].id
+            applied += len(changes)
+            if len(changes) < self.batch_size:
+                break
+        self.refreshed_at = time.monotonic()
+        return applied
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Build on first use, rebuild periodically or when mostly tombstones, otherwise replay changes"""
+        # One refresher at a time; other requests keep reading the current data
+        if not self._refresh_lock.acquire(blocking=not self.ready):
+            return
+        try:
+            now = time.monotonic()
+            if (
+                not self.ready
+                or now - self.built_at > self.rebuild_seconds
+                or self.dead > max(1000, len(self.positions))
+            ):
+                self.rebuild(db)
+            elif now - self.refreshed_at > self.refresh_seconds:
+                self.refresh(db)
+        finally:
+            self._refresh_lock.release()
+
+    # Querying
+
+    def summarize(
+        self,
+        group_by: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        is_urgent: Optional[bool] = None,
+        over_budget: Optional[bool] = None,
+        equals: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Count and total cost estimation of matching orders, optionally per group.
+
+        over_budget means cost_estimation exceeds remaining_budget; equals
+        filters dictionary columns by exact value.
+        """
+        if group_by is not None and group_by not in DICTIONARY_COLUMNS:
+            raise ValueError(f"Unsupported group_by: {group_by}. Allowed: {', '.join(DICTIONARY_COLUMNS)}")
+        for name in equals or {}:
+            if name not in DICTIONARY_COLUMNS:
+                raise ValueError(f"Unsupported filter column: {name}")
+
+        with self._lock:
+            wanted = {}
+            for name, value in (equals or {}).items():
+                code = self.dictionaries[name].code_of(value)
+                if code is None:
+                    return self._result(group_by, [], 0, 0.0)
+                wanted[name] = code
+            start = start_date.toordinal() if start_date else None
+            end = end_date.toordinal() if end_date else None
+            scan = self._scan_numpy if np is not None else self._scan_python
+            groups, count, total = scan(group_by, start, end, is_urgent, over_budget, wanted)
+            labels = self.dictionaries[group_by].values if group_by else []
+            rows = [
+                {"key": labels[code] if code >= 0 else None, "count": group_count, "total_cost": round(group_total, 2)}
+                for code, (group_count, group_total) in groups.items()
+                if group_count
+            ]
+        rows.sort(key=lambda item: (-item["count"], item["key"] or ""))
+        return self._result(group_by, rows, count, total)
+
+    def _result(self, group_by, groups, count, total) -> Dict[str, Any]:
+        return {
+            "group_by": group_by,
+            "count": count,
+            "total_cost": round(total, 2),
+            "groups": groups if group_by else None,
+            "rows_in_snapshot": len(self.positions),
+            "token": self.token,
+        }
+
+    def _scan_numpy(self, group_by, start, end, is_urgent, over_budget, wanted):
+        size = len(self.ids)
+        if size == 0:
+            return {}, 0, 0.0
+        mask = np.frombuffer(self.alive, dtype=np.int8) == 1
+        day = np.frombuffer(self.request_day, dtype=np.int64)
+        if start is not None:
+            mask &= day >= start
+        if end is not None:
+            mask &= (day <= end) & (day > 0)
+        if is_urgent is not None:
+            mask &= np.frombuffer(self.is_urgent, dtype=np.int8) == (1 if is_urgent else 0)
+        cost = np.frombuffer(self.cost, dtype=np.float64)
+        if over_budget is not None:
+            over = cost > np.frombuffer(self.remaining, dtype=np.float64)
+            mask &= over if over_budget else ~over
+        for name, code in wanted.items():
+            mask &= np.frombuffer(self.codes[name], dtype=np.int32) == code
+
+        weights = np.nan_to_num(cost[mask])
+        count, total = int(mask.sum()), float(weights.sum())
+        if not group_by:
+            return {}, count, total
+        # Shift codes by one so the "missing" code -1 lands in bucket 0
+        keys = np.frombuffer(self.codes[group_by], dtype=np.int32)[mask] + 1
+        buckets = len(self.dictionaries[group_by].values) + 1
+        counts = np.bincount(keys, minlength=buckets)
+        totals = np.bincount(keys, weights=weights, minlength=buckets)
+        return {
+            code - 1: (int(counts[code]), float(totals[code]))
+            for code in np.flatnonzero(counts).tolist()
+        }, count, total
+
+    def _scan_python(self, group_by, start, end, is_urgent, over_budget, wanted):
+        groups: Dict[int, List[float]] = {}
+        count, total = 0, 0.0
+        urgent_flag = None if is_urgent is None else (1 if is_urgent else 0)
+        key_codes = self.codes[group_by] if group_by else None
+        wanted_columns = [(self.codes[name], code) for name, code in wanted.items()]
+        for position in range(len(self.ids)):
+            if not self.alive[position]:
+                continue
+            day = self.request_day[position]
+            if start is not None and day < start:
+                continue
+            if end is not None and (day > end or day == 0):
+                continue
+            if urgent_flag is not None and self.is_urgent[position] != urgent_flag:
+                continue
+            cost = self.cost[position]
+            if over_budget is not None and (cost > self.remaining[position]) != over_budget:
+                continue
+            if any(codes[position] != code for codes, code in wanted_columns):
+                continue
+            value = 0.0 if math.isnan(cost) else cost
+            count += 1
+            total += value
+            if key_codes is not None:
+                group = groups.setdefault(key_codes[position], [0, 0.0])
+                group[0] += 1
+                group[1] += value
+        return {code: (group[0], group[1]) for code, group in groups.items()}, count, total
+
+
+# Process-wide snapshot, used only when WORK_ORDER_SNAPSHOT_ENABLED=true
+work_order_snapshot = WorkOrderSnapshot(
+    refresh_seconds=float(os.getenv("WORK_ORDER_SNAPSHOT_REFRESH_SECONDS", 1.0)),
+    rebuild_seconds=float(os.getenv("WORK_ORDER_SNAPSHOT_REBUILD_SECONDS", 3600)),
+    settle_seconds=float(os.getenv("CHANGE_FEED_SETTLE_SECONDS", 0.5)),
+)
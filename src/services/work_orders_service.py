@@ -1,11 +1,47 @@
 # src/services/work_orders_service.py
-from typing import List, Optional, Dict, Any
+import os
+from typing import List, Optional, Dict, Any, Sequence
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from src.models.base import WorkOrders, WorkOrderItems, WorkOrderVendors, SupportingDocuments
+from src.models.base import (
+    WorkOrders, WorkOrderItems, WorkOrderVendors, SupportingDocuments, WorkOrderAuthorizations,
+    DELETED_DOCUMENT_NUMBER_PREFIX
+)
 from src.schemas.work_orders_schema import WorkOrdersCreate, WorkOrdersUpdate, WorkOrdersCreateRequest
+from src.services.count_service import WorkOrdersCountService, count_cache
+from src.services.facet_service import invalidate_facets
+from src.services.autocomplete_index import autocomplete_index, WORK_ORDER_FIELDS
+from src.services.document_number_service import document_number_allocator, ALWAYS_ALLOCATE_DOCUMENT_NUMBERS
+from src.services.change_feed_service import change_notifier
+from src.services.unit_of_work import unit_of_work, after_commit
+from src.services.attachment_service import AttachmentService
+from src.services.work_order_snapshot import work_order_snapshot, WORK_ORDER_SNAPSHOT_ENABLED, DICTIONARY_COLUMNS
+from src.repositories.work_order_archive_repository import WorkOrderArchiveRepository
+from src.repositories.work_order_changes_repository import WorkOrderChangesRepository
+from src.repositories.work_orders_repository import WorkOrdersRepository
+from src.repositories import statements
 from fastapi import HTTPException
-from sqlalchemy.orm import joinedload
-from datetime import datetime
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy import func, select
+from datetime import datetime, date, timedelta
+
+
+# Maintained by the database; client-sent values are ignored
+SERVER_MANAGED_FIELDS = {'created_at', 'updated_at'}
+
+# Date columns accepted as ISO strings by the simple create/upsert schema
+DATE_FIELDS = ('request_date', 'start_date', 'end_date')
+
+# Orders touched per transaction by bulk update/delete
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 1000))
+
+# Soft-deleted orders are physically removed by the purge job after this long
+SOFT_DELETE_RETENTION_DAYS = float(os.getenv("SOFT_DELETE_RETENTION_DAYS", 30))
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", 500))
+PURGE_MAX_BATCHES = int(os.getenv("PURGE_MAX_BATCHES", 200))
+
+# Margin below the commit watermark for incremental sync pulls
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", 1.0))
 
 
 class WorkOrdersService:
@@ -13,56 +49,141 @@ class WorkOrdersService:
     
     def __init__(self, db: Session):
         self.db = db
+        self.changes = WorkOrderChangesRepository(db)
+    
+    def _after_commit(self, columns=None) -> None:
+        """Drop cached totals and facets and wake change feed waiters after a committed write"""
+        def hook() -> None:
+            count_cache.clear()
+            invalidate_facets(columns)
+            change_notifier.notify()
+        after_commit(self.db, hook)
+    
+    def _index_change(self, old=None, new=None) -> None:
+        """Apply a committed write to the autocomplete index (entries captured by the caller)"""
+        after_commit(self.db, lambda: autocomplete_index.apply_change(old=old, new=new))
+    
+    def _invalidate_index(self) -> None:
+        """Rebuild the autocomplete index on its next lookup, once the write is committed"""
+        after_commit(self.db, autocomplete_index.invalidate)
+    
+    def _check_version(self, work_order: WorkOrders, expected_version: Optional[int]) -> None:
+        """Reject the write when the client edited an outdated version (If-Match)"""
+        if expected_version is not None and work_order.version_id != expected_version:
+            raise HTTPException(
+                status_code=412,
+                detail=f"Work order was modified (current version {work_order.version_id})"
+            )
+    
+    def _flush_versioned(self) -> None:
+        """Flush, turning a concurrent version bump into 412 instead of a silent overwrite"""
+        try:
+            self.db.flush()
+        except StaleDataError:
+            self.db.rollback()
+            raise HTTPException(status_code=412, detail="Work order was modified concurrently")
+    
+    def _assign_document_number(self, work_order_data: Dict[str, Any]) -> None:
+        """Allocate a server-side document number when none was supplied"""
+        document_number = (work_order_data.get('document_number') or '').strip()
+        if ALWAYS_ALLOCATE_DOCUMENT_NUMBERS or not document_number:
+            request_date = work_order_data.get('request_date')
+            document_number = document_number_allocator.next_number(
+                request_date if isinstance(request_date, date) else None
+            )
+        work_order_data['document_number'] = document_number
+    
+    def _ensure_document_numbers_available(self, document_numbers) -> None:
+        """Document numbers are unique across the live and archive tiers; 409 for an archived one.
+
+        Numbers shaped like a soft-deleted order's released number are rejected (400).
+        """
+        document_numbers = list(document_numbers)
+        reserved = [number for number in document_numbers if number and number.startswith(DELETED_DOCUMENT_NUMBER_PREFIX)]
+        if reserved:
+            raise HTTPException(
+                status_code=400,
+                detail=f"document_number must not start with {DELETED_DOCUMENT_NUMBER_PREFIX}: {reserved[0]}"
+            )
+        archived = WorkOrderArchiveRepository(self.db).archived_document_numbers(document_numbers)
+        if archived:
+            raise HTTPException(
+                status_code=409,
+                detail=f"document_number belongs to an archived work order: {', '.join(sorted(archived)[:10])}"
+            )
     
     def create_work_orders(self, work_orders_data: WorkOrdersCreate) -> WorkOrders:
         """Create a new work_orders record from Pydantic schema"""
         # Convert schema to dict (handles aliases)
-        work_orders_dict = work_orders_data.model_dump(by_alias=True)
+        work_orders_dict = work_orders_data.model_dump(by_alias=True, exclude=SERVER_MANAGED_FIELDS)
+        self._assign_document_number(work_orders_dict)
+        self._ensure_document_numbers_available([work_orders_dict['document_number']])
         
         # Create new work_orders
         work_orders = WorkOrders(**work_orders_dict)
         
         self.db.add(work_orders)
+        self.db.flush()
+        self.changes.record(work_orders.id, "create", work_orders.version_id)
         self.db.commit()
+        self._after_commit()
         self.db.refresh(work_orders)
+        self._index_change(new=autocomplete_index.entry_for(work_orders))
         return work_orders
     
     def create_work_order_from_request(self, request_data: WorkOrdersCreateRequest) -> Dict[str, Any]:
         """Create work order from the complex request payload"""
-        # Extract work order data
-        work_order_data = request_data.extract_work_order_data()
-        
-        # Create work order
-        work_order = WorkOrders(**work_order_data)
-        self.db.add(work_order)
-        self.db.flush()  # Flush to get the ID without committing
         
-        # Extract and create attachmetns
-        attachments_data = request_data.extract_attachments_data()
-        for attachment_data in attachments_data:
-            attachment_data['work_order_id'] = work_order.id
-            attachment_item = SupportingDocuments(**attachment_data)
-            self.db.add(attachment_item)
-
-        
-        # Extract and create work items
-        work_items_data = request_data.extract_work_items_data()
-        for item_data in work_items_data:
-            item_data['work_order_id'] = work_order.id
-            item_data['total_price'] = item_data['quantity'] * item_data['unit_price']
-            work_item = WorkOrderItems(**item_data)
-            self.db.add(work_item)
-
-        # Extract and create vendor data
-        vendors_data = request_data.extract_vendor_data()
-        for vendor_data in vendors_data:
-            vendor_data['work_order_id'] = work_order.id
-            work_vendor = WorkOrderVendors(**vendor_data)
-            self.db.add(work_vendor)
+        def work():
+            # Extract work order data
+            work_order_data = request_data.extract_work_order_data()
+            self._assign_document_number(work_order_data)
+            self._ensure_document_numbers_available([work_order_data['document_number']])
+            
+            # Create work order
+            work_order = WorkOrders(**work_order_data)
+            self.db.add(work_order)
+            self.db.flush()  # Flush to get the ID without committing
+            
+            # Extract and create attachmetns
+            attachments_data = request_data.extract_attachments_data()
+            for attachment_data in attachments_data:
+                attachment_data['work_order_id'] = work_order.id
+                attachment_item = SupportingDocuments(**attachment_data)
+                self.db.add(attachment_item)
+            
+            # Extract and create work items
+            work_items_data = request_data.extract_work_items_data()
+            for item_data in work_items_data:
+                item_data['work_order_id'] = work_order.id
+                item_data['total_price'] = item_data['quantity'] * item_data['unit_price']
+                work_item = WorkOrderItems(**item_data)
+                self.db.add(work_item)
+            
+            # Extract and create vendor data
+            vendors_data = request_data.extract_vendor_data()
+            for vendor_data in vendors_data:
+                vendor_data['work_order_id'] = work_order.id
+                work_vendor = WorkOrderVendors(**vendor_data)
+                self.db.add(work_vendor)
+            
+            # Extract and create approval steps
+            self.db.add_all(
+                WorkOrderAuthorizations(work_order_id=work_order.id, **authorization_data)
+                for authorization_data in request_data.extract_authorizations_data()
+            )
+            
+            # Record the change in the same transaction as the order
+            self.changes.record(work_order.id, "create", work_order.version_id)
+            return work_order, work_items_data, vendors_data
         
-        # Commit transaction
-        self.db.commit()
+        # Commit transaction (the whole unit is retried on deadlocks)
+        work_order, work_items_data, vendors_data = unit_of_work.run(self.db, work)
+        self._after_commit()
         self.db.refresh(work_order)
+        self._index_change(
+            new=autocomplete_index.entry_for(work_order, [v['vendor_name'] for v in vendors_data])
+        )
         
         # Prepare response
         response = {
@@ -73,63 +194,107 @@ class WorkOrdersService:
         
         return response
     
-    def update_work_order_from_request(self, work_orders_id: int, request_data: WorkOrdersCreateRequest) -> Dict[str, Any]:
+    def update_work_order_from_request(
+        self,
+        work_orders_id: int,
+        request_data: WorkOrdersCreateRequest,
+        expected_version: Optional[int] = None
+    ) -> Dict[str, Any]:
         """Update existing work order from the complex request payload"""
         
-        # First, get the existing work order
-        existing_work_order = self.db.query(WorkOrders).filter(WorkOrders.id == work_orders_id).first()
-        
-        if not existing_work_order:
-            raise HTTPException(status_code=404, detail="Work order not found")
-        
-        # Extract work order data for update
-        work_order_data = request_data.extract_work_order_data()
-        
-        # Update the existing work order
-        for key, value in work_order_data.items():
-            if hasattr(existing_work_order, key):
-                setattr(existing_work_order, key, value)
-        
-        # Update the updated_at timestamp
-        existing_work_order.updated_at = datetime.utcnow()
-        
-        # Remove existing attachments and create new ones
-        self.db.query(SupportingDocuments).filter(
-            SupportingDocuments.work_order_id == work_orders_id
-        ).delete()
-        
-        attachments_data = request_data.extract_attachments_data()
-        for attachment_data in attachments_data:
-            attachment_data['work_order_id'] = work_orders_id
-            attachment_item = SupportingDocuments(**attachment_data)
-            self.db.add(attachment_item)
-        
-        # Remove existing work items and create new ones
-        self.db.query(WorkOrderItems).filter(
-            WorkOrderItems.work_order_id == work_orders_id
-        ).delete()
-        
-        work_items_data = request_data.extract_work_items_data()
-        for item_data in work_items_data:
-            item_data['work_order_id'] = work_orders_id
-            item_data['total_price'] = item_data['quantity'] * item_data['unit_price']
-            work_item = WorkOrderItems(**item_data)
-            self.db.add(work_item)
-        
-        # Remove existing vendor data and create new ones
-        self.db.query(WorkOrderVendors).filter(
-            WorkOrderVendors.work_order_id == work_orders_id
-        ).delete()
-        
-        vendors_data = request_data.extract_vendor_data()
-        for vendor_data in vendors_data:
-            vendor_data['work_order_id'] = work_orders_id
-            work_vendor = WorkOrderVendors(**vendor_data)
-            self.db.add(work_vendor)
-        
-        # Commit transaction
-        self.db.commit()
+        def work():
+            # First, get the existing work order
+            existing_work_order = self.db.execute(
+                statements.WORK_ORDER_BY_ID, {"work_order_id": work_orders_id}
+            ).scalar_one_or_none()
+            
+            if not existing_work_order:
+                raise HTTPException(status_code=404, detail="Work order not found")
+            self._check_version(existing_work_order, expected_version)
+            
+            # Capture indexed values before they are overwritten
+            old_index_entry = autocomplete_index.entry_for(
+                existing_work_order, [vendor.vendor_name for vendor in existing_work_order.vendors]
+            )
+            
+            # Extract work order data for update
+            work_order_data = request_data.extract_work_order_data()
+            
+            # Keep the existing (possibly server-allocated) number when none is sent
+            if not work_order_data.get('document_number'):
+                work_order_data.pop('document_number', None)
+            elif work_order_data['document_number'] != existing_work_order.document_number:
+                self._ensure_document_numbers_available([work_order_data['document_number']])
+            
+            # Update the existing work order
+            for key, value in work_order_data.items():
+                if hasattr(existing_work_order, key):
+                    setattr(existing_work_order, key, value)
+            
+            # Always UPDATE the parent (children may be the only change) so the
+            # version is bumped and updated_at is stamped by the database clock
+            existing_work_order.updated_at = func.now()
+            
+            # Merge attachment flags by document type; rows with uploaded
+            # content are kept so the stored files survive a form save
+            existing_documents = {
+                document.document_type: document
+                for document in self.db.execute(
+                    statements.DOCUMENTS_BY_WORK_ORDER, {"work_order_id": work_orders_id}
+                ).scalars()
+            }
+            attachments_data = request_data.extract_attachments_data()
+            for attachment_data in attachments_data:
+                document = existing_documents.pop(attachment_data['document_type'], None)
+                if document is None:
+                    attachment_data['work_order_id'] = work_orders_id
+                    self.db.add(SupportingDocuments(**attachment_data))
+                else:
+                    document.has_document = bool(attachment_data['has_document']) or document.content_hash is not None
+            for document in existing_documents.values():
+                if document.content_hash is None:
+                    self.db.delete(document)
+            
+            # Remove existing work items and create new ones
+            self.db.execute(statements.DELETE_WORK_ITEMS_BY_WORK_ORDER, {"work_order_id": work_orders_id})
+            
+            work_items_data = request_data.extract_work_items_data()
+            for item_data in work_items_data:
+                item_data['work_order_id'] = work_orders_id
+                item_data['total_price'] = item_data['quantity'] * item_data['unit_price']
+                work_item = WorkOrderItems(**item_data)
+                self.db.add(work_item)
+            
+            # Remove existing vendor data and create new ones
+            self.db.execute(statements.DELETE_VENDORS_BY_WORK_ORDER, {"work_order_id": work_orders_id})
+            
+            vendors_data = request_data.extract_vendor_data()
+            for vendor_data in vendors_data:
+                vendor_data['work_order_id'] = work_orders_id
+                work_vendor = WorkOrderVendors(**vendor_data)
+                self.db.add(work_vendor)
+            
+            # Remove existing approval steps and create new ones
+            self.db.execute(statements.DELETE_AUTHORIZATIONS_BY_WORK_ORDER, {"work_order_id": work_orders_id})
+            
+            self.db.add_all(
+                WorkOrderAuthorizations(work_order_id=work_orders_id, **authorization_data)
+                for authorization_data in request_data.extract_authorizations_data()
+            )
+            
+            # Flush first so the change row carries the bumped version
+            self._flush_versioned()
+            self.changes.record(work_orders_id, "update", existing_work_order.version_id)
+            return existing_work_order, old_index_entry, work_items_data, vendors_data
+        
+        # Commit transaction (the whole unit is retried on deadlocks)
+        existing_work_order, old_index_entry, work_items_data, vendors_data = unit_of_work.run(self.db, work)
+        self._after_commit()
         self.db.refresh(existing_work_order)
+        self._index_change(
+            old=old_index_entry,
+            new=autocomplete_index.entry_for(existing_work_order, [v['vendor_name'] for v in vendors_data])
+        )
         
         # Prepare response
         response = {
@@ -140,20 +305,116 @@ class WorkOrdersService:
         
         return response
     
-    def get_work_orders(self, work_orders_id: int) -> Optional[WorkOrders]:
+    def upsert_work_orders(self, work_orders_data: List[WorkOrdersCreate]) -> List[Dict[str, Any]]:
+        """Insert or update work orders keyed by document_number (re-syncs from integrations)"""
+        rows = []
+        for work_orders in work_orders_data:
+            row = work_orders.model_dump(by_alias=True, exclude=SERVER_MANAGED_FIELDS)
+            if not (row.get('document_number') or '').strip():
+                raise HTTPException(status_code=400, detail="document_number is required for upserts")
+            row['document_number'] = row['document_number'].strip()
+            for field in DATE_FIELDS:
+                value = row.get(field)
+                if isinstance(value, str):
+                    try:
+                        row[field] = date.fromisoformat(value[:10]) if value.strip() else None
+                    except ValueError:
+                        raise HTTPException(status_code=400, detail=f"Invalid {field}: {value}")
+            rows.append(row)
+        self._ensure_document_numbers_available(row['document_number'] for row in rows)
+        
+        results = WorkOrdersRepository(self.db).bulk_upsert(rows)
+        self._after_commit()
+        self._invalidate_index()
+        return results
+    
+    def upsert_work_order(self, document_number: str, work_orders_data: WorkOrdersCreate) -> Dict[str, Any]:
+        """Insert or update one work order by document_number; returns the row and whether it was created"""
+        result = self.upsert_work_orders([work_orders_data.model_copy(update={'document_number': document_number})])[0]
+        return {"work_order": self.db.get(WorkOrders, result["id"]), "created": result["created"]}
+    
+    def bulk_create_work_orders(self, work_orders_data: List[WorkOrdersCreate]) -> List[WorkOrders]:
+        """Create many work_orders records in one transaction"""
+        rows = []
+        for work_orders in work_orders_data:
+            row = work_orders.model_dump(by_alias=True, exclude=SERVER_MANAGED_FIELDS)
+            self._assign_document_number(row)
+            rows.append(row)
+        self._ensure_document_numbers_available(row['document_number'] for row in rows)
+        
+        created = WorkOrdersRepository(self.db).bulk_create(rows)
+        self._after_commit()
+        for work_orders in created:
+            self._index_change(new=autocomplete_index.entry_for(work_orders))
+        return created
+    
+    def bulk_delete_work_orders(
+        self,
+        work_orders_ids: Optional[List[int]] = None,
+        criteria: Optional[Dict[str, Any]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """Soft-delete work orders by ids and/or filter, one set-based UPDATE per chunk.
+
+        Children stay with their tombstoned parent and go with it when the
+        purge job deletes the parent (ON DELETE CASCADE).
+        """
+        criteria = dict(criteria or {})
+        if work_orders_ids is not None:
+            criteria['ids'] = work_orders_ids
+        repository = WorkOrdersRepository(self.db)
+        deleted_count = 0
+        chunks = 0
+        for chunk in repository.matching_id_chunks(criteria, chunk_size):
+            deleted_count += unit_of_work.run(self.db, lambda: repository.soft_delete_ids(chunk))
+            chunks += 1
+            self._after_commit()
+        if deleted_count:
+            self._invalidate_index()
+        return {"deleted_count": deleted_count, "chunks": chunks}
+    
+    def bulk_update_work_orders(
+        self,
+        criteria: Dict[str, Any],
+        values: Dict[str, Any],
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """Set the same fields on every matching work order, one set-based UPDATE per chunk"""
+        repository = WorkOrdersRepository(self.db)
+        updated_count = 0
+        chunks = 0
+        for chunk in repository.matching_id_chunks(criteria, chunk_size):
+            updated_count += unit_of_work.run(self.db, lambda: repository.update_ids(chunk, values))
+            chunks += 1
+            self._after_commit(columns=values.keys())
+        if updated_count and set(values) & set(WORK_ORDER_FIELDS):
+            self._invalidate_index()
+        return {"updated_count": updated_count, "chunks": chunks}
+    
+    def get_work_order_version(self, work_orders_id: int, include_archived: bool = False) -> Optional[int]:
+        """Get only the version of a work order (cheap check for conditional requests)"""
+        version = self.db.execute(
+            statements.WORK_ORDER_VERSION_BY_ID, {"work_order_id": work_orders_id}
+        ).scalar()
+        if version is None and include_archived:
+            version = self.db.execute(
+                statements.ARCHIVED_WORK_ORDER_VERSION_BY_ID, {"work_order_id": work_orders_id}
+            ).scalar()
+        return version
+    
+    def get_work_orders(self, work_orders_id: int, include_archived: bool = False) -> Optional[WorkOrders]:
         """Get work order with same structure as POST payload, plus id at root"""
     
         # Get work order with all relationships
-        work_order = (
-            self.db.query(WorkOrders)
-            .options(
-                joinedload(WorkOrders.work_items),
-                joinedload(WorkOrders.vendors),
-                joinedload(WorkOrders.supporting_documents)
-            )
-            .filter(WorkOrders.id == work_orders_id)
-            .first()
-        )
+        work_order = self.db.execute(
+            statements.WORK_ORDER_DETAIL_BY_ID, {"work_order_id": work_orders_id}
+        ).scalar_one_or_none()
+        
+        # Archived orders have the same shape, so the response below serves both
+        if not work_order and include_archived:
+            work_order = self.db.execute(
+                statements.ARCHIVED_WORK_ORDER_DETAIL_BY_ID, {"work_order_id": work_orders_id}
+            ).scalar_one_or_none()
         
         if not work_order:
             return None
@@ -184,7 +445,8 @@ class WorkOrdersService:
                 "vendorSelectionMethod": work_order.vendor_selection_method,
                 "testAndAnalysis": work_order.test_and_analysis,
                 "createdAt": work_order.created_at.isoformat() if work_order.created_at else None,
-                "updatedAt": work_order.updated_at.isoformat() if work_order.updated_at else None
+                "updatedAt": work_order.updated_at.isoformat() if work_order.updated_at else None,
+                "version": work_order.version_id
             },
             "workItems": [
                 {
@@ -212,9 +474,26 @@ class WorkOrdersService:
                 'workOrderId': doc.work_order_id,
                 'documentType': doc.document_type,
                 'hasDocument': bool(doc.has_document),
+                'fileName': doc.file_name,
+                'contentType': doc.content_type,
+                'sizeBytes': doc.size_bytes,
+                'uploadedAt': doc.uploaded_at,
             }
             for doc in work_order.supporting_documents
         ],
+            "authorizations": [
+                {
+                    "id": authorization.id,
+                    "workOrderId": authorization.work_order_id,
+                    "approver": authorization.approver,
+                    "role": authorization.role,
+                    "status": authorization.status,
+                    "stepOrder": authorization.step_order,
+                    "decidedAt": authorization.decided_at.isoformat() if authorization.decided_at else None,
+                    "comments": authorization.comments
+                }
+                for authorization in work_order.authorizations
+            ],
             "totalCost": float(sum(
                 item.quantity * item.unit_price 
                 for item in work_order.work_items
@@ -255,40 +534,140 @@ class WorkOrdersService:
         # Get the column to order by (default to id)
         order_column = order_column_map.get(order_by, WorkOrders.id)
         
-        return self.db.query(WorkOrders)\
-            .order_by(order_column)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+        return self.db.execute(
+            *statements.paged_work_orders(order_column.asc(), skip, limit)
+        ).scalars().all()
+    
+    def dashboard_summary(
+        self,
+        group_by: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        is_urgent: Optional[bool] = None,
+        over_budget: Optional[bool] = None,
+        equals: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Dashboard aggregates from the in-process snapshot when enabled, else from SQL"""
+        if group_by is not None and group_by not in DICTIONARY_COLUMNS:
+            raise ValueError(f"Unsupported group_by: {group_by}. Allowed: {', '.join(DICTIONARY_COLUMNS)}")
+        filters = dict(
+            group_by=group_by, start_date=start_date, end_date=end_date,
+            is_urgent=is_urgent, over_budget=over_budget, equals=equals
+        )
+        if WORK_ORDER_SNAPSHOT_ENABLED:
+            work_order_snapshot.ensure_fresh(self.db)
+            return {"source": "snapshot", **work_order_snapshot.summarize(**filters)}
+        return {"source": "database", **WorkOrdersRepository(self.db).get_dashboard_summary(**filters)}
+    
+    def get_work_orders_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        include_archived: bool = False
+    ) -> Sequence[Row]:
+        """Read-only list/search page as plain rows for the pre-built serializer"""
+        repository = WorkOrdersRepository(self.db)
+        if search:
+            return repository.search_rows(search, skip, limit, include_archived=include_archived)
+        return repository.list_rows(skip, limit, include_archived=include_archived)
     
-    def update_work_orders(self, work_orders_id: int, work_orders_data: WorkOrdersUpdate) -> Optional[WorkOrders]:
+    def get_work_orders_modified_since(
+        self,
+        modified_since: datetime,
+        after_id: int = 0,
+        limit: int = 1000
+    ) -> List[WorkOrders]:
+        """Get work_orders changed after a high-water mark for incremental sync"""
+        return WorkOrdersRepository(self.db).get_modified_since(
+            modified_since, after_id, limit, settle_seconds=SYNC_SETTLE_SECONDS
+        )
+    
+    def update_work_orders(
+        self,
+        work_orders_id: int,
+        work_orders_data: WorkOrdersUpdate,
+        expected_version: Optional[int] = None
+    ) -> Optional[WorkOrders]:
         """Update work_orders record from Pydantic schema"""
         work_orders = self.db.query(WorkOrders).filter(WorkOrders.id == work_orders_id).first()
         if not work_orders:
             return None
+        self._check_version(work_orders, expected_version)
         
         # Convert schema to dict (exclude unset fields)
-        update_dict = work_orders_data.model_dump(exclude_unset=True, by_alias=True)
+        update_dict = work_orders_data.model_dump(
+            exclude_unset=True, by_alias=True, exclude=SERVER_MANAGED_FIELDS | {'id'}
+        )
+        if update_dict.get('document_number') not in (None, work_orders.document_number):
+            self._ensure_document_numbers_available([update_dict['document_number']])
+        old_index_entry = autocomplete_index.entry_for(work_orders)
         
         # Update fields
         for key, value in update_dict.items():
             if hasattr(work_orders, key):
                 setattr(work_orders, key, value)
         
+        self._flush_versioned()
+        self.changes.record(work_orders_id, "update", work_orders.version_id, update_dict.keys())
         self.db.commit()
+        self._after_commit(update_dict.keys())
         self.db.refresh(work_orders)
+        self._index_change(old=old_index_entry, new=autocomplete_index.entry_for(work_orders))
         return work_orders
     
     def delete_work_orders(self, work_orders_id: int) -> bool:
-        """Delete work_orders record"""
-        work_orders = self.db.query(WorkOrders).filter(WorkOrders.id == work_orders_id).first()
+        """Soft-delete work_orders record (one UPDATE; the purge job removes the rows later)"""
+        work_orders = self.db.execute(
+            statements.WORK_ORDER_BY_ID, {"work_order_id": work_orders_id}
+        ).scalar_one_or_none()
         if not work_orders:
             return False
         
-        self.db.delete(work_orders)
+        vendor_names = self.db.execute(
+            statements.VENDOR_NAMES_BY_WORK_ORDER, {"work_order_id": work_orders_id}
+        ).scalars().all()
+        old_index_entry = autocomplete_index.entry_for(work_orders, vendor_names)
+        work_orders.deleted_at = func.now()
+        work_orders.document_number = statements.DELETED_DOCUMENT_NUMBER
+        self._flush_versioned()
+        self.changes.record(work_orders_id, "delete", work_orders.version_id)
         self.db.commit()
+        self._after_commit()
+        self._index_change(old=old_index_entry)
         return True
     
+    def purge_deleted_work_orders(
+        self,
+        retention_days: float = SOFT_DELETE_RETENTION_DAYS,
+        batch_size: int = PURGE_BATCH_SIZE,
+        max_batches: int = PURGE_MAX_BATCHES
+    ) -> Dict[str, Any]:
+        """Physically delete orders soft-deleted more than retention_days ago, batch by batch"""
+        deleted_before = self.db.execute(select(func.now())).scalar() - timedelta(days=retention_days)
+        repository = WorkOrdersRepository(self.db)
+        purged = 0
+        batches = 0
+        released = 0
+        while batches < max_batches:
+            count, content_hashes = repository.purge_deleted(deleted_before, batch_size)
+            if not count:
+                break
+            purged += count
+            batches += 1
+            # Blobs shared with surviving (or archived) documents are kept
+            released += AttachmentService(self.db).release(content_hashes)
+            if count < batch_size:
+                break
+        # Blobs released inside their grace period (or left by failed uploads)
+        released += AttachmentService(self.db).sweep()
+        return {
+            "deleted_before": deleted_before.isoformat(),
+            "purged_count": purged,
+            "batches": batches,
+            "released_blobs": released,
+        }
+    
     def search_work_orderss(self, search_term: str, skip: int = 0, limit: int = 100) -> List[WorkOrders]:
         """Search work_orderss by search term"""
         query = self.db.query(WorkOrders)
@@ -311,6 +690,39 @@ class WorkOrdersService:
         
         return query.order_by(WorkOrders.id).offset(skip).limit(limit).all()
     
-    def count_work_orderss(self) -> int:
-        """Count total work_orders records"""
-        return self.db.query(WorkOrders).count()
\ No newline at end of file
+    def autocomplete(self, field: str, prefix: str, limit: int = 10) -> List[str]:
+        """Typeahead lookup served from the in-memory prefix index"""
+        autocomplete_index.ensure_fresh(self.db)
+        return autocomplete_index.lookup(field, prefix, limit)
+    
+    def get_pending_authorizations(self, approver: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Approval steps waiting on one approver, across live work orders"""
+        rows = self.db.execute(
+            statements.PENDING_AUTHORIZATIONS_BY_APPROVER,
+            {"approver": approver, "skip": skip, "limit": limit}
+        ).all()
+        return [
+            {
+                "id": row.id,
+                "workOrderId": row.work_order_id,
+                "documentNumber": row.document_number,
+                "role": row.role,
+                "stepOrder": row.step_order,
+                "requestDate": row.request_date.isoformat() if row.request_date else None,
+                "submittedBy": row.submitted_by,
+                "isUrgent": bool(row.is_urgent),
+                "costEstimation": float(row.cost_estimation) if row.cost_estimation is not None else None,
+            }
+            for row in rows
+        ]
+    
+    def count_work_orderss(
+        self,
+        search: Optional[str] = None,
+        approximate: bool = False,
+        include_archived: bool = False
+    ) -> int:
+        """Count work_orders records (cached, optionally from engine statistics)"""
+        return WorkOrdersCountService(self.db).count(
+            search=search, approximate=approximate, include_archived=include_archived
+        )
\ No newline at end of file
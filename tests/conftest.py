@@ -0,0 +1,5 @@
+# tests/conftest.py
+import os
+
+# The token signer is built at import; unit tests run without a configured secret
+os.environ.setdefault("AUTH_DEV_MODE", "true")
@@ -0,0 +1,126 @@
+# tests/test_token_service.py
+import json
+import pytest
+from src.models.base import RevokedToken
+from src.services.token_service import (
+    AUTH_TOKEN_LEEWAY_SECONDS, InvalidTokenError, RevocationList, TokenAuthenticator, TokenSigner, _b64decode, _b64encode
+)
+
+SECRET = "s" * 32
+
+
+@pytest.fixture
+def signer() -> TokenSigner:
+    return TokenSigner(SECRET, ttl_seconds=60)
+
+
+def _replace_payload(token: str, **claims) -> str:
+    header, payload, signature = token.split(".")
+    data = json.loads(_b64decode(payload))
+    data.update(claims)
+    return ".".join((header, _b64encode(json.dumps(data).encode()), signature))
+
+
+def test_issued_token_decodes(signer):
+    token, claims = signer.issue("u1", "admin")
+    decoded = signer.decode(token)
+    assert decoded["sub"] == "u1" and decoded["grp"] == "admin" and decoded["jti"] == claims["jti"]
+
+
+def test_tampered_payload_is_rejected(signer):
+    token, _ = signer.issue("u1", "user")
+    with pytest.raises(InvalidTokenError, match="signature"):
+        signer.decode(_replace_payload(token, grp="admin"))
+
+
+def test_token_signed_with_another_key_is_rejected(signer):
+    token, _ = TokenSigner("t" * 32).issue("u1", "user")
+    with pytest.raises(InvalidTokenError, match="signature"):
+        signer.decode(token)
+
+
+def test_expired_token_is_rejected():
+    expired = TokenSigner(SECRET, ttl_seconds=-(AUTH_TOKEN_LEEWAY_SECONDS + 5))
+    token, _ = expired.issue("u1", "user")
+    with pytest.raises(InvalidTokenError, match="expired"):
+        expired.decode(token)
+
+
+def test_expiry_allows_the_leeway():
+    recent = TokenSigner(SECRET, ttl_seconds=-(AUTH_TOKEN_LEEWAY_SECONDS - 5))
+    token, _ = recent.issue("u1", "user")
+    assert recent.decode(token)["sub"] == "u1"
+
+
+@pytest.mark.parametrize("header", [{"alg": "none", "typ": "JWT"}, {"alg": "HS512", "typ": "JWT"}])
+def test_other_alg_headers_are_rejected(signer, header):
+    token, _ = signer.issue("u1", "user")
+    _, payload, signature = token.split(".")
+    forged_header = _b64encode(json.dumps(header, separators=(",", ":")).encode())
+    for forged in (f"{forged_header}.{payload}.", f"{forged_header}.{payload}.{signature}"):
+        with pytest.raises(InvalidTokenError, match="signature"):
+            signer.decode(forged)
+
+
+def test_malformed_token_is_rejected(signer):
+    with pytest.raises(InvalidTokenError, match="Malformed"):
+        signer.decode("not-a-token")
+
+
+def test_short_secret_is_refused():
+    with pytest.raises(RuntimeError):
+        TokenSigner("short")
+
+
+@pytest.mark.parametrize("secret", [
+    "# HS256 key shared by all workers, at least 32 characters; required unless AUTH_DEV_MODE",
+    "change-me-to-a-long-random-secret",
+])
+def test_comment_or_placeholder_secret_is_refused(secret):
+    with pytest.raises(RuntimeError, match="placeholder"):
+        TokenSigner(secret, dev_mode=True)
+
+
+def test_missing_secret_needs_dev_mode():
+    with pytest.raises(RuntimeError):
+        TokenSigner("", dev_mode=False)
+    assert TokenSigner("", dev_mode=True).key
+
+
+def _user_cutoff(user_id: str, revoked_at_ms: int) -> RevokedToken:
+    return RevokedToken(
+        token_id=RevocationList.user_key(user_id), user_id=user_id,
+        revoked_at=revoked_at_ms, expires_at=revoked_at_ms + 3_600_000,
+    )
+
+
+def test_user_cutoff_revokes_tokens_issued_at_or_before_it(signer):
+    revocations = RevocationList()
+    authenticator = TokenAuthenticator(signer, revocations)
+    token, claims = signer.issue("u1", "user")
+    issued_ms = int(claims["iat"] * 1000)
+
+    revocations._apply(_user_cutoff("u1", issued_ms - 1))
+    assert authenticator.authenticate(token).user_id == "u1"
+
+    # The principal is cached now; the cutoff still applies to it
+    revocations._apply(_user_cutoff("u1", issued_ms))
+    with pytest.raises(InvalidTokenError, match="revoked"):
+        authenticator.authenticate(token)
+
+
+def test_user_cutoff_only_affects_that_user(signer):
+    revocations = RevocationList()
+    authenticator = TokenAuthenticator(signer, revocations)
+    token, claims = signer.issue("u2", "user")
+    revocations._apply(_user_cutoff("u1", int(claims["iat"] * 1000) + 1000))
+    assert authenticator.authenticate(token).user_id == "u2"
+
+
+def test_revoked_token_id_is_rejected(signer):
+    revocations = RevocationList()
+    authenticator = TokenAuthenticator(signer, revocations)
+    token, claims = signer.issue("u1", "user")
+    revocations._apply(RevokedToken(token_id=claims["jti"], user_id="u1", revoked_at=0, expires_at=claims["exp"] * 1000))
+    with pytest.raises(InvalidTokenError, match="revoked"):
+        authenticator.authenticate(token)
@@ -0,0 +1,57 @@
+# tests/test_unit_of_work.py
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.exc import DBAPIError
+from src.services.unit_of_work import classify_transient_error
+
+
+class DriverError(Exception):
+    """Stand-in for a DBAPI driver exception"""
+
+    def __init__(self, *args, **attributes):
+        super().__init__(*args)
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+
+def db_error(orig: BaseException, connection_invalidated: bool = False) -> DBAPIError:
+    return DBAPIError("UPDATE work_orders SET status = ?", {}, orig, connection_invalidated=connection_invalidated)
+
+
+@pytest.mark.parametrize("dialect, orig, expected", [
+    ("mssql", DriverError("40001", "[40001] [Microsoft][ODBC Driver 17 for SQL Server]Transaction (Process ID 57) was deadlocked (1205) (SQLExecDirectW)"), "deadlock"),
+    ("mssql", DriverError("HYT00", "[HYT00] Lock request time out period exceeded. (1222)"), "lock_timeout"),
+    ("mysql", DriverError(1213, "Deadlock found when trying to get lock; try restarting transaction"), "deadlock"),
+    ("mysql", DriverError(1205, "Lock wait timeout exceeded; try restarting transaction"), "lock_timeout"),
+    ("postgresql", DriverError("deadlock detected", pgcode="40P01"), "deadlock"),
+    ("postgresql", DriverError("could not serialize access", sqlstate="40001"), "serialization"),
+    ("oracle", DriverError(SimpleNamespace(code=60, message="ORA-00060: deadlock detected")), "deadlock"),
+    ("sqlite", DriverError("database is locked"), "lock_timeout"),
+])
+def test_transient_errors_are_classified_per_dialect(dialect, orig, expected):
+    assert classify_transient_error(db_error(orig), dialect) == expected
+
+
+@pytest.mark.parametrize("dialect, orig", [
+    ("mssql", DriverError("23000", "[23000] Violation of UNIQUE KEY constraint 'uq_document_number' (2627)")),
+    ("mysql", DriverError(1062, "Duplicate entry 'WO-1' for key 'document_number'")),
+    ("postgresql", DriverError("duplicate key value violates unique constraint", pgcode="23505")),
+    ("oracle", DriverError(SimpleNamespace(code=1, message="ORA-00001: unique constraint violated"))),
+    ("sqlite", DriverError("UNIQUE constraint failed: work_orders.document_number")),
+])
+def test_non_transient_errors_are_not_retried(dialect, orig):
+    assert classify_transient_error(db_error(orig), dialect) is None
+
+
+def test_native_codes_only_count_for_their_own_dialect():
+    # MySQL 1205 is a lock wait timeout, but means nothing to PostgreSQL
+    assert classify_transient_error(db_error(DriverError(1205, "Lock wait timeout")), "postgresql") is None
+
+
+def test_invalidated_connection_is_a_disconnect():
+    error = db_error(DriverError("server closed the connection unexpectedly"), connection_invalidated=True)
+    assert classify_transient_error(error, "postgresql") == "disconnect"
+
+
+def test_non_database_errors_are_not_transient():
+    assert classify_transient_error(ValueError("deadlock"), "mssql") is None